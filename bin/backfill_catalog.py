@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+
+"""
+Give Quizzes items written before the public catalog existed the attributes
+that list them: ``CreatedAt`` on every quiz and ``PublicCatalog`` on public
+ones, which key the sparse PublicCatalog-CreatedAt-index that listquizzes
+reads. The updates reach the catalog snapshot in S3 through the Quizzes
+stream, like any other write.
+
+Their real creation time is unknown, so backfilled quizzes get --created-at
+(milliseconds since the epoch, default: when the backfill starts) and are
+listed after every quiz created later. Items are scanned in --segments
+parallel segments and only attributes that are still missing are set, so the
+backfill can be re-run, or run while quizzes are being created. With
+--dry-run nothing is written and only the counts are reported.
+
+    bin/backfill_catalog.py --dry-run
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import boto3
+from botocore.exceptions import ClientError
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "layers" / "common" / "python"))
+
+from quiz_common.catalog import PUBLIC_CATALOG_PARTITION  # noqa: E402
+
+TABLE_NAME = "Quizzes"
+
+
+def dynamodb_resource():
+    return boto3.resource(
+        "dynamodb",
+        endpoint_url=os.environ.get("AWS_ENDPOINT_URL", "http://localhost:4566"),
+        region_name=os.environ.get("AWS_DEFAULT_REGION", "us-east-1"),
+        aws_access_key_id=os.environ.get("AWS_ACCESS_KEY_ID", "test"),
+        aws_secret_access_key=os.environ.get("AWS_SECRET_ACCESS_KEY", "test"),
+    )
+
+
+def backfill_segment(table, segment: int, total_segments: int, created_at: int, dry_run: bool) -> dict:
+    stats = {"scanned": 0, "public": 0, "private": 0, "skipped": 0}
+    scan_kwargs = {
+        "Segment": segment,
+        "TotalSegments": total_segments,
+        "ProjectionExpression": "QuizID, Visibility, CreatedAt, PublicCatalog",
+        "FilterExpression": "attribute_not_exists(CreatedAt) OR "
+                            "(Visibility = :public AND attribute_not_exists(PublicCatalog))",
+        "ExpressionAttributeValues": {":public": "Public"},
+    }
+    while True:
+        response = table.scan(**scan_kwargs)
+        for item in response.get("Items", []):
+            stats["scanned"] += 1
+            public = item.get("Visibility") == "Public"
+            if not dry_run:
+                update = "SET CreatedAt = if_not_exists(CreatedAt, :created_at)"
+                values = {":created_at": created_at}
+                if public:
+                    update += ", PublicCatalog = :partition"
+                    values[":partition"] = PUBLIC_CATALOG_PARTITION
+                try:
+                    table.update_item(
+                        Key={"QuizID": item["QuizID"]},
+                        UpdateExpression=update,
+                        # Never recreate a quiz deleted since the scan
+                        ConditionExpression="attribute_exists(QuizID)",
+                        ExpressionAttributeValues=values,
+                    )
+                except ClientError as e:
+                    if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                        raise
+                    stats["skipped"] += 1
+                    continue
+            stats["public" if public else "private"] += 1
+        if "LastEvaluatedKey" not in response:
+            return stats
+        scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--segments", type=int, default=4, help="parallel scan segments (default: 4)")
+    parser.add_argument("--created-at", type=int, default=int(time.time() * 1000),
+                        help="CreatedAt of backfilled quizzes, in ms since the epoch (default: now)")
+    parser.add_argument("--dry-run", action="store_true", help="only count the quizzes, do not write")
+    args = parser.parse_args()
+
+    def run(segment):
+        # boto3 resources are not thread safe, so every segment gets its own
+        table = dynamodb_resource().Table(TABLE_NAME)
+        return backfill_segment(table, segment, args.segments, args.created_at, args.dry_run)
+
+    with ThreadPoolExecutor(max_workers=args.segments) as executor:
+        results = list(executor.map(run, range(args.segments)))
+
+    totals = {key: sum(result[key] for result in results) for key in results[0]}
+    totals["created_at"] = args.created_at
+    totals["dry_run"] = args.dry_run
+    print(json.dumps(totals))
+
+
+if __name__ == "__main__":
+    main()
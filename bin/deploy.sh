@@ -28,8 +28,24 @@ log "Creating DynamoDB tables..."
 log "Creating 'Quizzes' table..."
 awslocal dynamodb create-table \
     --table-name Quizzes \
-    --attribute-definitions AttributeName=QuizID,AttributeType=S \
+    --attribute-definitions \
+        AttributeName=QuizID,AttributeType=S \
+        AttributeName=PublicCatalog,AttributeType=S \
+        AttributeName=CreatedAt,AttributeType=N \
     --key-schema AttributeName=QuizID,KeyType=HASH \
+    --global-secondary-indexes \
+        '[
+            {
+                "IndexName": "PublicCatalog-CreatedAt-index",
+                "KeySchema": [
+                    {"AttributeName": "PublicCatalog", "KeyType": "HASH"},
+                    {"AttributeName": "CreatedAt", "KeyType": "RANGE"}
+                ],
+                "Projection": {"ProjectionType": "INCLUDE", "NonKeyAttributes": ["Title", "Visibility"]},
+                "ProvisionedThroughput": {"ReadCapacityUnits": 5, "WriteCapacityUnits": 5}
+            }
+        ]' \
+    --stream-specification StreamEnabled=true,StreamViewType=NEW_AND_OLD_IMAGES \
     --provisioned-throughput ReadCapacityUnits=5,WriteCapacityUnits=5 \
     --output text >/dev/null
 
@@ -40,6 +56,8 @@ awslocal dynamodb create-table \
         AttributeName=SubmissionID,AttributeType=S \
         AttributeName=QuizID,AttributeType=S \
         AttributeName=Score,AttributeType=N \
+        AttributeName=Username,AttributeType=S \
+        AttributeName=SubmittedAt,AttributeType=N \
     --key-schema AttributeName=SubmissionID,KeyType=HASH \
     --global-secondary-indexes \
         '[
@@ -51,11 +69,28 @@ awslocal dynamodb create-table \
                 ],
                 "Projection": {"ProjectionType": "ALL"},
                 "ProvisionedThroughput": {"ReadCapacityUnits": 5, "WriteCapacityUnits": 5}
+            },
+            {
+                "IndexName": "Username-SubmittedAt-index",
+                "KeySchema": [
+                    {"AttributeName": "Username", "KeyType": "HASH"},
+                    {"AttributeName": "SubmittedAt", "KeyType": "RANGE"}
+                ],
+                "Projection": {"ProjectionType": "INCLUDE", "NonKeyAttributes": ["QuizID", "Score", "TotalQuestions"]},
+                "ProvisionedThroughput": {"ReadCapacityUnits": 5, "WriteCapacityUnits": 5}
             }
         ]' \
     --provisioned-throughput ReadCapacityUnits=5,WriteCapacityUnits=5 \
     --output text >/dev/null
 
+log "Creating 'Leaderboards' table..."
+awslocal dynamodb create-table \
+    --table-name Leaderboards \
+    --attribute-definitions AttributeName=QuizID,AttributeType=S \
+    --key-schema AttributeName=QuizID,KeyType=HASH \
+    --provisioned-throughput ReadCapacityUnits=5,WriteCapacityUnits=5 \
+    --output text >/dev/null
+
 log "DynamoDB tables created successfully."
 
 # Create SQS queue
@@ -63,18 +98,37 @@ log "Creating SQS queue 'QuizSubmissionQueue'..."
 awslocal sqs create-queue --queue-name QuizSubmissionQueue >/dev/null
 log "SQS queue 'QuizSubmissionQueue' created successfully."
 
+# Questions of quizzes too large to keep inline in the Quizzes table
+log "Creating S3 bucket 'quiz-questions'..."
+awslocal s3 mb s3://quiz-questions >/dev/null
+log "S3 bucket 'quiz-questions' created successfully."
+
 # Zip Lambda functions
 log "Zipping Lambda functions..."
 zip -j get_quiz_function.zip lambdas/get_quiz/handler.py >/dev/null
 zip -j create_quiz_function.zip lambdas/create_quiz/handler.py >/dev/null
 zip -j submit_quiz_function.zip lambdas/submit_quiz/handler.py >/dev/null
-zip -j scoring_function.zip lambdas/scoring/handler.py >/dev/null
+zip -j scoring_function.zip lambdas/scoring/*.py >/dev/null
 zip -j get_submission_function.zip lambdas/get_submission/handler.py >/dev/null
 zip -j get_leaderboard_function.zip lambdas/get_leaderboard/handler.py >/dev/null
 zip -j list_quizzes_function.zip lambdas/list_quizzes/handler.py >/dev/null
 zip -j retry_quizzes_writes_function.zip lambdas/retry_quizzes_writes/handler.py >/dev/null
+zip -j publish_catalog_function.zip lambdas/publish_catalog/handler.py >/dev/null
+zip -j import_quizzes_function.zip lambdas/import_quizzes/handler.py >/dev/null
+zip -j submit_quizzes_function.zip lambdas/submit_quizzes/handler.py >/dev/null
+zip -j get_user_submissions_function.zip lambdas/get_user_submissions/handler.py >/dev/null
 log "Lambda functions zipped successfully."
 
+# Publish the shared layer
+log "Publishing Lambda layer 'QuizCommonLayer'..."
+(cd layers/common && zip -r ../../quiz_common_layer.zip python -x '*__pycache__*' >/dev/null)
+LAYER_ARN=$(awslocal lambda publish-layer-version \
+    --layer-name QuizCommonLayer \
+    --zip-file fileb://quiz_common_layer.zip \
+    --compatible-runtimes python3.10 python3.11 \
+    --query 'LayerVersionArn' --output text)
+log "Lambda layer published: $LAYER_ARN"
+
 # Function names and their policy files
 FUNCTIONS=(
   "CreateQuizFunction configurations/create_quiz_policy.json CreateQuizRole"
@@ -85,6 +139,10 @@ FUNCTIONS=(
   "GetLeaderboardFunction configurations/get_leaderboard_policy.json GetLeaderboardRole"
   "ListPublicQuizzesFunction configurations/list_quizzes_policy.json ListQuizzesRole"
   "RetryQuizzesWritesFunction configurations/retry_quizzes_writes_policy.json RetryQuizzesWritesRole"
+  "PublishCatalogFunction configurations/publish_catalog_policy.json PublishCatalogRole"
+  "ImportQuizzesFunction configurations/import_quizzes_policy.json ImportQuizzesRole"
+  "SubmitQuizzesFunction configurations/submit_quizzes_policy.json SubmitQuizzesRole"
+  "GetUserSubmissionsFunction configurations/get_user_submissions_policy.json GetUserSubmissionsRole"
 )
 
 # Create IAM policies and roles
@@ -137,6 +195,10 @@ LAMBDAS=(
   "GetLeaderboardFunction get_leaderboard_function.zip GetLeaderboardRole"
   "ListPublicQuizzesFunction list_quizzes_function.zip ListQuizzesRole"
   "RetryQuizzesWritesFunction retry_quizzes_writes_function.zip RetryQuizzesWritesRole"
+  "PublishCatalogFunction publish_catalog_function.zip PublishCatalogRole"
+  "ImportQuizzesFunction import_quizzes_function.zip ImportQuizzesRole"
+  "SubmitQuizzesFunction submit_quizzes_function.zip SubmitQuizzesRole"
+  "GetUserSubmissionsFunction get_user_submissions_function.zip GetUserSubmissionsRole"
 )
 
 for LAMBDA_INFO in "${LAMBDAS[@]}"; do
@@ -148,6 +210,7 @@ for LAMBDA_INFO in "${LAMBDAS[@]}"; do
       --runtime python3.10 \
       --handler handler.lambda_handler \
       --zip-file fileb://${ZIP_FILE} \
+      --layers ${LAYER_ARN} \
       --role arn:aws:iam::000000000000:role/${ROLE_NAME} \
       --timeout 30 \
       --output text >/dev/null
@@ -162,9 +225,23 @@ QUEUE_ARN=$(awslocal sqs get-queue-attributes --queue-url $QUEUE_URL --attribute
 awslocal lambda create-event-source-mapping \
     --function-name ScoringFunction \
     --batch-size 10 \
+    --function-response-types ReportBatchItemFailures \
     --event-source-arn $QUEUE_ARN >/dev/null
 log "SQS trigger set up successfully."
 
+# DynamoDB stream trigger keeping the public catalog snapshot up to date
+log "Setting up Quizzes stream trigger for PublishCatalogFunction..."
+awslocal s3 mb s3://quiz-catalog >/dev/null
+QUIZZES_STREAM_ARN=$(awslocal dynamodb describe-table --table-name Quizzes --query 'Table.LatestStreamArn' --output text)
+
+awslocal lambda create-event-source-mapping \
+    --function-name PublishCatalogFunction \
+    --batch-size 100 \
+    --starting-position TRIM_HORIZON \
+    --maximum-retry-attempts 10 \
+    --event-source-arn $QUIZZES_STREAM_ARN >/dev/null
+log "Quizzes stream trigger set up successfully."
+
 # Create REST API
 log "Creating REST API..."
 API_ID=$(awslocal apigateway create-rest-api \
@@ -186,6 +263,9 @@ ENDPOINTS=(
   "getsubmission GET GetSubmissionFunction"
   "getleaderboard GET GetLeaderboardFunction"
   "listquizzes GET ListPublicQuizzesFunction"
+  "importquizzes POST ImportQuizzesFunction"
+  "submitquizzes POST SubmitQuizzesFunction"
+  "getusersubmissions GET GetUserSubmissionsFunction"
 )
 
 for ENDPOINT_INFO in "${ENDPOINTS[@]}"; do
@@ -263,7 +343,7 @@ log "Configuring SQS Redrive Policy..."
 awslocal sqs set-queue-attributes \
     --queue-url $QUEUE_URL \
     --attributes '{
-        "RedrivePolicy": "{\"deadLetterTargetArn\":\"'$DLQ_ARN'\",\"maxReceiveCount\":\"1\"}",
+        "RedrivePolicy": "{\"deadLetterTargetArn\":\"'$DLQ_ARN'\",\"maxReceiveCount\":\"5\"}",
         "VisibilityTimeout": "10"
     }' >/dev/null
 log "SQS Redrive Policy configured."
@@ -309,7 +389,13 @@ awslocal stepfunctions create-state-machine \
     --name SendEmailStateMachine \
     --definition file://configurations/statemachine.json \
     --role-arn arn:aws:iam::000000000000:role/SendEmailStateMachineRole >/dev/null
-log "State Machine created."
+
+awslocal stepfunctions create-state-machine \
+    --name SendEmailBatchStateMachine \
+    --type EXPRESS \
+    --definition file://configurations/statemachine_batch.json \
+    --role-arn arn:aws:iam::000000000000:role/SendEmailStateMachineRole >/dev/null
+log "State Machines created."
 
 # Deploy Frontend
 log "Deploying frontend..."
@@ -344,6 +430,16 @@ awslocal sns create-topic --name QuizzesWriteFailures --output json >/dev/null
 WRITE_FAILURES_QUEUE_URL=$(awslocal sqs create-queue --queue-name QuizzesWriteFailuresQueue --attributes VisibilityTimeout=60 --output json | jq -r '.QueueUrl')
 WRITE_FAILURES_QUEUE_ARN=$(awslocal sqs get-queue-attributes --queue-url $WRITE_FAILURES_QUEUE_URL --attribute-names QueueArn --query 'Attributes.QueueArn' --output text)
 
+# Writes that keep failing, e.g. because their QuizID was taken by another
+# quiz in the meantime, are kept here instead of being dropped
+WRITE_FAILURES_DLQ_URL=$(awslocal sqs create-queue --queue-name QuizzesWriteFailuresDLQ --output json | jq -r '.QueueUrl')
+WRITE_FAILURES_DLQ_ARN=$(awslocal sqs get-queue-attributes --queue-url $WRITE_FAILURES_DLQ_URL --attribute-names QueueArn --query 'Attributes.QueueArn' --output text)
+awslocal sqs set-queue-attributes \
+    --queue-url $WRITE_FAILURES_QUEUE_URL \
+    --attributes '{
+        "RedrivePolicy": "{\"deadLetterTargetArn\":\"'$WRITE_FAILURES_DLQ_ARN'\",\"maxReceiveCount\":\"5\"}"
+    }' >/dev/null
+
 awslocal sns subscribe \
     --topic-arn arn:aws:sns:us-east-1:000000000000:QuizzesWriteFailures \
     --protocol sqs \
@@ -353,6 +449,7 @@ awslocal sns subscribe \
 awslocal lambda create-event-source-mapping \
     --function-name RetryQuizzesWritesFunction \
     --batch-size 10 \
+    --function-response-types ReportBatchItemFailures \
     --event-source-arn $WRITE_FAILURES_QUEUE_ARN \
     --enabled \
     --output text >/dev/null
@@ -372,6 +469,9 @@ LAMBDA_PERMISSIONS=(
   "GetSubmissionFunction GET getsubmission"
   "GetLeaderboardFunction GET getleaderboard"
   "ListPublicQuizzesFunction GET listquizzes"
+  "ImportQuizzesFunction POST importquizzes"
+  "SubmitQuizzesFunction POST submitquizzes"
+  "GetUserSubmissionsFunction GET getusersubmissions"
 )
 
 for PERMISSION_INFO in "${LAMBDA_PERMISSIONS[@]}"; do
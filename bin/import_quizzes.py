@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+
+"""
+Bulk-import quizzes from a newline-delimited JSON file (one quiz per line, in
+the same format accepted by /createquiz) through the /importquizzes endpoint.
+
+The file is streamed and sent in requests of at most --batch-size quizzes.
+One result per quiz is printed to stdout as JSON lines, numbered by line in
+the input file. The exit code is 1 if any quiz could not be imported.
+
+    bin/import_quizzes.py quizzes.jsonl > results.jsonl
+"""
+
+import argparse
+import json
+import os
+import sys
+import urllib.error
+import urllib.request
+
+import boto3
+
+API_NAME = "QuizAPI"
+
+
+def discover_api_endpoint() -> str:
+    """Look up the QuizAPI endpoint on LocalStack, like bin/seed.sh does."""
+    aws_endpoint_url = os.environ.get("AWS_ENDPOINT_URL", "http://localhost:4566")
+    apigateway = boto3.client(
+        "apigateway",
+        endpoint_url=aws_endpoint_url,
+        region_name=os.environ.get("AWS_DEFAULT_REGION", "us-east-1"),
+        aws_access_key_id=os.environ.get("AWS_ACCESS_KEY_ID", "test"),
+        aws_secret_access_key=os.environ.get("AWS_SECRET_ACCESS_KEY", "test"),
+    )
+    for api in apigateway.get_rest_apis()["items"]:
+        if api["name"] == API_NAME:
+            return f"{aws_endpoint_url}/_aws/execute-api/{api['id']}/prod"
+    sys.exit(f"REST API {API_NAME} not found, pass --api-endpoint")
+
+
+def read_batches(lines, batch_size):
+    """Yield (line numbers, body) for every batch of non-blank input lines."""
+    numbers, batch = [], []
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        numbers.append(line_number)
+        batch.append(line.rstrip("\n"))
+        if len(batch) == batch_size:
+            yield numbers, "\n".join(batch)
+            numbers, batch = [], []
+    if batch:
+        yield numbers, "\n".join(batch)
+
+
+def import_batch(api_endpoint: str, body: str) -> list:
+    request = urllib.request.Request(
+        f"{api_endpoint}/importquizzes",
+        data=body.encode("utf-8"),
+        headers={"Content-Type": "application/x-ndjson"},
+        method="POST",
+    )
+    with urllib.request.urlopen(request) as response:
+        return [json.loads(line) for line in response.read().decode("utf-8").splitlines() if line]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("file", help="JSON lines file with one quiz per line, or - for stdin")
+    parser.add_argument("--api-endpoint", default=os.environ.get("API_ENDPOINT"))
+    parser.add_argument("--batch-size", type=int, default=1000, help="quizzes per request (default: 1000)")
+    args = parser.parse_args()
+
+    api_endpoint = args.api_endpoint or discover_api_endpoint()
+    source = sys.stdin if args.file == "-" else open(args.file, encoding="utf-8")
+    imported = failed = 0
+    with source:
+        for numbers, body in read_batches(source, args.batch_size):
+            try:
+                results = import_batch(api_endpoint, body)
+            except urllib.error.HTTPError as e:
+                error = e.read().decode("utf-8", errors="replace")
+                results = [{"Line": idx, "Error": f"HTTP {e.code}: {error}"} for idx in range(1, len(numbers) + 1)]
+            for result in results:
+                # map the line within the request back to the line in the file
+                result["Line"] = numbers[result["Line"] - 1]
+                if "QuizID" in result:
+                    imported += 1
+                else:
+                    failed += 1
+                print(json.dumps(result))
+
+    print(f"Imported {imported} quizzes, {failed} failed", file=sys.stderr)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
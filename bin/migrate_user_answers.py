@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+
+"""
+Rewrite the UserAnswers of existing UserSubmissions items in the packed binary
+form that scoring now stores, and report item sizes before and after.
+
+Items are scanned in --segments parallel segments. Each unpacked item is
+updated with a condition that UserAnswers is still a map, so the migration
+can be re-run, or run while scoring writes new submissions. Answers that do
+not fit the packed format are left as they are. With --dry-run nothing is
+written and only the sizes are reported.
+
+    bin/migrate_user_answers.py --dry-run
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import boto3
+from botocore.exceptions import ClientError
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "layers" / "common" / "python"))
+
+from quiz_common.dynamodb import item_size  # noqa: E402
+from quiz_common.user_answers import pack_user_answers  # noqa: E402
+
+TABLE_NAME = "UserSubmissions"
+WCU_BYTES = 1024
+
+
+def dynamodb_resource():
+    return boto3.resource(
+        "dynamodb",
+        endpoint_url=os.environ.get("AWS_ENDPOINT_URL", "http://localhost:4566"),
+        region_name=os.environ.get("AWS_DEFAULT_REGION", "us-east-1"),
+        aws_access_key_id=os.environ.get("AWS_ACCESS_KEY_ID", "test"),
+        aws_secret_access_key=os.environ.get("AWS_SECRET_ACCESS_KEY", "test"),
+    )
+
+
+def write_units(size: int) -> int:
+    """WCUs to write an item of ``size`` bytes to the table and the QuizID-Score-index GSI."""
+    return 2 * max(1, math.ceil(size / WCU_BYTES))
+
+
+def migrate_segment(table, segment: int, total_segments: int, dry_run: bool) -> dict:
+    stats = {"scanned": 0, "migrated": 0, "skipped": 0, "bytes_before": 0, "bytes_after": 0,
+             "wcu_before": 0, "wcu_after": 0}
+    scan_kwargs = {"Segment": segment, "TotalSegments": total_segments}
+    while True:
+        response = table.scan(**scan_kwargs)
+        for item in response.get("Items", []):
+            stats["scanned"] += 1
+            size_before = item_size(item)
+            user_answers = item.get("UserAnswers")
+            packed = None
+            if isinstance(user_answers, dict):
+                try:
+                    packed = pack_user_answers(user_answers)
+                except (KeyError, TypeError, ValueError) as e:
+                    print(f"Leaving {item['SubmissionID']} unpacked: {e}", file=sys.stderr)
+            size_after = item_size({**item, "UserAnswers": packed}) if packed is not None else size_before
+            if packed is not None and not dry_run:
+                try:
+                    table.update_item(
+                        Key={"SubmissionID": item["SubmissionID"]},
+                        UpdateExpression="SET UserAnswers = :packed",
+                        ConditionExpression="attribute_type(UserAnswers, :map)",
+                        ExpressionAttributeValues={":packed": packed, ":map": "M"},
+                    )
+                except ClientError as e:
+                    if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                        raise
+                    packed = None
+                    size_after = size_before
+            stats["migrated" if packed is not None else "skipped"] += 1
+            stats["bytes_before"] += size_before
+            stats["bytes_after"] += size_after
+            stats["wcu_before"] += write_units(size_before)
+            stats["wcu_after"] += write_units(size_after)
+        if "LastEvaluatedKey" not in response:
+            return stats
+        scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--segments", type=int, default=4, help="parallel scan segments (default: 4)")
+    parser.add_argument("--dry-run", action="store_true", help="only report sizes, do not write")
+    args = parser.parse_args()
+
+    def run(segment):
+        # boto3 resources are not thread safe, so every segment gets its own
+        table = dynamodb_resource().Table(TABLE_NAME)
+        return migrate_segment(table, segment, args.segments, args.dry_run)
+
+    with ThreadPoolExecutor(max_workers=args.segments) as executor:
+        results = list(executor.map(run, range(args.segments)))
+
+    totals = {key: sum(result[key] for result in results) for key in results[0]}
+    if totals["scanned"]:
+        totals["average_bytes_before"] = totals["bytes_before"] / totals["scanned"]
+        totals["average_bytes_after"] = totals["bytes_after"] / totals["scanned"]
+    totals["dry_run"] = args.dry_run
+    print(json.dumps(totals))
+
+
+if __name__ == "__main__":
+    main()
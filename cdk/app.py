@@ -8,7 +8,7 @@ from quiz_app.quiz_app_stack import QuizAppStack
 
 
 app = cdk.App()
-QuizAppStack(app, "QuizAppStack",
+quiz_app_stack = QuizAppStack(app, "QuizAppStack",
     # If you don't specify 'env', this stack will be environment-agnostic.
     # Account/Region-dependent features and context lookups will not work,
     # but a single synthesized template can be deployed anywhere.
@@ -26,6 +26,6 @@ QuizAppStack(app, "QuizAppStack",
     # For more information, see https://docs.aws.amazon.com/cdk/latest/guide/environments.html
     )
 
-FrontendStack(app, "FrontendStack")
+FrontendStack(app, "FrontendStack", catalog_bucket=quiz_app_stack.catalog_bucket)
 
 app.synth()
@@ -13,7 +13,7 @@ from constructs import Construct
 
 
 class FrontendStack(Stack):
-    def __init__(self, scope: Construct, construct_id: str, **kwargs) -> None:
+    def __init__(self, scope: Construct, construct_id: str, catalog_bucket: s3.IBucket = None, **kwargs) -> None:
         super().__init__(scope, construct_id, **kwargs)
 
         webapp_bucket = s3.Bucket(
@@ -25,6 +25,18 @@ class FrontendStack(Stack):
         origin_access_identity = cf.OriginAccessIdentity(self, "OriginAccessIdentity")
         webapp_bucket.grant_read(origin_access_identity)
 
+        # the public quiz catalog snapshot lives in its own bucket so that
+        # redeploying the web app does not prune it
+        additional_behaviors = {}
+        if catalog_bucket is not None:
+            # S3Origin creates the bucket's access identity in the bucket's own
+            # stack, which keeps the dependency between the stacks one-way
+            additional_behaviors["/catalog/*"] = cf.BehaviorOptions(
+                origin=origins.S3Origin(catalog_bucket),
+                viewer_protocol_policy=cf.ViewerProtocolPolicy.REDIRECT_TO_HTTPS,
+                cache_policy=cf.CachePolicy.CACHING_OPTIMIZED,
+            )
+
         # deploy process
         distribution = cf.Distribution(
             self,
@@ -37,6 +49,7 @@ class FrontendStack(Stack):
                 ),
                 viewer_protocol_policy=cf.ViewerProtocolPolicy.REDIRECT_TO_HTTPS,
             ),
+            additional_behaviors=additional_behaviors,
         )
 
         s3deploy.BucketDeployment(
@@ -8,6 +8,7 @@ from aws_cdk import (
     aws_sns as sns,
     aws_stepfunctions as sfn,
     aws_pipes as pipes,
+    aws_s3 as s3,
     aws_sqs as sqs,
     custom_resources as cr,
 )
@@ -16,6 +17,7 @@ from constructs import Construct
 
 class QuizAppStack(Stack):
     backend_api_url: str
+    catalog_bucket: s3.Bucket
 
     def __init__(self, scope: Construct, construct_id: str, **kwargs) -> None:
         super().__init__(scope, construct_id, **kwargs)
@@ -32,6 +34,23 @@ class QuizAppStack(Stack):
             billing_mode=dynamodb.BillingMode.PROVISIONED,
             read_capacity=5,
             write_capacity=5,
+            stream=dynamodb.StreamViewType.NEW_AND_OLD_IMAGES,
+        )
+        # sparse index: only public quizzes carry PublicCatalog, newest first
+        quizzes_table.add_global_secondary_index(
+            index_name="PublicCatalog-CreatedAt-index",
+            partition_key=dynamodb.Attribute(
+                name="PublicCatalog",
+                type=dynamodb.AttributeType.STRING,
+            ),
+            sort_key=dynamodb.Attribute(
+                name="CreatedAt",
+                type=dynamodb.AttributeType.NUMBER,
+            ),
+            projection_type=dynamodb.ProjectionType.INCLUDE,
+            non_key_attributes=["Title", "Visibility"],
+            read_capacity=5,
+            write_capacity=5,
         )
 
         user_submissions_table = dynamodb.Table(
@@ -60,14 +79,61 @@ class QuizAppStack(Stack):
             read_capacity=5,
             write_capacity=5,
         )
+        # a user's submissions, newest first; only what a results list shows
+        user_submissions_table.add_global_secondary_index(
+            index_name="Username-SubmittedAt-index",
+            partition_key=dynamodb.Attribute(
+                name="Username",
+                type=dynamodb.AttributeType.STRING,
+            ),
+            sort_key=dynamodb.Attribute(
+                name="SubmittedAt",
+                type=dynamodb.AttributeType.NUMBER,
+            ),
+            projection_type=dynamodb.ProjectionType.INCLUDE,
+            non_key_attributes=["QuizID", "Score", "TotalQuestions"],
+            read_capacity=5,
+            write_capacity=5,
+        )
+
+        leaderboards_table = dynamodb.Table(
+            self,
+            "LeaderboardsTable",
+            table_name="Leaderboards",
+            partition_key=dynamodb.Attribute(
+                name="QuizID",
+                type=dynamodb.AttributeType.STRING,
+            ),
+            billing_mode=dynamodb.BillingMode.PROVISIONED,
+            read_capacity=5,
+            write_capacity=5,
+        )
+
+        # public catalog snapshot, served by the FrontendStack distribution
+        self.catalog_bucket = s3.Bucket(
+            self,
+            "CatalogBucket",
+            auto_delete_objects=True,
+            removal_policy=aws_cdk.RemovalPolicy.DESTROY,
+        )
+
+        # questions of quizzes too large to keep inline in the Quizzes table
+        questions_bucket = s3.Bucket(
+            self,
+            "QuizQuestionsBucket",
+            auto_delete_objects=True,
+            removal_policy=aws_cdk.RemovalPolicy.DESTROY,
+        )
 
         dlq_submission_queue = sqs.Queue(self, "QuizSubmissionDLQ")
         submission_queue = sqs.Queue(
             self,
             "QuizSubmissionQueue",
             queue_name="QuizSubmissionQueue",
+            # records reported in batchItemFailures are redelivered until
+            # they have been received 5 times, then moved to the DLQ
             dead_letter_queue=sqs.DeadLetterQueue(
-                max_receive_count=1, queue=dlq_submission_queue
+                max_receive_count=5, queue=dlq_submission_queue
             ),
             visibility_timeout=aws_cdk.Duration.minutes(1),
         )
@@ -104,9 +170,34 @@ class QuizAppStack(Stack):
                 "RetryQuizzesWritesFunction",
                 "lambdas/retry_quizzes_writes",
             ),
+            (
+                "PublishCatalogFunction",
+                "lambdas/publish_catalog",
+            ),
+            (
+                "ImportQuizzesFunction",
+                "lambdas/import_quizzes",
+            ),
+            (
+                "SubmitQuizzesFunction",
+                "lambdas/submit_quizzes",
+            ),
+            (
+                "GetUserSubmissionsFunction",
+                "lambdas/get_user_submissions",
+            ),
         ]
         functions = {}
 
+        # shared client pool and helpers, imported by the handlers as quiz_common
+        common_layer = _lambda.LayerVersion(
+            self,
+            "QuizCommonLayer",
+            layer_version_name="QuizCommonLayer",
+            code=_lambda.Code.from_asset("../layers/common"),
+            compatible_runtimes=[_lambda.Runtime.PYTHON_3_11],
+        )
+
         for function_info in functions_and_roles:
             function_name, handler_path = function_info
             current_function = _lambda.Function(
@@ -116,6 +207,7 @@ class QuizAppStack(Stack):
                 runtime=_lambda.Runtime.PYTHON_3_11,
                 handler="handler.lambda_handler",
                 code=_lambda.Code.from_asset(f"../{handler_path}"),
+                layers=[common_layer],
                 timeout=aws_cdk.Duration.seconds(30),
             )
             functions[function_name] = current_function
@@ -125,6 +217,30 @@ class QuizAppStack(Stack):
             "ScoringFunctionSubscription",
             target=functions["ScoringFunction"],
             event_source_arn=submission_queue.queue_arn,
+            report_batch_item_failures=True,
+        )
+
+        for function_name in ("SubmitQuizFunction", "SubmitQuizzesFunction"):
+            functions[function_name].add_environment(
+                "SUBMISSION_QUEUE_URL", submission_queue.queue_url
+            )
+
+        for function_name in ("CreateQuizFunction", "ImportQuizzesFunction", "GetQuizFunction"):
+            functions[function_name].add_environment(
+                "QUIZ_QUESTIONS_BUCKET_NAME", questions_bucket.bucket_name
+            )
+
+        functions["PublishCatalogFunction"].add_environment(
+            "CATALOG_BUCKET_NAME", self.catalog_bucket.bucket_name
+        )
+        _lambda.EventSourceMapping(
+            self,
+            "PublishCatalogFunctionSubscription",
+            target=functions["PublishCatalogFunction"],
+            event_source_arn=quizzes_table.table_stream_arn,
+            starting_position=_lambda.StartingPosition.TRIM_HORIZON,
+            batch_size=100,
+            retry_attempts=10,
         )
 
         # create rest api
@@ -147,6 +263,9 @@ class QuizAppStack(Stack):
             ("getsubmission", "GET", "GetSubmissionFunction"),
             ("getleaderboard", "GET", "GetLeaderboardFunction"),
             ("listquizzes", "GET", "ListPublicQuizzesFunction"),
+            ("importquizzes", "POST", "ImportQuizzesFunction"),
+            ("submitquizzes", "POST", "SubmitQuizzesFunction"),
+            ("getusersubmissions", "GET", "GetUserSubmissionsFunction"),
         ]
         for path_part, http_method, function_name in endpoints:
             resource = rest_api.root.add_resource(path_part)
@@ -265,18 +384,42 @@ class QuizAppStack(Stack):
             state_machine_name="SendEmailStateMachine"
         )
 
+        self.batch_state_machine = sfn.StateMachine(
+            self,
+            "SendEmailBatchStateMachine",
+            definition_body=sfn.DefinitionBody.from_file(
+                "../configurations/statemachine_batch.json"
+            ),
+            role=state_machine_role,
+            state_machine_name="SendEmailBatchStateMachine",
+            state_machine_type=sfn.StateMachineType.EXPRESS,
+        )
+
         # set up lambda permissions
         quizzes_table.grant_write_data(functions["CreateQuizFunction"])
         # TODO: createquizfunction should be able to write to QuizzesWriteFailures
         quizzes_table.grant_read_data(functions["GetQuizFunction"])
         quizzes_table.grant_read_data(functions["SubmitQuizFunction"])
         submission_queue.grant_send_messages(functions["SubmitQuizFunction"])
+        quizzes_table.grant_read_data(functions["SubmitQuizzesFunction"])
+        submission_queue.grant_send_messages(functions["SubmitQuizzesFunction"])
         quizzes_table.grant_read_write_data(functions["ScoringFunction"])
         self.state_machine.grant_start_execution(functions["ScoringFunction"])
+        self.batch_state_machine.grant_start_execution(functions["ScoringFunction"])
         submission_queue.grant_consume_messages(functions["ScoringFunction"])
         user_submissions_table.grant_read_write_data(functions["ScoringFunction"])
         user_submissions_table.grant_read_data(functions["GetSubmissionFunction"])
+        user_submissions_table.grant_read_data(functions["GetUserSubmissionsFunction"])
         user_submissions_table.grant_read_data(functions["GetLeaderboardFunction"])
+        leaderboards_table.grant_read_write_data(functions["ScoringFunction"])
+        leaderboards_table.grant_read_data(functions["GetLeaderboardFunction"])
         quizzes_table.grant_read_data(functions["ListPublicQuizzesFunction"])
         quizzes_table.grant_read_write_data(functions["RetryQuizzesWritesFunction"])
+        quizzes_table.grant_stream_read(functions["PublishCatalogFunction"])
+        quizzes_table.grant_read_write_data(functions["ImportQuizzesFunction"])
+        self.catalog_bucket.grant_read_write(functions["PublishCatalogFunction"])
+        questions_bucket.grant_put(functions["CreateQuizFunction"])
+        questions_bucket.grant_put(functions["ImportQuizzesFunction"])
+        questions_bucket.grant_delete(functions["ImportQuizzesFunction"])
+        questions_bucket.grant_read(functions["GetQuizFunction"])
         # TODO: retryquizzeswritesfunction should have access to read and write to quizzeswritefailuresqueue
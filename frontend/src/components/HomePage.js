@@ -27,8 +27,18 @@ function HomePage() {
   const navigate = useNavigate();
 
   useEffect(() => {
-    fetch(`${process.env.REACT_APP_API_ENDPOINT}/listquizzes`)
-      .then((res) => res.json())
+    // The catalog snapshot is served by CloudFront next to the app; fall back
+    // to the API when it is not available (e.g. on the dev server)
+    fetch('/catalog/public-quizzes.json')
+      .then((res) => {
+        if (!res.ok) {
+          throw new Error(`Catalog snapshot unavailable: ${res.status}`);
+        }
+        return res.json();
+      })
+      .catch(() =>
+        fetch(`${process.env.REACT_APP_API_ENDPOINT}/listquizzes`).then((res) => res.json())
+      )
       .then((data) => {
         if (data && Array.isArray(data.Quizzes) && data.Quizzes.length > 0) {
           setPublicQuizzes(data.Quizzes);
@@ -1,93 +1,78 @@
 import json
-import boto3
-import random
+import os
+import time
+from decimal import Decimal
 
-class IdSentence:
-    """Generate human-readable IDs composed of adjectives, nouns, and verbs."""
+from quiz_common import clients
+from quiz_common.circuit_breaker import CircuitBreaker, is_transient_error
+from quiz_common.encoding import encode_item
+from quiz_common.question_store import is_oversized, offload_questions
+from quiz_common.quiz_ids import (
+    QUIZ_ID_CONDITION,
+    QUIZ_ID_RETRY_SUFFIX_DIGITS,
+    candidate_quiz_ids,
+    generate_quiz_id,
+    is_id_collision,
+)
+from quiz_common.quizzes import IncompleteQuestionError, assign_quiz_id, normalize_quiz
 
-    def __init__(self):
-        self.adjectives = [
-            'adorable', 'adventurous', 'alluring', 'amazing',
-            'ambitious', 'amusing', 'astonishing', 'attractive', 'awesome',
-            'bashful', 'bawdy', 'beautiful', 'bewildered', 'bizarre', 'bouncy',
-            'brainy', 'brave', 'brawny', 'burly', 'capricious', 'careful',
-            'caring', 'cautious', 'charming', 'cheerful', 'chivalrous',
-            'classy', 'clever', 'clumsy', 'colossal', 'cool', 'coordinated',
-            'courageous', 'cuddly', 'curious', 'cute', 'daffy', 'dapper',
-            'dashing', 'dazzling', 'delicate', 'delightful', 'determined',
-            'eager', 'embarrassed', 'enchanted', 'energetic', 'enormous',
-            'entertaining', 'enthralling', 'enthusiastic', 'evanescent',
-            'excited', 'exotic', 'exuberant', 'exultant', 'fabulous', 'fancy',
-            'festive', 'finicky', 'flashy', 'flippant', 'fluffy', 'fluttering',
-            'funny', 'furry', 'fuzzy', 'gaudy', 'gentle', 'giddy', 'glamorous',
-            'gleaming', 'goofy', 'gorgeous', 'graceful', 'grandiose', 'groovy',
-            'handsome', 'happy', 'hilarious', 'honorable', 'hulking',
-            'humorous', 'industrious', 'incredible', 'intelligent', 'jazzy',
-            'jolly', 'joyous', 'kind', 'macho', 'magnificent', 'majestic',
-            'marvelous', 'mighty', 'mysterious', 'naughty', 'nimble', 'nutty',
-            'oafish', 'obnoxious', 'outrageous', 'pretty', 'psychedelic',
-            'psychotic', 'puzzled', 'quirky', 'quizzical', 'rambunctious',
-            'remarkable', 'sassy', 'shaggy', 'smelly', 'sneaky', 'spiffy',
-            'swanky', 'sweet', 'swift', 'talented', 'thundering', 'unkempt',
-            'upbeat', 'uppity', 'wacky', 'waggish', 'whimsical', 'wiggly',
-            'zany'
-        ]
+WRITE_BREAKER_FAILURE_THRESHOLD = int(os.environ.get('WRITE_BREAKER_FAILURE_THRESHOLD', '3'))
+WRITE_BREAKER_LATENCY_THRESHOLD_SECONDS = float(os.environ.get('WRITE_BREAKER_LATENCY_THRESHOLD_SECONDS', '1'))
+WRITE_BREAKER_RESET_TIMEOUT_SECONDS = float(os.environ.get('WRITE_BREAKER_RESET_TIMEOUT_SECONDS', '10'))
 
-        self.nouns = [
-            'aardvarks', 'alligators', 'alpacas', 'anteaters', 'antelopes',
-            'armadillos', 'baboons', 'badgers', 'bears', 'beavers',
-            'boars', 'buffalos', 'bulls', 'bunnies', 'camels', 'cats',
-            'chameleons', 'cheetahs', 'centaurs', 'chickens', 'chimpanzees',
-            'chinchillas', 'chipmunks', 'cougars', 'cows', 'coyotes', 'cranes',
-            'crickets', 'crocodiles', 'deers', 'dinosaurs', 'dingos', 'dogs',
-            'donkeys', 'dragons', 'elephants', 'elves', 'ferrets', 'flamingos',
-            'foxes', 'frogs', 'gazelles', 'giraffes', 'gnomes', 'gnus', 'goats',
-            'gophers', 'gorillas', 'hamsters', 'hedgehogs', 'hippopotamus',
-            'hobbits', 'hogs', 'horses', 'hyenas', 'ibexes', 'iguanas',
-            'impalas', 'jackals', 'jackalopes', 'jaguars', 'kangaroos',
-            'kittens', 'koalas', 'lambs', 'lemmings', 'leopards', 'lions',
-            'ligers', 'lizards', 'llamas', 'lynxes', 'meerkat', 'moles',
-            'mongooses', 'monkeys', 'moose', 'mules', 'newts', 'okapis',
-            'orangutans', 'ostriches', 'otters', 'oxes', 'pandas', 'panthers',
-            'peacocks', 'pegasuses', 'phoenixes', 'pigeons', 'pigs',
-            'platypuses', 'ponies', 'porcupines', 'porpoises', 'pumas',
-            'pythons', 'rabbits', 'raccoons', 'rams', 'reindeers',
-            'rhinoceroses', 'salamanders', 'seals', 'sheep', 'skunks',
-            'sloths', 'slugs', 'snails', 'snakes', 'sphinxes', 'sprites',
-            'squirrels', 'takins', 'tigers', 'toads', 'trolls', 'turtles',
-            'unicorns', 'walruses', 'warthogs', 'weasels', 'wolves',
-            'wolverines', 'wombats', 'woodchucks', 'yaks', 'zebras'
-        ]
+# Opens when Quizzes writes keep failing or crawling, so that new quizzes go
+# straight to the SNS retry path instead of waiting through client retries
+write_breaker = CircuitBreaker(
+    WRITE_BREAKER_FAILURE_THRESHOLD,
+    WRITE_BREAKER_RESET_TIMEOUT_SECONDS,
+    latency_threshold_seconds=WRITE_BREAKER_LATENCY_THRESHOLD_SECONDS,
+)
 
-        self.verbs = [
-            'ambled', 'assembled', 'burst', 'babbled', 'charged', 'chewed',
-            'clamored', 'coasted', 'crawled', 'crept', 'danced', 'dashed',
-            'drove', 'flopped', 'galloped', 'gathered', 'glided', 'hobbled',
-            'hopped', 'hurried', 'hustled', 'jogged', 'juggled', 'jumped',
-            'laughed', 'marched', 'meandered', 'munched', 'passed', 'plodded',
-            'pranced', 'ran', 'raced', 'rushed', 'sailed', 'sang', 'sauntered',
-            'scampered', 'scurried', 'skipped', 'slogged', 'slurped', 'spied',
-            'sprinted', 'spurted', 'squiggled', 'squirmed', 'stretched',
-            'strode', 'strut', 'swam', 'swung', 'traveled', 'trudged',
-            'tumbled', 'twisted', 'wade', 'wandered', 'whistled', 'wiggled',
-            'wobbled', 'yawned', 'zipped', 'zoomed'
-        ]
 
-def lambda_handler(event, context):
+def _queue_failed_write(quiz_data, error):
+    """Hand a quiz that could not be stored to RetryQuizzesWritesFunction via SNS."""
+    message = {
+        'TableName': 'Quizzes',
+        'Item': quiz_data
+    }
+    print(f"Attempting to publish failed write to SNS: {message}")
+    sns = clients.client('sns')
     try:
-        quiz_data = json.loads(event['body'])
-        title = quiz_data['Title']
-        questions = quiz_data['Questions']
-        visibility = quiz_data.get('Visibility', 'Private')
-        if visibility not in ('Public', 'Private'):
-            raise ValueError("Visibility must be 'Public' or 'Private'")
+        sns.publish(
+            TopicArn='arn:aws:sns:us-east-1:000000000000:QuizzesWriteFailures',
+            # numbers in the quiz are Decimal, which json.dumps rejects
+            Message=encode_item(message)
+        )
+        print(f"Published failed write to SNS: {error}")
+    except Exception as sns_e:
+        print(f"Failed to publish to SNS: {sns_e}")
+    return {
+        'statusCode': 500,
+        'headers': {
+            'Access-Control-Allow-Origin': '*',
+            'Access-Control-Allow-Methods': '*',
+        },
+        'body': json.dumps({
+            'message': 'Error storing quiz data. It has been queued for retry.',
+            'error': str(error),
+            'QuizID': quiz_data['QuizID']
+        })
+    }
+
 
-        enable_timer = quiz_data.get('EnableTimer', False)
-        timer_seconds = None
-        if enable_timer:
-            timer_seconds = int(quiz_data.get('TimerSeconds', 0))
-            if timer_seconds <= 0:
-                raise ValueError("TimerSeconds must be a positive integer")
+def lambda_handler(event, context):
+    try:
+        # DynamoDB only takes Decimal numbers
+        quiz_data = normalize_quiz(json.loads(event['body'], parse_float=Decimal))
+    except IncompleteQuestionError as e:
+        return {
+            'statusCode': 400,
+            'headers': {
+                'Access-Control-Allow-Origin': '*',
+                'Access-Control-Allow-Methods': '*',
+            },
+            'body': json.dumps({'message': str(e)})
+        }
     except (KeyError, json.JSONDecodeError, ValueError, TypeError) as e:
         return {
             'statusCode': 400,
@@ -101,59 +86,62 @@ def lambda_handler(event, context):
             })
         }
 
-    for question in questions:
-        if not all(k in question for k in ('QuestionText', 'Options', 'CorrectAnswer', 'Trivia')):
+    if is_oversized(quiz_data):
+        try:
+            offload_questions(quiz_data, clients.client('s3'))
+        except Exception as e:
+            print(f"Error storing questions in S3: {e}")
             return {
-                'statusCode': 400,
+                'statusCode': 500,
                 'headers': {
                     'Access-Control-Allow-Origin': '*',
                     'Access-Control-Allow-Methods': '*',
                 },
-                'body': json.dumps({
-                    'message': 'Each question must contain QuestionText, Options, CorrectAnswer, and Trivia'
-                })
+                'body': json.dumps({'message': 'Error storing quiz questions', 'error': str(e)})
             }
 
-    dynamodb = boto3.resource('dynamodb')
+    if not write_breaker.allow_request():
+        # Without a conditional put to catch collisions, use the longer IDs
+        assign_quiz_id(quiz_data, generate_quiz_id(QUIZ_ID_RETRY_SUFFIX_DIGITS))
+        return _queue_failed_write(quiz_data, 'Quizzes writes are failing, circuit breaker is open')
+
+    dynamodb = clients.resource('dynamodb')
     table = dynamodb.Table('Quizzes')
-    id_sentence = IdSentence()
-    adjective = random.choice(id_sentence.adjectives)
-    noun = random.choice(id_sentence.nouns)
-    verb = random.choice(id_sentence.verbs)
-    quiz_id = f"{adjective}-{noun}-{verb}"
-    quiz_data['QuizID'] = quiz_id
-    quiz_data['Visibility'] = visibility
-    quiz_data['EnableTimer'] = enable_timer
-    if enable_timer:
-        quiz_data['TimerSeconds'] = timer_seconds
 
-    try:
-        table.put_item(Item=quiz_data)
-    except Exception as e:
-        message = {
-            'TableName': 'Quizzes',
-            'Item': quiz_data
-        }
-        print(f"Attempting to publish failed write to SNS: {message}")
-        sns = boto3.client('sns')
+    for quiz_id in candidate_quiz_ids():
+        assign_quiz_id(quiz_data, quiz_id)
+        started = time.monotonic()
         try:
-            sns.publish(
-                TopicArn='arn:aws:sns:us-east-1:000000000000:QuizzesWriteFailures',
-                Message=json.dumps(message)
-            )
-            print(f"Published failed write to SNS: {e}")
-        except Exception as sns_e:
-            print(f"Failed to publish to SNS: {sns_e}")
+            table.put_item(Item=quiz_data, ConditionExpression=QUIZ_ID_CONDITION)
+        except Exception as e:
+            if is_id_collision(e):
+                write_breaker.record_success(time.monotonic() - started)
+                print(f"QuizID {quiz_id} is taken, trying another one")
+                continue
+            if not is_transient_error(e):
+                # The same quiz would fail again on retry, and DynamoDB is fine
+                print(f"Quizzes write rejected: {e}")
+                return {
+                    'statusCode': 400,
+                    'headers': {
+                        'Access-Control-Allow-Origin': '*',
+                        'Access-Control-Allow-Methods': '*',
+                    },
+                    'body': json.dumps({'message': 'Invalid input data', 'error': str(e)})
+                }
+            write_breaker.record_failure()
+            print(f"Quizzes write failed, circuit breaker: {write_breaker.stats()}")
+            return _queue_failed_write(quiz_data, e)
+        write_breaker.record_success(time.monotonic() - started)
+        break
+    else:
         return {
-            'statusCode': 500,
+            'statusCode': 503,
             'headers': {
                 'Access-Control-Allow-Origin': '*',
                 'Access-Control-Allow-Methods': '*',
             },
-            'body': json.dumps({
-                'message': 'Error storing quiz data. It has been queued for retry.',
-                'error': str(e)
-            })
+            'body': json.dumps({'message': 'Could not allocate a unique QuizID, please try again.'})
         }
 
     return {
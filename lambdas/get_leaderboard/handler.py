@@ -1,8 +1,16 @@
 import json
-import boto3
-from boto3.dynamodb.conditions import Key
 from typing import Any, Dict
 
+from quiz_common import clients
+from quiz_common.leaderboard import LEADERBOARD_SIZE, LEADERBOARD_TABLE_NAME
+from quiz_common.pagination import decode_cursor, encode_cursor
+
+SUBMISSIONS_TABLE_NAME = 'UserSubmissions'
+SCORE_INDEX_NAME = 'QuizID-Score-index'
+# Key attributes of the QuizID-Score-index, i.e. of its LastEvaluatedKey
+SCORE_INDEX_KEY = {'QuizID': 'S', 'Score': 'N', 'SubmissionID': 'S'}
+MAX_NEIGHBOURS = 10
+
 # Common CORS headers used for API Gateway responses
 CORS_HEADERS: Dict[str, str] = {
     'Access-Control-Allow-Origin': '*',
@@ -21,31 +29,153 @@ def _build_response(status_code: int, body: Any) -> Dict[str, Any]:
         'body': json.dumps(body),
     }
 
+def _entry(item) -> Dict[str, Any]:
+    """Convert a wire-format leaderboard row to its response shape."""
+    return {
+        'Username': item['Username']['S'],
+        'Score': float(item['Score']['N']),
+        'SubmissionID': item['SubmissionID']['S']
+    }
+
+
+def _materialized_leaderboard(dynamodb, quiz_id: str, top: int):
+    """Return the top entries from the quiz's Leaderboards item, or None if it has none."""
+    response = dynamodb.get_item(
+        TableName=LEADERBOARD_TABLE_NAME,
+        Key={'QuizID': {'S': quiz_id}},
+        ProjectionExpression='TopEntries',
+    )
+    if 'Item' not in response:
+        return None
+    return [_entry(entry['M']) for entry in response['Item']['TopEntries']['L'][:top]]
+
+
+def _query_scores(dynamodb, quiz_id: str, limit: int, descending: bool = True, start_key=None):
+    """Query one page of the QuizID-Score-index, best scores first unless ``descending`` is False."""
+    kwargs = {}
+    if start_key:
+        kwargs['ExclusiveStartKey'] = start_key
+    return dynamodb.query(
+        TableName=SUBMISSIONS_TABLE_NAME,
+        IndexName=SCORE_INDEX_NAME,
+        KeyConditionExpression='#quiz_id = :quiz_id',
+        ProjectionExpression='#username, #score, #submission_id',
+        ExpressionAttributeNames={
+            '#quiz_id': 'QuizID',
+            '#username': 'Username',
+            '#score': 'Score',
+            '#submission_id': 'SubmissionID',
+        },
+        ExpressionAttributeValues={':quiz_id': {'S': quiz_id}},
+        ScanIndexForward=not descending,
+        Limit=limit,
+        **kwargs
+    )
+
+
+def _count_higher_scores(dynamodb, quiz_id: str, score: str) -> int:
+    """Count the quiz's submissions scoring strictly more than ``score``.
+
+    Uses Select=COUNT on the index so only the count crosses the wire; pages
+    are followed because DynamoDB stops counting after 1 MB of index data.
+    """
+    count = 0
+    kwargs = {}
+    while True:
+        response = dynamodb.query(
+            TableName=SUBMISSIONS_TABLE_NAME,
+            IndexName=SCORE_INDEX_NAME,
+            KeyConditionExpression='#quiz_id = :quiz_id AND #score > :score',
+            ExpressionAttributeNames={'#quiz_id': 'QuizID', '#score': 'Score'},
+            ExpressionAttributeValues={':quiz_id': {'S': quiz_id}, ':score': {'N': score}},
+            Select='COUNT',
+            **kwargs
+        )
+        count += response['Count']
+        if 'LastEvaluatedKey' not in response:
+            return count
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def _leaderboard_page(dynamodb, quiz_id: str, top: int, cursor: str) -> Dict[str, Any]:
+    """Return one page of the leaderboard and the cursor of the next page."""
+    start_key = None
+    if cursor:
+        start_key = decode_cursor(cursor, SCORE_INDEX_KEY)
+        if start_key['QuizID']['S'] != quiz_id:
+            raise ValueError("Cursor belongs to a different quiz")
+    response = _query_scores(dynamodb, quiz_id, top, start_key=start_key)
+    return {
+        'Leaderboard': [_entry(item) for item in response.get('Items', [])],
+        'NextCursor': encode_cursor(response.get('LastEvaluatedKey')),
+    }
+
+
+def _submission_rank(dynamodb, quiz_id: str, submission_id: str, neighbours: int):
+    """Return the rank of a submission and the entries around it, or None if it is not in the quiz."""
+    response = dynamodb.get_item(
+        TableName=SUBMISSIONS_TABLE_NAME,
+        Key={'SubmissionID': {'S': submission_id}},
+        ProjectionExpression='#quiz_id, #username, #score, #submission_id',
+        ExpressionAttributeNames={
+            '#quiz_id': 'QuizID',
+            '#username': 'Username',
+            '#score': 'Score',
+            '#submission_id': 'SubmissionID',
+        },
+    )
+    item = response.get('Item')
+    if item is None or item.get('QuizID', {}).get('S') != quiz_id or 'Score' not in item:
+        return None
+
+    score = item['Score']['N']
+    own_key = {'QuizID': item['QuizID'], 'Score': item['Score'], 'SubmissionID': item['SubmissionID']}
+    above, below = [], []
+    if neighbours:
+        # Walk the index in both directions starting right after this submission
+        above = _query_scores(dynamodb, quiz_id, neighbours, descending=False, start_key=own_key).get('Items', [])
+        below = _query_scores(dynamodb, quiz_id, neighbours, start_key=own_key).get('Items', [])
+    return {
+        'Rank': _count_higher_scores(dynamodb, quiz_id, score) + 1,
+        'Submission': _entry(item),
+        'Above': [_entry(entry) for entry in reversed(above)],
+        'Below': [_entry(entry) for entry in below],
+    }
+
+
 def lambda_handler(event, context):
     try:
-        quiz_id = event['queryStringParameters']['quiz_id']
-        top = int(event['queryStringParameters'].get('top', 10))
+        params = event['queryStringParameters']
+        quiz_id = params['quiz_id']
+        top = int(params.get('top', 10))
+        neighbours = min(int(params.get('neighbours', 2)), MAX_NEIGHBOURS)
+        if top < 1 or neighbours < 0:
+            raise ValueError("top must be positive and neighbours must not be negative")
     except (KeyError, TypeError, ValueError) as e:
         return _build_response(400, {'message': 'quiz_id is required and top should be an integer', 'error': str(e)})
 
-    dynamodb = boto3.resource('dynamodb')
-    table = dynamodb.Table('UserSubmissions')
+    dynamodb = clients.client('dynamodb')
 
     try:
-        response = table.query(
-            IndexName='QuizID-Score-index',
-            KeyConditionExpression=Key('QuizID').eq(quiz_id),
-            ScanIndexForward=False,
-            Limit=top
-        )
-        items = response.get('Items', [])
-        leaderboard = [
-            {
-                'Username': item['Username'],
-                'Score': float(item['Score']),
-                'SubmissionID': item['SubmissionID']
-            } for item in items
-        ]
-        return _build_response(200, leaderboard)
+        if params.get('submission_id'):
+            rank = _submission_rank(dynamodb, quiz_id, params['submission_id'], neighbours)
+            if rank is None:
+                return _build_response(404, {'message': 'Submission not found for this quiz'})
+            return _build_response(200, rank)
+
+        if 'cursor' in params:
+            try:
+                return _build_response(200, _leaderboard_page(dynamodb, quiz_id, top, params['cursor'] or ''))
+            except ValueError as e:
+                return _build_response(400, {'message': 'Invalid cursor', 'error': str(e)})
+
+        if top <= LEADERBOARD_SIZE:
+            leaderboard = _materialized_leaderboard(dynamodb, quiz_id, top)
+            if leaderboard is not None:
+                return _build_response(200, leaderboard)
+
+        # Larger pages, and quizzes without a materialized leaderboard yet
+        response = _query_scores(dynamodb, quiz_id, top)
+        return _build_response(200, [_entry(item) for item in response.get('Items', [])])
     except Exception as e:
         return _build_response(500, {'message': 'Error retrieving leaderboard', 'error': str(e)})
@@ -1,56 +1,140 @@
 import json
-import boto3
-from decimal import Decimal
-
-def convert_decimal(obj):
-    if isinstance(obj, list):
-        return [convert_decimal(item) for item in obj]
-    elif isinstance(obj, dict):
-        return {k: convert_decimal(v) for k, v in obj.items()}
-    elif isinstance(obj, Decimal):
-        if obj % 1 == 0:
-            return int(obj)
-        else:
-            return float(obj)
+import os
+
+from quiz_common import clients
+from quiz_common.cache import TTLCache
+from quiz_common.public_view import PUBLIC_VIEW_ATTRIBUTE, encode_public_view_from_wire
+from quiz_common.question_store import load_questions
+
+QUIZ_CACHE_TTL_SECONDS = float(os.environ.get('QUIZ_CACHE_TTL_SECONDS', '300'))
+QUIZ_CACHE_NEGATIVE_TTL_SECONDS = float(os.environ.get('QUIZ_CACHE_NEGATIVE_TTL_SECONDS', '5'))
+QUIZ_CACHE_MAX_ENTRIES = int(os.environ.get('QUIZ_CACHE_MAX_ENTRIES', '256'))
+QUESTION_CHUNK_CACHE_MAX_ENTRIES = int(os.environ.get('QUESTION_CHUNK_CACHE_MAX_ENTRIES', '64'))
+
+DEFAULT_QUESTIONS_LIMIT = 20
+MAX_QUESTIONS_LIMIT = 100
+
+# (response body, QuestionsLocation or None) of recently requested quizzes,
+# None for unknown QuizIDs
+quiz_cache = TTLCache(QUIZ_CACHE_MAX_ENTRIES, QUIZ_CACHE_TTL_SECONDS)
+# Question chunks of quizzes stored in S3, keyed by object key; chunks are
+# never rewritten, a changed quiz gets a new prefix
+question_chunk_cache = TTLCache(QUESTION_CHUNK_CACHE_MAX_ENTRIES, QUIZ_CACHE_TTL_SECONDS)
+_MISSING = object()
+
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': '*',
+}
+
+
+def _questions_location(item):
+    if 'QuestionsLocation' not in item:
+        return None
+    return {key: value.get('S', value.get('N')) for key, value in item['QuestionsLocation']['M'].items()}
+
+
+def _load_quiz(quiz_id):
+    """Return the public JSON body of a quiz and where its questions live in S3.
+
+    The location is None for quizzes that keep their questions inline, and
+    the whole result is None if the quiz does not exist.
+    """
+    dynamodb = clients.client('dynamodb')
+    response = dynamodb.get_item(
+        TableName='Quizzes',
+        Key={'QuizID': {'S': quiz_id}},
+        ProjectionExpression='#quiz_id, #view, #location',
+        ExpressionAttributeNames={'#quiz_id': 'QuizID', '#view': PUBLIC_VIEW_ATTRIBUTE, '#location': 'QuestionsLocation'},
+    )
+    if 'Item' not in response:
+        return None
+    item = response['Item']
+    if PUBLIC_VIEW_ATTRIBUTE in item:
+        return item[PUBLIC_VIEW_ATTRIBUTE]['S'], _questions_location(item)
+    # Quizzes created before views were stored are encoded on the fly
+    response = dynamodb.get_item(TableName='Quizzes', Key={'QuizID': {'S': quiz_id}})
+    if 'Item' not in response:
+        return None
+    return encode_public_view_from_wire(response['Item']), _questions_location(response['Item'])
+
+
+def _page_request(params):
+    """Return (offset, limit) from the query string, or None if no page was asked for."""
+    if 'offset' not in params and 'limit' not in params:
+        return None
+    offset = int(params.get('offset', 0))
+    limit = int(params.get('limit', DEFAULT_QUESTIONS_LIMIT))
+    if offset < 0 or not 1 <= limit <= MAX_QUESTIONS_LIMIT:
+        raise ValueError(f"offset must be >= 0 and limit between 1 and {MAX_QUESTIONS_LIMIT}")
+    return offset, limit
+
+
+def _quiz_body(body, location, page):
+    """Build the response body for a quiz, with all of its questions or one page."""
+    if location is None and page is None:
+        return body
+    quiz = json.loads(body)
+    if location is None:
+        questions = quiz['Questions']
+        total = len(questions)
+        if page is not None:
+            offset, limit = page
+            questions = questions[offset:offset + limit]
     else:
-        return obj
+        total = quiz['QuestionCount']
+        s3 = clients.client('s3')
+        if page is None:
+            questions = load_questions(s3, location, cache=question_chunk_cache)
+        else:
+            offset, limit = page
+            questions = load_questions(s3, location, offset, limit, cache=question_chunk_cache)
+    quiz['Questions'] = questions
+    if page is not None:
+        next_offset = offset + len(questions)
+        quiz['QuestionCount'] = total
+        quiz['Offset'] = offset
+        quiz['NextOffset'] = next_offset if next_offset < total else None
+    return json.dumps(quiz)
+
 
 def lambda_handler(event, context):
     try:
-        quiz_id = event['queryStringParameters']['quiz_id']
+        params = event['queryStringParameters']
+        quiz_id = params['quiz_id']
     except (KeyError, TypeError) as e:
         return {
             'statusCode': 400,
-            'headers': {
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Methods': '*',
-            },
+            'headers': CORS_HEADERS,
             'body': json.dumps({'message': 'quiz_id is required', 'error': str(e)})
         }
+    try:
+        page = _page_request(params)
+    except ValueError as e:
+        return {
+            'statusCode': 400,
+            'headers': CORS_HEADERS,
+            'body': json.dumps({'message': 'Invalid offset or limit', 'error': str(e)})
+        }
 
-    dynamodb = boto3.resource('dynamodb')
-    table = dynamodb.Table('Quizzes')
-    response = table.get_item(Key={'QuizID': quiz_id})
+    quiz = quiz_cache.get(quiz_id, _MISSING)
+    if quiz is _MISSING:
+        quiz = _load_quiz(quiz_id)
+        # Unknown QuizIDs are only remembered briefly, in case the quiz is
+        # still on its way through the create retry path
+        quiz_cache.put(quiz_id, quiz, ttl_seconds=None if quiz is not None else QUIZ_CACHE_NEGATIVE_TTL_SECONDS)
+        print(f"Quiz cache miss for {quiz_id}: {quiz_cache.stats()}")
 
-    if 'Item' in response:
-        quiz = response['Item']
-        for question in quiz['Questions']:
-            question.pop('CorrectAnswer', None)
-        quiz = convert_decimal(quiz)
+    if quiz is not None:
+        body, location = quiz
         return {
             'statusCode': 200,
-            'headers': {
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Methods': '*',
-            },
-            'body': json.dumps(quiz)
+            'headers': CORS_HEADERS,
+            'body': _quiz_body(body, location, page)
         }
     else:
         return {
             'statusCode': 404,
-            'headers': {
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Methods': '*',
-            },
+            'headers': CORS_HEADERS,
             'body': json.dumps({'message': 'Quiz not found'})
         }
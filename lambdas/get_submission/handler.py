@@ -1,20 +1,8 @@
 import json
-import boto3
-from decimal import Decimal
 
-def convert_decimal(obj):
-    if isinstance(obj, list):
-        return [convert_decimal(item) for item in obj]
-    elif isinstance(obj, dict):
-        return {k: convert_decimal(v) for k, v in obj.items()}
-    elif isinstance(obj, Decimal):
-        # Convert Decimal to int or float
-        if obj % 1 == 0:
-            return int(obj)
-        else:
-            return float(obj)
-    else:
-        return obj
+from quiz_common import clients
+from quiz_common.encoding import encode_wire_item
+from quiz_common.user_answers import user_answers_to_wire
 
 def lambda_handler(event, context):
     try:
@@ -30,14 +18,14 @@ def lambda_handler(event, context):
             'body': json.dumps({'message': 'submission_id is required', 'error': str(e)})
         }
 
-    dynamodb = boto3.resource('dynamodb')
-    table = dynamodb.Table('UserSubmissions')
-    response = table.get_item(Key={'SubmissionID': submission_id})
+    dynamodb = clients.client('dynamodb')
+    response = dynamodb.get_item(TableName='UserSubmissions', Key={'SubmissionID': {'S': submission_id}})
 
     if 'Item' in response:
-        submission = response['Item']
-        # Convert Decimal objects to int or float
-        submission = convert_decimal(submission)
+        item = response['Item']
+        if 'B' in item.get('UserAnswers', {}):
+            # Scoring stores UserAnswers packed, the response keeps the map
+            item['UserAnswers'] = user_answers_to_wire(item['UserAnswers']['B'])
         return {
             'statusCode': 200,
             'headers': {
@@ -45,7 +33,7 @@ def lambda_handler(event, context):
                 'Access-Control-Allow-Origin': '*',
                 'Access-Control-Allow-Methods': '*',
             },
-            'body': json.dumps(submission)
+            'body': encode_wire_item(item)
         }
     else:
         return {
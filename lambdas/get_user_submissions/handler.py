@@ -0,0 +1,77 @@
+import json
+
+from quiz_common import clients
+from quiz_common.dynamodb import item_from_wire
+from quiz_common.encoding import encode_item
+from quiz_common.pagination import decode_cursor, encode_cursor
+from quiz_common.submission_history import USER_SUBMISSIONS_INDEX_KEY, USER_SUBMISSIONS_INDEX_NAME
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': '*',
+}
+
+
+def lambda_handler(event, context):
+    params = event.get('queryStringParameters') or {}
+    try:
+        username = params['username']
+        if not username:
+            raise ValueError('username is required')
+        limit = int(params.get('limit', DEFAULT_LIMIT))
+        if not 1 <= limit <= MAX_LIMIT:
+            raise ValueError(f"limit must be between 1 and {MAX_LIMIT}")
+        start_key = None
+        if params.get('cursor'):
+            start_key = decode_cursor(params['cursor'], USER_SUBMISSIONS_INDEX_KEY)
+            if start_key['Username']['S'] != username:
+                raise ValueError('cursor belongs to another username')
+    except (KeyError, TypeError, ValueError) as e:
+        return {
+            'statusCode': 400,
+            'headers': CORS_HEADERS,
+            'body': json.dumps({'message': 'Invalid username, limit or cursor', 'error': str(e)})
+        }
+
+    dynamodb = clients.client('dynamodb')
+
+    try:
+        kwargs = {'ExclusiveStartKey': start_key} if start_key else {}
+        response = dynamodb.query(
+            TableName='UserSubmissions',
+            IndexName=USER_SUBMISSIONS_INDEX_NAME,
+            KeyConditionExpression='#username = :username',
+            ProjectionExpression='#submission_id, #quiz_id, #score, #total_questions, #submitted_at',
+            ExpressionAttributeNames={
+                '#username': 'Username',
+                '#submission_id': 'SubmissionID',
+                '#quiz_id': 'QuizID',
+                '#score': 'Score',
+                '#total_questions': 'TotalQuestions',
+                '#submitted_at': 'SubmittedAt',
+            },
+            ExpressionAttributeValues={':username': {'S': username}},
+            ScanIndexForward=False,
+            Limit=limit,
+            **kwargs
+        )
+
+        return {
+            'statusCode': 200,
+            'headers': CORS_HEADERS,
+            'body': encode_item({
+                'Submissions': [item_from_wire(item) for item in response.get('Items', [])],
+                'NextCursor': encode_cursor(response.get('LastEvaluatedKey')),
+            })
+        }
+
+    except Exception as e:
+        print(f"Error retrieving submissions of {username}: {e}")
+        return {
+            'statusCode': 500,
+            'headers': CORS_HEADERS,
+            'body': json.dumps({'message': 'Error retrieving submissions', 'error': str(e)})
+        }
@@ -0,0 +1,196 @@
+import base64
+import io
+import json
+import os
+from decimal import Decimal, DecimalException
+
+from boto3.dynamodb.types import TypeSerializer
+
+from quiz_common import clients
+from quiz_common.dynamodb import ITEM_MAX_BYTES, item_size
+from quiz_common.question_store import delete_questions, is_oversized, offload_questions
+from quiz_common.quiz_ids import QUIZ_ID_CONDITION, QUIZ_ID_MAX_ATTEMPTS, generate_quiz_id
+from quiz_common.quizzes import assign_quiz_id, normalize_quiz
+from quiz_common.retries import BATCH_MAX_ATTEMPTS, backoff
+
+QUIZZES_TABLE_NAME = 'Quizzes'
+
+# TransactWriteItems accepts at most 100 items and 4 MB per request
+TRANSACT_WRITE_MAX_ITEMS = 100
+TRANSACT_WRITE_MAX_BYTES = 4 * 1024 * 1024
+
+# Lambda caps synchronous payloads at 6 MB, so larger imports are split
+# into several requests by bin/import_quizzes.py
+IMPORT_MAX_QUIZZES = int(os.environ.get('IMPORT_MAX_QUIZZES', '1000'))
+# A taken QuizID cancels a whole transaction, so imported IDs always carry a
+# suffix to keep that rare
+IMPORT_QUIZ_ID_SUFFIX_DIGITS = int(os.environ.get('IMPORT_QUIZ_ID_SUFFIX_DIGITS', '4'))
+
+_serializer = TypeSerializer()
+
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': '*',
+}
+
+
+def parse_quizzes(lines):
+    """Parse and validate newline-delimited quizzes.
+
+    Yields ``(line_number, quiz, error)`` for every non-blank line, where
+    exactly one of ``quiz`` and ``error`` is set.
+    """
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            # DynamoDB only takes Decimal numbers
+            yield line_number, normalize_quiz(json.loads(line, parse_float=Decimal)), None
+        except (KeyError, ValueError, TypeError) as e:
+            error = str(e) if not isinstance(e, KeyError) else f"Missing field {e}"
+            yield line_number, None, error
+
+
+def _new_quiz_id(taken):
+    while True:
+        quiz_id = generate_quiz_id(IMPORT_QUIZ_ID_SUFFIX_DIGITS)
+        if quiz_id not in taken:
+            taken.add(quiz_id)
+            return quiz_id
+
+
+def _is_invalid_item(error):
+    # Numbers DynamoDB cannot store fail to serialize, other invalid items
+    # are rejected by the service
+    if isinstance(error, DecimalException):
+        return True
+    response = getattr(error, 'response', None) or {}
+    return response.get('Error', {}).get('Code') == 'ValidationException'
+
+
+def _delete_offloaded_questions(quiz):
+    if 'QuestionsLocation' not in quiz:
+        return
+    try:
+        delete_questions(clients.client('s3'), quiz['QuestionsLocation'])
+    except Exception as e:
+        print(f"Error deleting questions at {quiz['QuestionsLocation']['Prefix']}: {e}")
+
+
+def _cancellation_codes(error):
+    response = getattr(error, 'response', None) or {}
+    if response.get('Error', {}).get('Code') != 'TransactionCanceledException':
+        raise error
+    return [reason.get('Code') for reason in response.get('CancellationReasons', [])]
+
+
+def write_quizzes(dynamodb, quizzes, taken):
+    """Store up to 100 quizzes, which already have IDs, in one TransactWriteItems call.
+
+    Every put is conditional on its QuizID being new, so an ID claimed in the
+    meantime by createquiz, a replay or another import is never overwritten.
+    A taken ID cancels the whole transaction; those quizzes get new IDs and
+    the transaction is sent again. Raises if the quizzes cannot be stored.
+    """
+    id_attempts = attempts = 0
+    while True:
+        try:
+            dynamodb.transact_write_items(TransactItems=[
+                {'Put': {
+                    'TableName': QUIZZES_TABLE_NAME,
+                    'Item': {name: _serializer.serialize(value) for name, value in quiz.items()},
+                    'ConditionExpression': QUIZ_ID_CONDITION,
+                }}
+                for quiz in quizzes
+            ])
+            return
+        except Exception as e:
+            codes = _cancellation_codes(e)
+        taken_indices = [idx for idx, code in enumerate(codes) if code == 'ConditionalCheckFailed']
+        if taken_indices:
+            id_attempts += 1
+            if id_attempts >= QUIZ_ID_MAX_ATTEMPTS:
+                raise RuntimeError('Could not allocate unique QuizIDs')
+            for idx in taken_indices:
+                assign_quiz_id(quizzes[idx], _new_quiz_id(taken))
+            continue
+        # Throttling or a conflicting transaction, the same write may succeed later
+        attempts += 1
+        if attempts >= BATCH_MAX_ATTEMPTS:
+            raise RuntimeError(f"Transaction cancelled after {attempts} attempts: {codes}")
+        backoff(attempts)
+
+
+def import_chunk(dynamodb, chunk, taken):
+    """Store one chunk of ``(line_number, quiz)`` pairs and return their results.
+
+    One invalid quiz rejects the whole transaction, so then the quizzes are
+    written one by one to still import the valid ones. If the chunk cannot be
+    stored, the questions already offloaded to S3 for its quizzes are deleted
+    again.
+    """
+    quizzes = [quiz for _, quiz in chunk]
+    try:
+        write_quizzes(dynamodb, quizzes, taken)
+    except Exception as e:
+        if len(chunk) > 1 and _is_invalid_item(e):
+            print(f"Invalid quiz in chunk, importing one by one: {e}")
+            return [result for entry in chunk for result in import_chunk(dynamodb, [entry], taken)]
+        print(f"Error importing quizzes: {e}")
+        for quiz in quizzes:
+            _delete_offloaded_questions(quiz)
+        return [{'Line': line_number, 'Error': f"Could not store quiz: {e}"} for line_number, _ in chunk]
+    return [{'Line': line_number, 'QuizID': quiz['QuizID']} for line_number, quiz in chunk]
+
+
+def lambda_handler(event, context):
+    body = event.get('body') or ''
+    if event.get('isBase64Encoded'):
+        body = base64.b64decode(body).decode('utf-8')
+
+    if sum(1 for line in io.StringIO(body) if line.strip()) > IMPORT_MAX_QUIZZES:
+        return {
+            'statusCode': 413,
+            'headers': CORS_HEADERS,
+            'body': json.dumps({'message': f'At most {IMPORT_MAX_QUIZZES} quizzes can be imported per request'})
+        }
+
+    results = []
+    chunk, chunk_bytes = [], 0
+    taken = set()
+    dynamodb = clients.client('dynamodb')
+
+    for line_number, quiz, error in parse_quizzes(io.StringIO(body)):
+        if error is not None:
+            results.append({'Line': line_number, 'Error': error})
+            continue
+        if is_oversized(quiz):
+            try:
+                offload_questions(quiz, clients.client('s3'))
+            except Exception as e:
+                print(f"Error storing questions in S3: {e}")
+                results.append({'Line': line_number, 'Error': f"Could not store questions: {e}"})
+                continue
+        # The ID goes into the public view, so the item is sized with it
+        assign_quiz_id(quiz, _new_quiz_id(taken))
+        size = item_size(quiz)
+        if size > ITEM_MAX_BYTES:
+            _delete_offloaded_questions(quiz)
+            results.append({'Line': line_number, 'Error': f"Quiz is too large to store ({size} bytes)"})
+            continue
+        if chunk and (len(chunk) == TRANSACT_WRITE_MAX_ITEMS or chunk_bytes + size > TRANSACT_WRITE_MAX_BYTES):
+            results.extend(import_chunk(dynamodb, chunk, taken))
+            chunk, chunk_bytes = [], 0
+        chunk.append((line_number, quiz))
+        chunk_bytes += size
+    if chunk:
+        results.extend(import_chunk(dynamodb, chunk, taken))
+
+    results.sort(key=lambda result: result['Line'])
+    imported = sum(1 for result in results if 'QuizID' in result)
+    print(f"Imported {imported} of {len(results)} quizzes")
+    return {
+        'statusCode': 200,
+        'headers': dict(CORS_HEADERS, **{'Content-Type': 'application/x-ndjson'}),
+        'body': ''.join(json.dumps(result) + '\n' for result in results)
+    }
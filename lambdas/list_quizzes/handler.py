@@ -1,18 +1,57 @@
 import json
-import boto3
-from boto3.dynamodb.conditions import Attr
+
+from quiz_common import clients
+from quiz_common.catalog import PUBLIC_CATALOG_INDEX_KEY, PUBLIC_CATALOG_INDEX_NAME, PUBLIC_CATALOG_PARTITION
+from quiz_common.dynamodb import item_from_wire
+from quiz_common.pagination import decode_cursor, encode_cursor
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 100
+
 
 def lambda_handler(event, context):
-    dynamodb = boto3.resource('dynamodb')
-    table = dynamodb.Table('Quizzes')
+    params = event.get('queryStringParameters') or {}
+    try:
+        limit = int(params.get('limit', DEFAULT_LIMIT))
+        if not 1 <= limit <= MAX_LIMIT:
+            raise ValueError(f"limit must be between 1 and {MAX_LIMIT}")
+        start_key = None
+        if params.get('cursor'):
+            start_key = decode_cursor(params['cursor'], PUBLIC_CATALOG_INDEX_KEY)
+    except (TypeError, ValueError) as e:
+        return {
+            'statusCode': 400,
+            'headers': {
+                'Access-Control-Allow-Origin': '*',
+                'Access-Control-Allow-Methods': '*',
+            },
+            'body': json.dumps({'message': 'Invalid limit or cursor', 'error': str(e)})
+        }
+
+    dynamodb = clients.client('dynamodb')
 
     try:
-        response = table.scan(
-            FilterExpression=Attr('Visibility').eq('Public'),
-            ProjectionExpression='QuizID, Title, Visibility'
+        # The index only holds public quizzes, so no filter is needed and
+        # every item read is returned
+        kwargs = {'ExclusiveStartKey': start_key} if start_key else {}
+        response = dynamodb.query(
+            TableName='Quizzes',
+            IndexName=PUBLIC_CATALOG_INDEX_NAME,
+            KeyConditionExpression='#catalog = :public',
+            ProjectionExpression='#quiz_id, #title, #visibility',
+            ExpressionAttributeNames={
+                '#catalog': 'PublicCatalog',
+                '#quiz_id': 'QuizID',
+                '#title': 'Title',
+                '#visibility': 'Visibility',
+            },
+            ExpressionAttributeValues={':public': {'S': PUBLIC_CATALOG_PARTITION}},
+            ScanIndexForward=False,
+            Limit=limit,
+            **kwargs
         )
 
-        quizzes = response.get('Items', [])
+        quizzes = [item_from_wire(item) for item in response.get('Items', [])]
 
         return {
             'statusCode': 200,
@@ -20,7 +59,10 @@ def lambda_handler(event, context):
                 'Access-Control-Allow-Origin': '*',
                 'Access-Control-Allow-Methods': '*',
             },
-            'body': json.dumps({'Quizzes': quizzes})
+            'body': json.dumps({
+                'Quizzes': quizzes,
+                'NextCursor': encode_cursor(response.get('LastEvaluatedKey')),
+            })
         }
 
     except Exception as e:
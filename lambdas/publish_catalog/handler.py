@@ -0,0 +1,121 @@
+"""Keep the public catalog snapshot in S3 in sync with the Quizzes table.
+
+Triggered by the Quizzes DynamoDB stream. Each batch is applied to the
+current snapshot object, a gzip-compressed JSON document served to the
+frontend through CloudFront, so landing page visits never reach Lambda or
+DynamoDB. Writes are conditional on the ETag that was read; a concurrent
+update from another shard makes the batch start over from a fresh read.
+"""
+import gzip
+import json
+import os
+
+from botocore.exceptions import ClientError
+
+from quiz_common import clients
+from quiz_common.catalog import PUBLIC_CATALOG_PARTITION
+
+CATALOG_BUCKET_NAME = os.environ.get('CATALOG_BUCKET_NAME', 'quiz-catalog')
+CATALOG_OBJECT_KEY = os.environ.get('CATALOG_OBJECT_KEY', 'catalog/public-quizzes.json')
+CATALOG_CACHE_CONTROL = os.environ.get('CATALOG_CACHE_CONTROL', 'public, max-age=60, stale-while-revalidate=300')
+CATALOG_MAX_ATTEMPTS = 5
+
+
+def _is_listed(image):
+    return image.get('PublicCatalog', {}).get('S') == PUBLIC_CATALOG_PARTITION
+
+
+def _question_count(image):
+    if 'QuestionCount' in image:
+        return int(image['QuestionCount']['N'])
+    return len(image.get('Questions', {}).get('L', []))
+
+
+def catalog_changes(records):
+    """Reduce stream records to {QuizID: entry or None}, None meaning "not listed".
+
+    Later records for the same quiz win, so a batch is applied in stream order.
+    Writes that never touch a public quiz produce no change at all.
+    """
+    changes = {}
+    for record in records:
+        quiz_id = record['dynamodb']['Keys']['QuizID']['S']
+        image = record['dynamodb'].get('NewImage') or {}
+        if not _is_listed(image):
+            # Private quizzes only matter if they were listed before
+            if quiz_id in changes or _is_listed(record['dynamodb'].get('OldImage') or {}):
+                changes[quiz_id] = None
+            continue
+        changes[quiz_id] = {
+            'QuizID': quiz_id,
+            'Title': image.get('Title', {}).get('S', ''),
+            'QuestionCount': _question_count(image),
+            'CreatedAt': int(image['CreatedAt']['N']),
+        }
+    return changes
+
+
+def apply_changes(quizzes, changes):
+    """Return the catalog entries with ``changes`` applied, newest first."""
+    merged = {quiz['QuizID']: quiz for quiz in quizzes}
+    for quiz_id, entry in changes.items():
+        if entry is None:
+            merged.pop(quiz_id, None)
+        else:
+            merged[quiz_id] = entry
+    return sorted(merged.values(), key=lambda quiz: (-quiz['CreatedAt'], quiz['QuizID']))
+
+
+def _read_snapshot(s3):
+    """Return the current catalog entries and the ETag to write against (None if there is no snapshot)."""
+    try:
+        response = s3.get_object(Bucket=CATALOG_BUCKET_NAME, Key=CATALOG_OBJECT_KEY)
+    except ClientError as e:
+        # S3 only reports a missing object as such with s3:ListBucket on the
+        # bucket, otherwise it answers AccessDenied
+        if e.response['Error']['Code'] in ('NoSuchKey', '404'):
+            return [], None
+        raise
+    body = response['Body'].read()
+    if response.get('ContentEncoding') == 'gzip':
+        body = gzip.decompress(body)
+    return json.loads(body)['Quizzes'], response['ETag']
+
+
+def _write_snapshot(s3, quizzes, etag):
+    body = gzip.compress(json.dumps({'Quizzes': quizzes}, separators=(',', ':')).encode('utf-8'), mtime=0)
+    # Only overwrite the version that was read, or create it if there was none
+    condition = {'IfMatch': etag} if etag else {'IfNoneMatch': '*'}
+    s3.put_object(
+        Bucket=CATALOG_BUCKET_NAME,
+        Key=CATALOG_OBJECT_KEY,
+        Body=body,
+        ContentType='application/json',
+        ContentEncoding='gzip',
+        CacheControl=CATALOG_CACHE_CONTROL,
+        **condition
+    )
+
+
+def lambda_handler(event, context):
+    changes = catalog_changes(event['Records'])
+    if not changes:
+        return {'statusCode': 200, 'body': json.dumps('No catalog changes')}
+
+    s3 = clients.client('s3')
+    for _ in range(CATALOG_MAX_ATTEMPTS):
+        quizzes, etag = _read_snapshot(s3)
+        updated = apply_changes(quizzes, changes)
+        if etag and updated == quizzes:
+            return {'statusCode': 200, 'body': json.dumps('Catalog unchanged')}
+        try:
+            _write_snapshot(s3, updated, etag)
+        except ClientError as e:
+            if e.response['Error']['Code'] not in ('PreconditionFailed', 'ConditionalRequestConflict'):
+                raise
+            print(f"Catalog snapshot changed concurrently, retrying: {e}")
+            continue
+        print(f"Published catalog snapshot with {len(updated)} public quizzes")
+        return {'statusCode': 200, 'body': json.dumps('Catalog published')}
+    # Raising makes Lambda retry the stream batch
+    raise RuntimeError(f"Catalog snapshot update lost {CATALOG_MAX_ATTEMPTS} races")
@@ -1,33 +1,108 @@
 import json
-import boto3
-from botocore.exceptions import ClientError
+from decimal import Decimal
 
-def lambda_handler(event, context):
-    dynamodb = boto3.resource('dynamodb')
-    
-    for record in event['Records']:
+from quiz_common import clients
+from quiz_common.public_view import PUBLIC_VIEW_ATTRIBUTE
+from quiz_common.quiz_ids import is_id_collision
+from quiz_common.quizzes import assign_quiz_id
+
+# Key attribute of each table whose failed writes are replayed
+TABLE_KEYS = {'Quizzes': 'QuizID'}
+
+
+def group_writes(records):
+    """Group the failed writes of an SQS batch as {table: {key: (item, [message IDs])}}.
+
+    The same write published twice is replayed once, on behalf of every
+    message that carried it.
+    """
+    writes = {}
+    for record in records:
         try:
             # Parse the SQS message body (SNS notification)
             sns_notification = json.loads(record['body'])
-            message = json.loads(sns_notification['Message'])
-            
-            # Get table name and item from the message
+            # DynamoDB only takes Decimal numbers
+            message = json.loads(sns_notification['Message'], parse_float=Decimal)
             table_name = message['TableName']
             item = message['Item']
-            
-            # Try to write to DynamoDB
-            table = dynamodb.Table(table_name)
-            table.put_item(Item=item)
-            print(f"Successfully wrote item to {table_name}: {item.get('QuizID')}")
-            
-        except ClientError as e:
-            print(f"DynamoDB service error, message will be retried: {str(e)}")
-            raise e
+            key = item[TABLE_KEYS[table_name]]
+            if not isinstance(key, str):
+                raise TypeError(f"Key of {table_name} must be a string")
+            if table_name == 'Quizzes' and 'Questions' in item:
+                # Queued by an older createquiz, with inline questions and
+                # maybe a view next to them; store it as createquiz now does
+                item.pop(PUBLIC_VIEW_ATTRIBUTE, None)
+                assign_quiz_id(item, key)
+        except (KeyError, TypeError, ValueError) as e:
+            # A malformed message would fail the same way on every delivery
+            print(f"Discarding message {record['messageId']} that cannot be replayed: {e}")
+            continue
+        table_writes = writes.setdefault(table_name, {})
+        if key in table_writes:
+            table_writes[key][1].append(record['messageId'])
+        else:
+            table_writes[key] = (item, [record['messageId']])
+    return writes
+
+
+def put_new_item(table, key_name, item):
+    """Write ``item`` unless its key is taken.
+
+    Returns True if the item is stored, either now or by an earlier delivery
+    of the same write, and False if the key belongs to a different item.
+    """
+    try:
+        table.put_item(
+            Item=item,
+            ConditionExpression='attribute_not_exists(#key)',
+            ExpressionAttributeNames={'#key': key_name},
+        )
+        return True
+    except Exception as e:
+        if not is_id_collision(e):
+            raise
+    # Conflicts are rare, so only they pay for the extra read
+    stored = table.get_item(Key={key_name: item[key_name]}, ConsistentRead=True).get('Item')
+    return stored == item
+
+
+def replay(dynamodb, table_name, table_writes):
+    """Replay the writes of one table and return the keys that failed.
+
+    Every write is a conditional put, so a replay never overwrites an item
+    stored in the meantime by createquiz, an import or another replay. A key
+    that is taken by a different item is logged with the whole item and
+    reported as failed, so its message ends up in QuizzesWriteFailuresDLQ
+    instead of being dropped.
+    """
+    table = dynamodb.Table(table_name)
+    key_name = TABLE_KEYS[table_name]
+    failed = set()
+    for key, (item, message_ids) in table_writes.items():
+        try:
+            stored = put_new_item(table, key_name, item)
         except Exception as e:
-            print(f"Error processing message: {str(e)}")
-            raise e
-            
-    return {
-        'statusCode': 200,
-        'body': json.dumps('Processed messages')
-    }
+            print(f"DynamoDB service error, {key} will be retried: {e}")
+            failed.add(key)
+            continue
+        if not stored:
+            print(f"ERROR: {key_name} {key} is taken by another item, "
+                  f"messages {message_ids} go to the DLQ: {json.dumps(item, default=str)}")
+            failed.add(key)
+    return failed
+
+
+def lambda_handler(event, context):
+    dynamodb = clients.resource('dynamodb')
+    failed_messages = set()
+    replayed = 0
+    for table_name, table_writes in group_writes(event['Records']).items():
+        failed = replay(dynamodb, table_name, table_writes)
+        replayed += len(table_writes) - len(failed)
+        for key in failed:
+            failed_messages.update(table_writes[key][1])
+
+    failures = [record['messageId'] for record in event['Records'] if record['messageId'] in failed_messages]
+    print(f"Replayed {replayed} writes, {len(failures)} messages will be retried")
+    # Only the failed messages come back, the rest are deleted from the queue
+    return {'batchItemFailures': [{'itemIdentifier': message_id} for message_id in failures]}
@@ -1,16 +1,222 @@
 import json
-import boto3
-from decimal import Decimal, getcontext
+import os
+from decimal import Decimal
+
+from quiz_common import clients
+from quiz_common.cache import TTLCache
+from quiz_common.leaderboard import LEADERBOARD_TABLE_NAME, LeaderboardUpdateError, update_leaderboard
+from quiz_common.retries import BATCH_MAX_ATTEMPTS, backoff
+from quiz_common.submission_history import submitted_at
+from quiz_common.user_answers import stored_user_answers
+from scoring_engine import compile_answer_key
+
+QUIZZES_TABLE_NAME = 'Quizzes'
+SUBMISSIONS_TABLE_NAME = 'UserSubmissions'
+
+# BatchGetItem accepts at most 100 keys and BatchWriteItem 25 items per request
+BATCH_GET_MAX_KEYS = 100
+BATCH_WRITE_MAX_ITEMS = 25
+
+# 'batch' sends the result emails of an SQS batch through one Express
+# execution; 'per_submission' starts one SendEmailStateMachine execution each
+EMAIL_DISPATCH_MODE = os.environ.get('EMAIL_DISPATCH_MODE', 'batch')
+SEND_EMAIL_STATE_MACHINE_ARN = 'arn:aws:states:us-east-1:000000000000:stateMachine:SendEmailStateMachine'
+SEND_EMAIL_BATCH_STATE_MACHINE_ARN = 'arn:aws:states:us-east-1:000000000000:stateMachine:SendEmailBatchStateMachine'
+# Keeps the execution input well below the 256 KB Step Functions limit
+EMAIL_BATCH_MAX_NOTIFICATIONS = 100
+
+QUIZ_CACHE_TTL_SECONDS = float(os.environ.get('QUIZ_CACHE_TTL_SECONDS', '300'))
+QUIZ_CACHE_MAX_ENTRIES = int(os.environ.get('QUIZ_CACHE_MAX_ENTRIES', '128'))
+
+# Answer keys of recently scored quizzes, shared by warm invocations
+answer_key_cache = TTLCache(QUIZ_CACHE_MAX_ENTRIES, QUIZ_CACHE_TTL_SECONDS)
+
+
+def batch_get_quizzes(dynamodb, quiz_ids):
+    """Fetch quizzes with BatchGetItem, retrying unprocessed keys with backoff.
+
+    Returns a dict of QuizID to item; quizzes that do not exist are absent.
+    Raises if keys remain unprocessed after BATCH_MAX_ATTEMPTS.
+    """
+    quizzes = {}
+    quiz_ids = list(quiz_ids)
+    for start in range(0, len(quiz_ids), BATCH_GET_MAX_KEYS):
+        request_items = {
+            QUIZZES_TABLE_NAME: {
+                'Keys': [{'QuizID': quiz_id} for quiz_id in quiz_ids[start:start + BATCH_GET_MAX_KEYS]],
+                'ProjectionExpression': 'QuizID, Questions, AnswerKey, EnableTimer, TimerSeconds',
+            }
+        }
+        attempt = 0
+        while request_items:
+            if attempt:
+                if attempt >= BATCH_MAX_ATTEMPTS:
+                    raise RuntimeError(f"Unprocessed keys after {attempt} attempts: {request_items}")
+                backoff(attempt)
+            response = dynamodb.batch_get_item(RequestItems=request_items)
+            for item in response.get('Responses', {}).get(QUIZZES_TABLE_NAME, []):
+                quizzes[item['QuizID']] = item
+            request_items = response.get('UnprocessedKeys') or {}
+            attempt += 1
+    return quizzes
+
+
+def get_answer_keys(dynamodb, quiz_ids):
+    """Resolve answer keys for the given QuizIDs from the cache, loading misses in one batch."""
+    answer_keys = {}
+    missing = []
+    for quiz_id in set(quiz_ids):
+        answer_key = answer_key_cache.get(quiz_id)
+        if answer_key is None:
+            missing.append(quiz_id)
+        else:
+            answer_keys[quiz_id] = answer_key
+
+    if missing:
+        for quiz_id, quiz in batch_get_quizzes(dynamodb, missing).items():
+            answer_key = compile_answer_key(quiz)
+            answer_key_cache.put(quiz_id, answer_key)
+            answer_keys[quiz_id] = answer_key
+    return answer_keys
+
+
+def batch_write_submissions(dynamodb, items):
+    """Persist submissions with BatchWriteItem in chunks of 25.
+
+    Unprocessed items are retried with jittered exponential backoff. Returns the
+    SubmissionIDs that could not be written after BATCH_MAX_ATTEMPTS.
+    """
+    failed = set()
+    for start in range(0, len(items), BATCH_WRITE_MAX_ITEMS):
+        chunk = items[start:start + BATCH_WRITE_MAX_ITEMS]
+        request_items = {
+            SUBMISSIONS_TABLE_NAME: [{'PutRequest': {'Item': item}} for item in chunk]
+        }
+        attempt = 0
+        while request_items:
+            if attempt:
+                if attempt >= BATCH_MAX_ATTEMPTS:
+                    break
+                backoff(attempt)
+            try:
+                response = dynamodb.batch_write_item(RequestItems=request_items)
+            except Exception as e:
+                print(f"Error writing submissions batch: {e}")
+                break
+            request_items = response.get('UnprocessedItems') or {}
+            attempt += 1
+        for request in request_items.get(SUBMISSIONS_TABLE_NAME, []):
+            failed.add(request['PutRequest']['Item']['SubmissionID'])
+    return failed
+
+
+def update_leaderboards(dynamodb, items):
+    """Merge stored submissions into their quizzes' materialized leaderboards.
+
+    Returns the SubmissionIDs whose leaderboard entries could not be merged.
+    """
+    submissions_table = dynamodb.Table(SUBMISSIONS_TABLE_NAME)
+    leaderboards_table = dynamodb.Table(LEADERBOARD_TABLE_NAME)
+
+    def seed(quiz_id, size):
+        response = submissions_table.query(
+            IndexName='QuizID-Score-index',
+            KeyConditionExpression='#quiz_id = :quiz_id',
+            ProjectionExpression='#username, #score, #submission_id',
+            ExpressionAttributeNames={
+                '#quiz_id': 'QuizID',
+                '#username': 'Username',
+                '#score': 'Score',
+                '#submission_id': 'SubmissionID',
+            },
+            ExpressionAttributeValues={':quiz_id': quiz_id},
+            ScanIndexForward=False,
+            Limit=size
+        )
+        return response.get('Items', [])
+
+    entries_by_quiz = {}
+    for item in items:
+        entries_by_quiz.setdefault(item['QuizID'], []).append({
+            'Username': item['Username'],
+            'Score': item['Score'],
+            'SubmissionID': item['SubmissionID'],
+        })
+
+    failed = set()
+    for quiz_id, entries in entries_by_quiz.items():
+        try:
+            update_leaderboard(leaderboards_table, quiz_id, entries, seed=seed)
+        except LeaderboardUpdateError as e:
+            print(f"Error updating leaderboard for {quiz_id}, {len(e.unmerged)} entries not merged: {e}")
+            failed.update(e.unmerged)
+        except Exception as e:
+            print(f"Error updating leaderboard for {quiz_id}: {e}")
+            failed.update(entry['SubmissionID'] for entry in entries)
+    return failed
+
+
+def start_email_executions(stepfunctions, notifications):
+    """Start one SendEmailStateMachine execution per notification.
+
+    Returns the records whose execution could not be started.
+    """
+    failed_records = []
+    for record, input_data in notifications:
+        try:
+            stepfunctions.start_execution(
+                stateMachineArn=SEND_EMAIL_STATE_MACHINE_ARN,
+                input=json.dumps(input_data, default=str)
+            )
+        except Exception as e:
+            print(f"Error starting email execution for record {record}, it will be retried: {e}")
+            failed_records.append(record)
+    return failed_records
+
+
+def dispatch_result_emails(stepfunctions, notifications):
+    """Send result emails for (record, input) pairs according to EMAIL_DISPATCH_MODE.
+
+    In batch mode the notifications go to SendEmailBatchStateMachine in as few
+    Express executions as possible; a chunk whose execution cannot be started
+    falls back to per-submission executions. Returns the records that failed.
+    """
+    if EMAIL_DISPATCH_MODE != 'batch':
+        return start_email_executions(stepfunctions, notifications)
+
+    failed_records = []
+    for start in range(0, len(notifications), EMAIL_BATCH_MAX_NOTIFICATIONS):
+        chunk = notifications[start:start + EMAIL_BATCH_MAX_NOTIFICATIONS]
+        try:
+            stepfunctions.start_execution(
+                stateMachineArn=SEND_EMAIL_BATCH_STATE_MACHINE_ARN,
+                input=json.dumps({'Notifications': [input_data for _, input_data in chunk]}, default=str)
+            )
+        except Exception as e:
+            print(f"Error starting batch email execution, falling back to per-submission: {e}")
+            failed_records.extend(start_email_executions(stepfunctions, chunk))
+    return failed_records
+
+
+def batch_item_failures(records):
+    """Build a partial batch response reporting the given SQS records as failed."""
+    return {'batchItemFailures': [{'itemIdentifier': record['messageId']} for record in records]}
+
 
 def lambda_handler(event, context):
-    # raise Exception()
-    getcontext().prec = 6
+    """Score a batch of submissions from QuizSubmissionQueue.
 
-    dynamodb = boto3.resource('dynamodb')
-    quizzes_table = dynamodb.Table('Quizzes')
-    submissions_table = dynamodb.Table('UserSubmissions')
-    stepfunctions = boto3.client('stepfunctions')
+    Malformed messages and unknown quizzes are logged and dropped. Records that
+    fail for any other reason are reported through ``batchItemFailures`` so that
+    SQS redelivers only those messages. The queue's redrive policy moves a
+    message to QuizSubmissionDLQ once it has been received 5 times
+    (``maxReceiveCount``), so a record gets 4 redeliveries before it is given up.
+    """
+    # raise Exception()
+    dynamodb = clients.resource('dynamodb')
+    stepfunctions = clients.client('stepfunctions')
 
+    messages = []
     for record in event['Records']:
         try:
             message_body = json.loads(record['body'])
@@ -18,73 +224,83 @@ def lambda_handler(event, context):
             username = message_body['Username']
             quiz_id = message_body['QuizID']
             user_answers = message_body['Answers']
-            email = message_body.get('Email')
-
-            if not all([submission_id, username, quiz_id, user_answers]):
-                print(f"Invalid message data: {message_body}")
-                continue
-
-            response = quizzes_table.get_item(Key={'QuizID': quiz_id})
-            if 'Item' not in response:
-                print(f"QuizID not found: {quiz_id}")
-                continue
-
-            quiz = response['Item']
-            correct_answers = [q['CorrectAnswer'] for q in quiz['Questions']]
-            total_questions = len(correct_answers)
-
-            enable_timer = quiz.get('EnableTimer', False)
-            timer_seconds = quiz.get('TimerSeconds', None)
-
-            score = Decimal('0.0')
-            for idx, correct in enumerate(correct_answers):
-                question_idx = str(idx)
-                if question_idx in user_answers:
-                    user_answer_data = user_answers[question_idx]
-                    user_answer = user_answer_data['Answer']
-                    time_taken = Decimal(str(user_answer_data['TimeTaken']))
-                    if str(user_answer) == str(correct):
-                        if enable_timer and timer_seconds is not None:
-                            timer_seconds_decimal = Decimal(str(timer_seconds))
-                            if time_taken > timer_seconds_decimal:
-                                question_score = Decimal('0.0')
-                            else:
-                                max_score = Decimal('100.0')
-                                question_score = max_score * (Decimal('1.0') - (time_taken / timer_seconds_decimal))
-                                if question_score < Decimal('0.0'):
-                                    question_score = Decimal('0.0')
-                        else:
-                            question_score = Decimal('100.0')
-                        score += question_score
-                    else:
-                        pass
-                else:
-                    pass
-
-            submissions_table.put_item(Item={
-                'SubmissionID': submission_id,
-                'Username': username,
-                'QuizID': quiz_id,
-                'UserAnswers': user_answers,
-                'Score': score,
-                'TotalQuestions': Decimal(total_questions)
-            })
-
-            if email:
-                state_machine_arn = 'arn:aws:states:us-east-1:000000000000:stateMachine:SendEmailStateMachine'
-                input_data = {
-                    'SubmissionID': submission_id,
-                    'Username': username,
-                    'Email': email,
-                    'Score': float(score),
-                    'TotalQuestions': total_questions
-                }
-
-                stepfunctions.start_execution(
-                    stateMachineArn=state_machine_arn,
-                    input=json.dumps(input_data, default=str)
-                )
-
         except Exception as e:
             print(f"Error processing record {record}: {e}")
             continue
+
+        if not all([submission_id, username, quiz_id, user_answers]):
+            print(f"Invalid message data: {message_body}")
+            continue
+        messages.append((record, message_body))
+
+    try:
+        answer_keys = get_answer_keys(dynamodb, [body['QuizID'] for _, body in messages])
+    except Exception as e:
+        print(f"Error loading quizzes for batch: {e}")
+        return batch_item_failures(record for record, _ in messages)
+
+    # SubmissionID -> item; a redelivered duplicate in the same batch overwrites
+    # the earlier copy since BatchWriteItem rejects repeated keys
+    pending_items = {}
+    pending_records = []
+    failed_records = []
+    for record, message_body in messages:
+        submission_id = message_body['SubmissionID']
+        quiz_id = message_body['QuizID']
+        user_answers = message_body['Answers']
+
+        answer_key = answer_keys.get(quiz_id)
+        if answer_key is None:
+            print(f"QuizID not found: {quiz_id}")
+            continue
+
+        try:
+            score = answer_key.score(user_answers)
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            print(f"Invalid answers in record {record}: {e}")
+            continue
+
+        pending_items[submission_id] = {
+            'SubmissionID': submission_id,
+            'Username': message_body['Username'],
+            'QuizID': quiz_id,
+            'UserAnswers': stored_user_answers(user_answers),
+            'Score': score,
+            'TotalQuestions': Decimal(answer_key.total_questions),
+            # Messages queued before submissions were stamped are dated when scored
+            'SubmittedAt': int(message_body.get('SubmittedAt') or submitted_at()),
+        }
+        pending_records.append((record, message_body))
+
+    failed_submissions = batch_write_submissions(dynamodb, list(pending_items.values()))
+    failed_leaderboards = update_leaderboards(dynamodb, [
+        item for submission_id, item in pending_items.items() if submission_id not in failed_submissions
+    ])
+
+    notifications = []
+    for record, message_body in pending_records:
+        submission_id = message_body['SubmissionID']
+        if submission_id in failed_submissions:
+            print(f"Failed to store submission {submission_id}, it will be retried")
+            failed_records.append(record)
+            continue
+        if submission_id in failed_leaderboards:
+            # Rescoring is idempotent, so the redelivery only redoes the merge
+            failed_records.append(record)
+            continue
+
+        email = message_body.get('Email')
+        if email:
+            item = pending_items[submission_id]
+            notifications.append((record, {
+                'SubmissionID': submission_id,
+                'Username': item['Username'],
+                'Email': email,
+                'Score': float(item['Score']),
+                'TotalQuestions': int(item['TotalQuestions'])
+            }))
+
+    if notifications:
+        failed_records.extend(dispatch_result_emails(stepfunctions, notifications))
+
+    return batch_item_failures(failed_records)
@@ -0,0 +1,153 @@
+"""Compiled answer keys for the scoring Lambda.
+
+A quiz's ``Questions`` are compiled once into a ``CompiledAnswerKey`` holding
+the normalized correct answers and, for timed quizzes, a table of per-second
+question scores. Submissions are then scored with integer fixed-point math in
+units of 1/10000 of a point.
+
+The arithmetic reproduces the original Decimal loop, which ran with a
+precision of six significant digits: the time ratio, the remaining fraction
+and the running total are each rounded half-even to six significant digits.
+"""
+from decimal import Context, Decimal
+
+# Scores are tracked in units of 1/10000 of a point
+SCORE_SCALE = 10000
+FULL_QUESTION_UNITS = 100 * SCORE_SCALE
+SIGNIFICANT_DIGITS = 6
+SIGNIFICANT_LIMIT = 10 ** SIGNIFICANT_DIGITS
+
+# Timers up to an hour get a precomputed table of scores for whole seconds
+TIMER_TABLE_MAX_SECONDS = 3600
+
+_DECIMAL_CONTEXT = Context(prec=28)
+
+
+def _div_round_half_even(numerator, denominator):
+    quotient, remainder = divmod(numerator, denominator)
+    twice = 2 * remainder
+    if twice > denominator or (twice == denominator and quotient % 2):
+        quotient += 1
+    return quotient
+
+
+def _round_significant(units):
+    """Round a non-negative unit count to six significant digits, half-even."""
+    if units < SIGNIFICANT_LIMIT:
+        return units
+    scale = 10
+    while units >= SIGNIFICANT_LIMIT * scale:
+        scale *= 10
+    return _div_round_half_even(units, scale) * scale
+
+
+def _timed_question_units(numerator, exponent, timer_seconds):
+    """Score units for a correct answer given after numerator / 10**exponent seconds."""
+    denominator = timer_seconds * 10 ** exponent
+    if numerator > denominator:
+        return 0
+    if numerator == 0:
+        return FULL_QUESTION_UNITS
+    # Number of leading zeros of the ratio after the decimal point
+    leading_zeros = 0
+    while numerator * 10 ** (leading_zeros + 1) < denominator:
+        leading_zeros += 1
+    digits = SIGNIFICANT_DIGITS + leading_zeros
+    ratio = _div_round_half_even(numerator * 10 ** digits, denominator)
+    remaining = 10 ** digits - ratio
+    if leading_zeros:
+        remaining = _div_round_half_even(remaining, 10 ** leading_zeros)
+    # remaining / 10**6 of a question worth 100 points is exactly `remaining` units
+    return remaining
+
+
+def _split_time(time_taken):
+    """Return (numerator, exponent) with time_taken == numerator / 10**exponent."""
+    if type(time_taken) is int:
+        numerator, exponent = time_taken, 0
+    else:
+        sign, digits, exp = Decimal(str(time_taken)).as_tuple()
+        numerator = int(''.join(map(str, digits)))
+        if sign:
+            numerator = -numerator
+        if exp >= 0:
+            numerator, exponent = numerator * 10 ** exp, 0
+        else:
+            exponent = -exp
+    if numerator < 0:
+        raise ValueError(f"TimeTaken must be non-negative, got {time_taken!r}")
+    return numerator, exponent
+
+
+def units_to_decimal(units):
+    return _DECIMAL_CONTEXT.divide(Decimal(units), Decimal(SCORE_SCALE))
+
+
+class CompiledAnswerKey:
+    """Answer key of a single quiz, ready to score submissions."""
+
+    __slots__ = ('question_keys', 'correct_answers', 'timer_seconds', 'timer_table')
+
+    def __init__(self, correct_answers, timer_seconds=None):
+        self.correct_answers = tuple(str(answer) for answer in correct_answers)
+        self.question_keys = tuple(str(idx) for idx in range(len(self.correct_answers)))
+        self.timer_seconds = timer_seconds
+        self.timer_table = None
+        if timer_seconds is not None:
+            if timer_seconds <= 0:
+                raise ValueError("TimerSeconds must be a positive integer")
+            if timer_seconds <= TIMER_TABLE_MAX_SECONDS:
+                self.timer_table = tuple(
+                    _timed_question_units(seconds, 0, timer_seconds)
+                    for seconds in range(timer_seconds + 1)
+                )
+
+    @property
+    def total_questions(self):
+        return len(self.correct_answers)
+
+    def _question_units(self, time_taken):
+        if self.timer_seconds is None:
+            return FULL_QUESTION_UNITS
+        table = self.timer_table
+        if table is not None and type(time_taken) is int and 0 <= time_taken < len(table):
+            return table[time_taken]
+        numerator, exponent = _split_time(time_taken)
+        return _timed_question_units(numerator, exponent, self.timer_seconds)
+
+    def score_units(self, answers):
+        """Score an ``Answers`` map, returning the total in units of 1/10000 point."""
+        total = 0
+        for key, correct in zip(self.question_keys, self.correct_answers):
+            answer_data = answers.get(key)
+            if answer_data is None:
+                continue
+            answer = answer_data['Answer']
+            if type(answer) is not str:
+                answer = str(answer)
+            if answer != correct:
+                continue
+            units = self._question_units(answer_data['TimeTaken'])
+            if units:
+                total = _round_significant(total + units)
+        return total
+
+    def score(self, answers):
+        """Score an ``Answers`` map, returning the total as a Decimal."""
+        return units_to_decimal(self.score_units(answers))
+
+
+def compile_answer_key(quiz):
+    """Compile a Quizzes item into a ``CompiledAnswerKey``.
+
+    Quizzes whose questions live in S3 carry their correct answers in the
+    compact ``AnswerKey`` list instead of ``Questions``.
+    """
+    timer_seconds = None
+    if quiz.get('EnableTimer', False) and quiz.get('TimerSeconds') is not None:
+        timer_seconds = int(quiz['TimerSeconds'])
+    if 'AnswerKey' in quiz:
+        correct_answers = list(quiz['AnswerKey'])
+    else:
+        correct_answers = [question['CorrectAnswer'] for question in quiz['Questions']]
+    return CompiledAnswerKey(correct_answers, timer_seconds)
@@ -1,24 +1,30 @@
 import json
-import boto3
-import uuid
 
-def lambda_handler(event, context):
-    try:
-        submission = json.loads(event['body'])
-        username = submission['Username']
-        quiz_id = submission['QuizID']
-        answers = submission['Answers']
-        email = submission.get('Email')
+from quiz_common import clients
+from quiz_common.submissions import (
+    SUBMISSION_MAX_BYTES,
+    check_answers,
+    load_quiz_shape,
+    loads_submissions,
+    submission_message,
+    submission_queue_url,
+)
+
 
-        if not username or not quiz_id or not answers:
-            raise ValueError("Username, QuizID, and Answers are required.")
+def lambda_handler(event, context):
+    if len(event.get('body') or '') > SUBMISSION_MAX_BYTES:
+        return {
+            'statusCode': 413,
+            'headers': {
+                'Access-Control-Allow-Origin': '*',
+                'Access-Control-Allow-Methods': '*',
+            },
+            'body': json.dumps({'message': f'Submissions are limited to {SUBMISSION_MAX_BYTES} bytes'})
+        }
 
-        for question_idx, answer_data in answers.items():
-            if 'Answer' not in answer_data or 'TimeTaken' not in answer_data:
-                raise ValueError(f"Answer for question {question_idx} must include 'Answer' and 'TimeTaken'")
-            time_taken = float(answer_data['TimeTaken'])
-            if time_taken < 0:
-                raise ValueError(f"TimeTaken for question {question_idx} must be non-negative")
+    try:
+        message_body = submission_message(loads_submissions(event['body']))
+        quiz_id = message_body['QuizID']
     except (KeyError, json.JSONDecodeError, ValueError, TypeError) as e:
         return {
             'statusCode': 400,
@@ -29,12 +35,9 @@ def lambda_handler(event, context):
             'body': json.dumps({'message': 'Invalid input data', 'error': str(e)})
         }
 
-    dynamodb = boto3.resource('dynamodb')
-    quizzes_table = dynamodb.Table('Quizzes')
-
     try:
-        response = quizzes_table.get_item(Key={'QuizID': quiz_id})
-        if 'Item' not in response:
+        shape = load_quiz_shape(clients.client('dynamodb'), quiz_id)
+        if not shape:
             return {
                 'statusCode': 400,
                 'headers': {
@@ -53,22 +56,22 @@ def lambda_handler(event, context):
             'body': json.dumps({'message': 'Error accessing the Quizzes table.', 'error': str(e)})
         }
 
-    sqs = boto3.client('sqs')
-    queue_url = sqs.get_queue_url(QueueName='QuizSubmissionQueue')['QueueUrl']
-
-    message_body = {
-        'SubmissionID': str(uuid.uuid4()),
-        'Username': username,
-        'QuizID': quiz_id,
-        'Answers': answers,
-    }
-
-    if email:
-        message_body['Email'] = email
+    try:
+        check_answers(message_body['Answers'], shape)
+    except ValueError as e:
+        return {
+            'statusCode': 400,
+            'headers': {
+                'Access-Control-Allow-Origin': '*',
+                'Access-Control-Allow-Methods': '*',
+            },
+            'body': json.dumps({'message': 'Invalid input data', 'error': str(e)})
+        }
 
     try:
+        sqs = clients.client('sqs')
         sqs.send_message(
-            QueueUrl=queue_url,
+            QueueUrl=submission_queue_url(sqs),
             MessageBody=json.dumps(message_body)
         )
     except Exception as e:
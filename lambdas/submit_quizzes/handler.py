@@ -0,0 +1,122 @@
+import json
+import os
+
+from quiz_common import clients
+from quiz_common.submissions import (
+    SUBMISSION_MAX_BYTES,
+    check_answers,
+    load_quiz_shapes,
+    loads_submission_batch,
+    submission_message,
+    submission_queue_url,
+    unique_keys,
+)
+
+SUBMIT_MAX_SUBMISSIONS = int(os.environ.get('SUBMIT_MAX_SUBMISSIONS', '500'))
+# SendMessageBatch takes at most 10 entries of 256 KB in total
+SEND_BATCH_MAX_ENTRIES = 10
+SEND_BATCH_MAX_BYTES = 256 * 1024
+
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': '*',
+}
+
+
+def send_batches(entries):
+    """Yield groups of ``(index, message body)`` that fit one SendMessageBatch call."""
+    batch, batch_bytes = [], 0
+    for index, body in entries:
+        size = len(body.encode('utf-8'))
+        if batch and (len(batch) == SEND_BATCH_MAX_ENTRIES or batch_bytes + size > SEND_BATCH_MAX_BYTES):
+            yield batch
+            batch, batch_bytes = [], 0
+        batch.append((index, body))
+        batch_bytes += size
+    if batch:
+        yield batch
+
+
+def enqueue(sqs, entries):
+    """Send ``(index, message body)`` pairs to the submission queue.
+
+    Returns {index: error message} for the messages SQS did not accept.
+    """
+    errors = {}
+    for batch in send_batches(entries):
+        try:
+            response = sqs.send_message_batch(
+                QueueUrl=submission_queue_url(sqs),
+                Entries=[{'Id': str(index), 'MessageBody': body} for index, body in batch],
+            )
+        except Exception as e:
+            print(f"Error sending message batch to SQS: {e}")
+            errors.update((index, f"Error sending message to SQS: {e}") for index, _ in batch)
+            continue
+        for failure in response.get('Failed', []):
+            errors[int(failure['Id'])] = f"Error sending message to SQS: {failure.get('Message', failure['Code'])}"
+    return errors
+
+
+def lambda_handler(event, context):
+    try:
+        submissions = loads_submission_batch(event['body'])
+    except (KeyError, ValueError, TypeError) as e:
+        return {
+            'statusCode': 400,
+            'headers': CORS_HEADERS,
+            'body': json.dumps({'message': 'Invalid input data', 'error': str(e)})
+        }
+    if len(submissions) > SUBMIT_MAX_SUBMISSIONS:
+        return {
+            'statusCode': 413,
+            'headers': CORS_HEADERS,
+            'body': json.dumps({'message': f'At most {SUBMIT_MAX_SUBMISSIONS} submissions can be sent per request'})
+        }
+
+    results = [None] * len(submissions)
+    messages = {}
+    for index, submission in enumerate(submissions):
+        try:
+            messages[index] = submission_message(unique_keys(submission))
+        except (KeyError, ValueError, TypeError) as e:
+            error = str(e) if not isinstance(e, KeyError) else f"Missing field {e}"
+            results[index] = {'Index': index, 'Error': error}
+
+    shapes = load_quiz_shapes(
+        clients.client('dynamodb'), list(dict.fromkeys(message['QuizID'] for message in messages.values()))
+    )
+    entries = []
+    for index, message in messages.items():
+        shape = shapes[message['QuizID']]
+        if shape is False:
+            results[index] = {'Index': index, 'Error': f'QuizID "{message["QuizID"]}" does not exist.'}
+            continue
+        if isinstance(shape, Exception):
+            results[index] = {'Index': index, 'Error': f'Error accessing the Quizzes table: {shape}'}
+            continue
+        try:
+            check_answers(message['Answers'], shape)
+        except ValueError as e:
+            results[index] = {'Index': index, 'Error': str(e)}
+            continue
+        body = json.dumps(message)
+        if len(body) > SUBMISSION_MAX_BYTES:
+            results[index] = {'Index': index, 'Error': f'Submissions are limited to {SUBMISSION_MAX_BYTES} bytes'}
+            continue
+        entries.append((index, body))
+
+    errors = enqueue(clients.client('sqs'), entries) if entries else {}
+    for index, _ in entries:
+        if index in errors:
+            results[index] = {'Index': index, 'Error': errors[index]}
+        else:
+            results[index] = {'Index': index, 'SubmissionID': messages[index]['SubmissionID']}
+
+    accepted = sum(1 for result in results if 'SubmissionID' in result)
+    print(f"Accepted {accepted} of {len(results)} submissions")
+    return {
+        'statusCode': 200,
+        'headers': CORS_HEADERS,
+        'body': json.dumps({'Results': results})
+    }
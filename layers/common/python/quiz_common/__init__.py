@@ -0,0 +1 @@
+"""Code shared by the quiz Lambdas, deployed as the QuizCommonLayer layer."""
@@ -0,0 +1,57 @@
+"""Bounded in-process caches for warm Lambda containers.
+
+A cache lives at module scope, so every warm invocation of the same
+container shares it. Entries expire after a TTL, which bounds how stale a
+served value can be, and the least recently used entry is evicted once
+``max_entries`` is reached. A cached ``None`` is a valid negative entry;
+pass a ``default`` to ``get`` to tell it apart from a miss.
+"""
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """LRU cache whose entries expire ``ttl_seconds`` after they were put.
+
+    ``hits`` and ``misses`` count lookups since the container started and are
+    reported by ``stats()`` for logging.
+    """
+
+    def __init__(self, max_entries, ttl_seconds, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._entries = OrderedDict()
+
+    def get(self, key, default=None):
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > self._clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+        self.misses += 1
+        return default
+
+    def put(self, key, value, ttl_seconds=None):
+        """Cache ``value``; ``ttl_seconds`` overrides the cache TTL, e.g. for negative entries."""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._entries[key] = (self._clock() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+    def __len__(self):
+        return len(self._entries)
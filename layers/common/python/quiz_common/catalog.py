@@ -0,0 +1,22 @@
+"""The public quiz catalog.
+
+Public quizzes carry two extra attributes, ``PublicCatalog`` and
+``CreatedAt``, that key the sparse PublicCatalog-CreatedAt-index on Quizzes.
+Private quizzes never get ``PublicCatalog``, so they are not in the index at
+all and listing public quizzes only reads public ones, newest first.
+"""
+import time
+
+PUBLIC_CATALOG_INDEX_NAME = 'PublicCatalog-CreatedAt-index'
+PUBLIC_CATALOG_PARTITION = 'Public'
+# Key attributes of the index, i.e. of its LastEvaluatedKey
+PUBLIC_CATALOG_INDEX_KEY = {'QuizID': 'S', 'PublicCatalog': 'S', 'CreatedAt': 'N'}
+
+
+def catalog_attributes(visibility, now=None):
+    """Return the attributes that place a new quiz in (or out of) the public catalog."""
+    created_at = int((time.time() if now is None else now) * 1000)
+    attributes = {'CreatedAt': created_at}
+    if visibility == 'Public':
+        attributes['PublicCatalog'] = PUBLIC_CATALOG_PARTITION
+    return attributes
@@ -0,0 +1,101 @@
+"""Per-container circuit breaker for calls to a degraded dependency.
+
+Like the caches, a breaker lives at module scope and is shared by every warm
+invocation of the same container. It opens after ``failure_threshold``
+consecutive failures, where a call slower than ``latency_threshold_seconds``
+counts as a failure even if it succeeded. While open, ``allow_request``
+returns False so callers take their fallback path straight away instead of
+waiting through the client's retries. After ``reset_timeout_seconds`` the
+breaker turns half-open and lets a single probe call through: success closes
+it, failure opens it for another ``reset_timeout_seconds``. A probe that never
+reports, e.g. because its invocation timed out, is given up on after
+``reset_timeout_seconds`` and the next call becomes the new probe.
+
+Only failures of the dependency itself should be recorded: ``is_transient_error``
+tells them apart from errors a bad request would cause on every attempt.
+"""
+import time
+
+from botocore.exceptions import ConnectionError, HTTPClientError
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# Error codes of a throttled or degraded service, as opposed to a bad request
+TRANSIENT_ERROR_CODES = frozenset((
+    'InternalServerError',
+    'InternalFailure',
+    'ServiceUnavailable',
+    'ProvisionedThroughputExceededException',
+    'RequestLimitExceeded',
+    'ThrottlingException',
+    'Throttling',
+))
+
+
+def is_transient_error(error):
+    """Tell whether a failed AWS call hit throttling, a 5xx, a timeout or a dropped connection."""
+    if isinstance(error, (ConnectionError, HTTPClientError)):
+        return True
+    response = getattr(error, 'response', None) or {}
+    if response.get('Error', {}).get('Code') in TRANSIENT_ERROR_CODES:
+        return True
+    return response.get('ResponseMetadata', {}).get('HTTPStatusCode', 0) >= 500
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with half-open probing.
+
+    Callers check ``allow_request()`` before the call and report its outcome
+    with ``record_success(latency_seconds)`` or ``record_failure()``.
+    """
+
+    def __init__(self, failure_threshold, reset_timeout_seconds, latency_threshold_seconds=None,
+                 clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.latency_threshold_seconds = latency_threshold_seconds
+        self.consecutive_failures = 0
+        self._clock = clock
+        self._state = CLOSED
+        self._opened_at = None
+        # When the outstanding half-open probe was let through, None if there is none
+        self._probe_started_at = None
+
+    @property
+    def state(self):
+        if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout_seconds:
+            self._state = HALF_OPEN
+            self._probe_started_at = None
+        return self._state
+
+    def allow_request(self):
+        """Tell whether a call may go through; in half-open state only one probe at a time may."""
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN:
+            now = self._clock()
+            if self._probe_started_at is None or now - self._probe_started_at >= self.reset_timeout_seconds:
+                self._probe_started_at = now
+                return True
+        return False
+
+    def record_success(self, latency_seconds=0.0):
+        if self.latency_threshold_seconds is not None and latency_seconds > self.latency_threshold_seconds:
+            self.record_failure()
+            return
+        self.consecutive_failures = 0
+        self._state = CLOSED
+        self._probe_started_at = None
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        if self._state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self._state = OPEN
+            self._opened_at = self._clock()
+            self._probe_started_at = None
+
+    def stats(self):
+        return {'state': self.state, 'consecutive_failures': self.consecutive_failures}
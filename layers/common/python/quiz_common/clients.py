@@ -0,0 +1,82 @@
+"""AWS clients shared by all quiz Lambdas.
+
+Clients and resources are created on first use and cached at module scope, so
+warm invocations reuse the same botocore session, loaded service models and
+open keep-alive connections instead of rebuilding them on every request.
+
+Low-level clients come straight from botocore. boto3 and its resource layer are
+only imported by handlers that ask for a resource, which keeps them out of the
+cold start of the read-only handlers.
+"""
+import os
+import threading
+
+import botocore.session
+from botocore.config import Config
+
+CLIENT_CONFIG = Config(
+    retries={
+        'mode': 'adaptive',
+        'max_attempts': int(os.environ.get('AWS_CLIENT_MAX_ATTEMPTS', '3')),
+    },
+    max_pool_connections=int(os.environ.get('AWS_CLIENT_MAX_POOL_CONNECTIONS', '32')),
+    tcp_keepalive=True,
+    connect_timeout=float(os.environ.get('AWS_CLIENT_CONNECT_TIMEOUT', '2')),
+    read_timeout=float(os.environ.get('AWS_CLIENT_READ_TIMEOUT', '10')),
+)
+
+_lock = threading.Lock()
+_session = None
+_boto3_session = None
+_clients = {}
+_resources = {}
+
+
+def _get_session():
+    global _session
+    if _session is None:
+        _session = botocore.session.get_session()
+    return _session
+
+
+def _get_boto3_session():
+    global _boto3_session
+    if _boto3_session is None:
+        import boto3.session
+
+        _boto3_session = boto3.session.Session(botocore_session=_get_session())
+    return _boto3_session
+
+
+def client(service_name):
+    """Return the shared low-level client for ``service_name``."""
+    cached = _clients.get(service_name)
+    if cached is None:
+        with _lock:
+            cached = _clients.get(service_name)
+            if cached is None:
+                cached = _get_session().create_client(service_name, config=CLIENT_CONFIG)
+                _clients[service_name] = cached
+    return cached
+
+
+def resource(service_name):
+    """Return the shared boto3 resource for ``service_name``."""
+    cached = _resources.get(service_name)
+    if cached is None:
+        with _lock:
+            cached = _resources.get(service_name)
+            if cached is None:
+                cached = _get_boto3_session().resource(service_name, config=CLIENT_CONFIG)
+                _resources[service_name] = cached
+    return cached
+
+
+def reset():
+    """Drop every cached client, forcing the next call to build new ones."""
+    global _session, _boto3_session
+    with _lock:
+        _clients.clear()
+        _resources.clear()
+        _session = None
+        _boto3_session = None
@@ -0,0 +1,77 @@
+"""Helpers for DynamoDB's low-level wire format.
+
+Handlers on the low-level client get items as ``{"S": ...}`` / ``{"N": ...}``
+attribute values; these helpers convert them without pulling in boto3's
+resource layer.
+"""
+from decimal import Decimal
+
+# DynamoDB rejects items larger than 400 KB
+ITEM_MAX_BYTES = 400 * 1024
+
+
+def from_wire(value):
+    """Convert a single wire-format attribute value to a Python value."""
+    (type_, data), = value.items()
+    if type_ == 'S':
+        return data
+    if type_ == 'N':
+        return Decimal(data)
+    if type_ == 'M':
+        return {key: from_wire(item) for key, item in data.items()}
+    if type_ == 'L':
+        return [from_wire(item) for item in data]
+    if type_ == 'BOOL':
+        return data
+    if type_ == 'NULL':
+        return None
+    if type_ == 'SS':
+        return set(data)
+    if type_ == 'NS':
+        return {Decimal(number) for number in data}
+    if type_ == 'B':
+        return data
+    if type_ == 'BS':
+        return set(data)
+    raise TypeError(f"Unknown DynamoDB type: {type_}")
+
+
+def item_from_wire(item):
+    """Convert a wire-format item to a dict of Python values."""
+    return {key: from_wire(value) for key, value in item.items()}
+
+
+def _number_size(number):
+    digits = number.normalize().as_tuple().digits if number else (0,)
+    return (len(digits) + 1) // 2 + 1
+
+
+def _value_size(value):
+    if isinstance(value, str):
+        return len(value.encode('utf-8'))
+    if isinstance(value, bool) or value is None:
+        return 1
+    if isinstance(value, (int, float, Decimal)):
+        return _number_size(Decimal(str(value)))
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if type(value).__name__ == 'Binary':
+        # boto3.dynamodb.types.Binary, as the resource layer reads B values
+        return len(bytes(value))
+    if isinstance(value, dict):
+        return 3 + sum(len(key.encode('utf-8')) + _value_size(item) + 1 for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return 3 + sum(_value_size(item) + 1 for item in value)
+    if isinstance(value, set):
+        return sum(_value_size(item) for item in value)
+    raise TypeError(f"Cannot size a value of type {type(value).__name__}")
+
+
+def item_size(item):
+    """Estimate the stored size of an item in Python form, as DynamoDB bills it.
+
+    Follows the published sizing rules: names and strings count their UTF-8
+    bytes, numbers about one byte per two significant digits, maps and lists
+    three bytes plus one per element.
+    """
+    return sum(len(name.encode('utf-8')) + _value_size(value) for name, value in item.items())
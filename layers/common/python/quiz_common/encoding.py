@@ -0,0 +1,127 @@
+"""Single-pass JSON encoding of DynamoDB items for API responses.
+
+Items are written straight to a JSON string, either from boto3's Python form
+(``Decimal`` numbers) or from the low-level wire form (``{"S": ..}``,
+``{"N": ..}``), without first rebuilding them as plain dicts and lists. The
+output is identical to ``json.dumps`` over the item after converting integral
+numbers to ``int`` and the rest to ``float``. Keys listed in ``exclude`` are
+dropped from maps at every depth, e.g. ``CorrectAnswer`` inside ``Questions``.
+"""
+from decimal import Decimal
+from json.encoder import encode_basestring_ascii
+
+_float_repr = float.__repr__
+
+
+def _encode_decimal(number):
+    if number == number.to_integral_value():
+        return str(int(number))
+    return _float_repr(float(number))
+
+
+def _encode_number_string(number):
+    # DynamoDB returns integers as plain digit strings; anything else goes
+    # through Decimal so the output matches the boto3 code path
+    if number.lstrip('-').isdigit():
+        return str(int(number))
+    return _encode_decimal(Decimal(number))
+
+
+def _encode_value(value, parts, exclude):
+    value_type = type(value)
+    if value_type is str:
+        parts.append(encode_basestring_ascii(value))
+    elif value_type is Decimal:
+        parts.append(_encode_decimal(value))
+    elif value_type is dict:
+        parts.append('{')
+        first = True
+        for key, item in value.items():
+            if key in exclude:
+                continue
+            if not first:
+                parts.append(', ')
+            first = False
+            parts.append(encode_basestring_ascii(key))
+            parts.append(': ')
+            _encode_value(item, parts, exclude)
+        parts.append('}')
+    elif value_type is list or value_type is set or value_type is tuple:
+        parts.append('[')
+        first = True
+        for item in value:
+            if not first:
+                parts.append(', ')
+            first = False
+            _encode_value(item, parts, exclude)
+        parts.append(']')
+    elif value is True:
+        parts.append('true')
+    elif value is False:
+        parts.append('false')
+    elif value is None:
+        parts.append('null')
+    elif value_type is int:
+        parts.append(int.__repr__(value))
+    elif value_type is float:
+        parts.append(_float_repr(value))
+    else:
+        raise TypeError(f"Object of type {value_type.__name__} is not JSON serializable")
+
+
+def _encode_wire_value(value, parts, exclude):
+    (type_, data), = value.items()
+    if type_ == 'S':
+        parts.append(encode_basestring_ascii(data))
+    elif type_ == 'N':
+        parts.append(_encode_number_string(data))
+    elif type_ == 'M':
+        _encode_wire_map(data, parts, exclude)
+    elif type_ == 'L':
+        parts.append('[')
+        first = True
+        for item in data:
+            if not first:
+                parts.append(', ')
+            first = False
+            _encode_wire_value(item, parts, exclude)
+        parts.append(']')
+    elif type_ == 'BOOL':
+        parts.append('true' if data else 'false')
+    elif type_ == 'NULL':
+        parts.append('null')
+    elif type_ == 'SS':
+        parts.append('[' + ', '.join(encode_basestring_ascii(item) for item in data) + ']')
+    elif type_ == 'NS':
+        parts.append('[' + ', '.join(_encode_number_string(item) for item in data) + ']')
+    else:
+        raise TypeError(f"DynamoDB type {type_} is not JSON serializable")
+
+
+def _encode_wire_map(data, parts, exclude):
+    parts.append('{')
+    first = True
+    for key, item in data.items():
+        if key in exclude:
+            continue
+        if not first:
+            parts.append(', ')
+        first = False
+        parts.append(encode_basestring_ascii(key))
+        parts.append(': ')
+        _encode_wire_value(item, parts, exclude)
+    parts.append('}')
+
+
+def encode_item(item, exclude=frozenset()):
+    """Encode an item in boto3's Python form (Decimal numbers) as JSON."""
+    parts = []
+    _encode_value(item, parts, frozenset(exclude))
+    return ''.join(parts)
+
+
+def encode_wire_item(item, exclude=frozenset()):
+    """Encode an item in DynamoDB's wire form as JSON."""
+    parts = []
+    _encode_wire_map(item, parts, frozenset(exclude))
+    return ''.join(parts)
@@ -0,0 +1,95 @@
+"""Materialized per-quiz leaderboards.
+
+The scoring Lambda keeps one item per quiz in the Leaderboards table holding
+the best LEADERBOARD_SIZE submissions, sorted by descending score. Every
+update is a conditional put on the item's ``Version`` so that concurrent
+scoring batches never overwrite each other's entries. get_leaderboard serves
+``top <= LEADERBOARD_SIZE`` from this item with a single GetItem.
+"""
+import os
+
+from botocore.exceptions import ClientError
+
+from quiz_common.retries import backoff
+
+LEADERBOARD_TABLE_NAME = 'Leaderboards'
+LEADERBOARD_SIZE = int(os.environ.get('LEADERBOARD_SIZE', '25'))
+LEADERBOARD_MAX_ATTEMPTS = 5
+
+
+class LeaderboardUpdateError(RuntimeError):
+    """Every attempt of a leaderboard update lost the race on ``Version``.
+
+    ``unmerged`` holds the SubmissionIDs of the new entries that belong in
+    the top list but are not in it; the other entries need no retry.
+    """
+
+    def __init__(self, quiz_id, unmerged):
+        super().__init__(f"Leaderboard update for {quiz_id} lost {LEADERBOARD_MAX_ATTEMPTS} races")
+        self.unmerged = unmerged
+
+
+def _sort_key(entry):
+    return (-entry['Score'], entry['SubmissionID'])
+
+
+def merge_top_entries(entries, new_entries, size=LEADERBOARD_SIZE):
+    """Merge new leaderboard entries into a sorted top list.
+
+    Entries are dicts with Username, Score and SubmissionID. A SubmissionID
+    that is already present is replaced, so redelivered submissions are not
+    counted twice. Returns the merged list truncated to ``size`` entries.
+    """
+    merged = {entry['SubmissionID']: entry for entry in entries}
+    for entry in new_entries:
+        merged[entry['SubmissionID']] = entry
+    return sorted(merged.values(), key=_sort_key)[:size]
+
+
+def update_leaderboard(table, quiz_id, new_entries, seed=None, size=LEADERBOARD_SIZE):
+    """Merge ``new_entries`` into the leaderboard item of ``quiz_id``.
+
+    ``table`` is a boto3 Table for Leaderboards. When the quiz has no
+    leaderboard item yet, ``seed`` is called to load the current top entries
+    from the QuizID-Score-index so that older submissions are not lost. Lost
+    races on the version check are retried with a fresh read after a jittered
+    backoff, so writers to a popular quiz do not collide again straight away.
+    Raises LeaderboardUpdateError once LEADERBOARD_MAX_ATTEMPTS races are lost.
+    """
+    unmerged = set()
+    for attempt in range(LEADERBOARD_MAX_ATTEMPTS):
+        if attempt:
+            backoff(attempt)
+        item = table.get_item(Key={'QuizID': quiz_id}, ConsistentRead=True).get('Item')
+        if item is None:
+            version = 0
+            entries = seed(quiz_id, size) if seed else []
+        else:
+            version = int(item['Version'])
+            entries = item['TopEntries']
+
+        merged = merge_top_entries(entries, new_entries, size)
+        # New entries that belong in the top list and are not there yet
+        unmerged = {entry['SubmissionID'] for entry in new_entries if entry in merged and entry not in entries}
+        if item is not None and not unmerged:
+            # None of the new entries changes the top list
+            return False
+
+        if version:
+            condition = {
+                'ConditionExpression': '#version = :version',
+                'ExpressionAttributeNames': {'#version': 'Version'},
+                'ExpressionAttributeValues': {':version': version},
+            }
+        else:
+            condition = {'ConditionExpression': 'attribute_not_exists(QuizID)'}
+        try:
+            table.put_item(
+                Item={'QuizID': quiz_id, 'TopEntries': merged, 'Version': version + 1},
+                **condition
+            )
+            return True
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+    raise LeaderboardUpdateError(quiz_id, unmerged)
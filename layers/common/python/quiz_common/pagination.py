@@ -0,0 +1,38 @@
+"""Opaque pagination cursors for API responses.
+
+A cursor is DynamoDB's ``LastEvaluatedKey`` (in wire format) serialized as
+URL-safe base64 JSON, so clients can pass it back verbatim as a query string
+parameter to resume a Query or Scan.
+"""
+import base64
+import binascii
+import json
+
+
+def encode_cursor(last_evaluated_key):
+    """Return the cursor for ``last_evaluated_key``, or None at the end of the results."""
+    if not last_evaluated_key:
+        return None
+    raw = json.dumps(last_evaluated_key, separators=(',', ':'), sort_keys=True)
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, key_attributes):
+    """Turn a cursor back into an ``ExclusiveStartKey``.
+
+    ``key_attributes`` maps each expected key attribute to its DynamoDB type,
+    e.g. ``{'QuizID': 'S', 'Score': 'N'}``. Raises ValueError for cursors that
+    were not produced by ``encode_cursor`` for the same key schema.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        key = json.loads(raw)
+    except (binascii.Error, ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {e}") from None
+    if not isinstance(key, dict) or set(key) != set(key_attributes):
+        raise ValueError("Invalid cursor")
+    for name, type_ in key_attributes.items():
+        value = key[name]
+        if not isinstance(value, dict) or list(value) != [type_] or not isinstance(value[type_], str):
+            raise ValueError("Invalid cursor")
+    return key
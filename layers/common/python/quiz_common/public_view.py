@@ -0,0 +1,24 @@
+"""The ready-to-serve public representation of a quiz.
+
+Writers store the quiz as returned by getquiz, answers stripped and already
+encoded as JSON, in the quiz item's ``PublicView`` attribute. getquiz then
+projects just that attribute and returns it as the response body. The view
+holds the only copy of inline questions: the item keeps the compact
+``AnswerKey`` for scoring instead of ``Questions``, so a quiz is not stored,
+and paid for in write units and retry messages, twice.
+"""
+from quiz_common.encoding import encode_item, encode_wire_item
+
+PUBLIC_VIEW_ATTRIBUTE = 'PublicView'
+# Attributes never shown to players, at any depth of the quiz item
+PRIVATE_ATTRIBUTES = ('CorrectAnswer', 'AnswerKey', 'QuestionsLocation', 'PublicCatalog', PUBLIC_VIEW_ATTRIBUTE)
+
+
+def encode_public_view(quiz):
+    """Encode a quiz in boto3's Python form as its public JSON view."""
+    return encode_item(quiz, exclude=PRIVATE_ATTRIBUTES)
+
+
+def encode_public_view_from_wire(item):
+    """Encode a wire-format quiz item that has no stored view yet."""
+    return encode_wire_item(item, exclude=PRIVATE_ATTRIBUTES)
@@ -0,0 +1,89 @@
+"""S3 storage for the questions of large quizzes.
+
+Quizzes whose public view would exceed QUIZ_INLINE_MAX_BYTES keep their
+questions in S3 instead of the Quizzes item, which would otherwise run into
+DynamoDB's 400 KB item limit. The questions, answers stripped, are written as
+JSON arrays of QUESTIONS_PER_CHUNK questions each under a random prefix. The
+item keeps the metadata, ``QuestionCount``, ``QuestionsLocation`` pointing at
+the chunks and the compact ``AnswerKey`` (the list of correct answers) that
+scoring reads. getquiz pages through the chunks with ``offset``/``limit``.
+"""
+import json
+import os
+import uuid
+
+from quiz_common.encoding import encode_item
+from quiz_common.public_view import encode_public_view
+
+QUIZ_QUESTIONS_BUCKET_NAME = os.environ.get('QUIZ_QUESTIONS_BUCKET_NAME', 'quiz-questions')
+QUIZ_INLINE_MAX_BYTES = int(os.environ.get('QUIZ_INLINE_MAX_BYTES', '100000'))
+QUESTIONS_PER_CHUNK = int(os.environ.get('QUESTIONS_PER_CHUNK', '50'))
+
+
+def _chunk_key(prefix, index):
+    return f"{prefix}/{index:05d}.json"
+
+
+def is_oversized(quiz_data):
+    """Tell whether a normalized quiz is too large to keep its questions inline."""
+    return len(encode_public_view(quiz_data)) > QUIZ_INLINE_MAX_BYTES
+
+
+def offload_questions(quiz_data, s3):
+    """Move the questions of a normalized quiz to S3.
+
+    Chunks are uploaded before the caller writes the item, so a stored item
+    never points at missing questions.
+    """
+    questions = quiz_data['Questions']
+    prefix = f"questions/{uuid.uuid4()}"
+    chunks = 0
+    for start in range(0, len(questions), QUESTIONS_PER_CHUNK):
+        s3.put_object(
+            Bucket=QUIZ_QUESTIONS_BUCKET_NAME,
+            Key=_chunk_key(prefix, chunks),
+            Body=encode_item(questions[start:start + QUESTIONS_PER_CHUNK], exclude=('CorrectAnswer',)).encode('utf-8'),
+            ContentType='application/json',
+        )
+        chunks += 1
+
+    quiz_data['AnswerKey'] = [question['CorrectAnswer'] for question in questions]
+    quiz_data['QuestionsLocation'] = {
+        'Bucket': QUIZ_QUESTIONS_BUCKET_NAME,
+        'Prefix': prefix,
+        'ChunkSize': QUESTIONS_PER_CHUNK,
+        'Chunks': chunks,
+    }
+    del quiz_data['Questions']
+    return quiz_data
+
+
+def load_questions(s3, location, offset=0, limit=None, cache=None):
+    """Return questions ``offset`` to ``offset + limit`` of an offloaded quiz.
+
+    Only the chunks overlapping the requested range are read. ``cache`` is an
+    optional ``TTLCache`` of chunks keyed by S3 key.
+    """
+    chunk_size = int(location['ChunkSize'])
+    chunks = int(location['Chunks'])
+    end = chunks * chunk_size if limit is None else offset + limit
+    questions = []
+    for index in range(offset // chunk_size, min(chunks, -(-end // chunk_size))):
+        key = _chunk_key(location['Prefix'], index)
+        chunk = cache.get(key) if cache is not None else None
+        if chunk is None:
+            response = s3.get_object(Bucket=location['Bucket'], Key=key)
+            chunk = json.loads(response['Body'].read())
+            if cache is not None:
+                cache.put(key, chunk)
+        base = index * chunk_size
+        questions.extend(chunk[max(offset - base, 0):max(end - base, 0)])
+    return questions
+
+
+def delete_questions(s3, location):
+    """Delete the chunks of an offloaded quiz whose item was never stored."""
+    keys = [{'Key': _chunk_key(location['Prefix'], index)} for index in range(int(location['Chunks']))]
+    # DeleteObjects takes at most 1000 keys
+    for start in range(0, len(keys), 1000):
+        s3.delete_objects(Bucket=location['Bucket'], Delete={'Objects': keys[start:start + 1000], 'Quiet': True})
@@ -0,0 +1,113 @@
+"""Human-readable QuizIDs that never overwrite an existing quiz.
+
+IDs are adjective-noun-verb sentences such as ``brave-otters-danced``. That
+space holds about a million IDs, so collisions become likely (birthday bound)
+once a few thousand quizzes exist. Writers therefore put each candidate with
+``attribute_not_exists(QuizID)`` and move on to the next candidate when the
+condition fails. Candidates after a collision, and every candidate when
+QUIZ_ID_SUFFIX_DIGITS is set, end in a random number for extra entropy.
+"""
+import os
+import random
+
+ADJECTIVES = (
+    'adorable', 'adventurous', 'alluring', 'amazing', 'ambitious',
+    'amusing', 'astonishing', 'attractive', 'awesome', 'bashful', 'bawdy',
+    'beautiful', 'bewildered', 'bizarre', 'bouncy', 'brainy', 'brave',
+    'brawny', 'burly', 'capricious', 'careful', 'caring', 'cautious',
+    'charming', 'cheerful', 'chivalrous', 'classy', 'clever', 'clumsy',
+    'colossal', 'cool', 'coordinated', 'courageous', 'cuddly', 'curious',
+    'cute', 'daffy', 'dapper', 'dashing', 'dazzling', 'delicate',
+    'delightful', 'determined', 'eager', 'embarrassed', 'enchanted',
+    'energetic', 'enormous', 'entertaining', 'enthralling', 'enthusiastic',
+    'evanescent', 'excited', 'exotic', 'exuberant', 'exultant', 'fabulous',
+    'fancy', 'festive', 'finicky', 'flashy', 'flippant', 'fluffy',
+    'fluttering', 'funny', 'furry', 'fuzzy', 'gaudy', 'gentle', 'giddy',
+    'glamorous', 'gleaming', 'goofy', 'gorgeous', 'graceful', 'grandiose',
+    'groovy', 'handsome', 'happy', 'hilarious', 'honorable', 'hulking',
+    'humorous', 'industrious', 'incredible', 'intelligent', 'jazzy',
+    'jolly', 'joyous', 'kind', 'macho', 'magnificent', 'majestic',
+    'marvelous', 'mighty', 'mysterious', 'naughty', 'nimble', 'nutty',
+    'oafish', 'obnoxious', 'outrageous', 'pretty', 'psychedelic',
+    'psychotic', 'puzzled', 'quirky', 'quizzical', 'rambunctious',
+    'remarkable', 'sassy', 'shaggy', 'smelly', 'sneaky', 'spiffy', 'swanky',
+    'sweet', 'swift', 'talented', 'thundering', 'unkempt', 'upbeat',
+    'uppity', 'wacky', 'waggish', 'whimsical', 'wiggly', 'zany',
+)
+
+NOUNS = (
+    'aardvarks', 'alligators', 'alpacas', 'anteaters', 'antelopes',
+    'armadillos', 'baboons', 'badgers', 'bears', 'beavers', 'boars',
+    'buffalos', 'bulls', 'bunnies', 'camels', 'cats', 'chameleons',
+    'cheetahs', 'centaurs', 'chickens', 'chimpanzees', 'chinchillas',
+    'chipmunks', 'cougars', 'cows', 'coyotes', 'cranes', 'crickets',
+    'crocodiles', 'deers', 'dinosaurs', 'dingos', 'dogs', 'donkeys',
+    'dragons', 'elephants', 'elves', 'ferrets', 'flamingos', 'foxes',
+    'frogs', 'gazelles', 'giraffes', 'gnomes', 'gnus', 'goats', 'gophers',
+    'gorillas', 'hamsters', 'hedgehogs', 'hippopotamus', 'hobbits', 'hogs',
+    'horses', 'hyenas', 'ibexes', 'iguanas', 'impalas', 'jackals',
+    'jackalopes', 'jaguars', 'kangaroos', 'kittens', 'koalas', 'lambs',
+    'lemmings', 'leopards', 'lions', 'ligers', 'lizards', 'llamas',
+    'lynxes', 'meerkat', 'moles', 'mongooses', 'monkeys', 'moose', 'mules',
+    'newts', 'okapis', 'orangutans', 'ostriches', 'otters', 'oxes',
+    'pandas', 'panthers', 'peacocks', 'pegasuses', 'phoenixes', 'pigeons',
+    'pigs', 'platypuses', 'ponies', 'porcupines', 'porpoises', 'pumas',
+    'pythons', 'rabbits', 'raccoons', 'rams', 'reindeers', 'rhinoceroses',
+    'salamanders', 'seals', 'sheep', 'skunks', 'sloths', 'slugs', 'snails',
+    'snakes', 'sphinxes', 'sprites', 'squirrels', 'takins', 'tigers',
+    'toads', 'trolls', 'turtles', 'unicorns', 'walruses', 'warthogs',
+    'weasels', 'wolves', 'wolverines', 'wombats', 'woodchucks', 'yaks',
+    'zebras',
+)
+
+VERBS = (
+    'ambled', 'assembled', 'burst', 'babbled', 'charged', 'chewed',
+    'clamored', 'coasted', 'crawled', 'crept', 'danced', 'dashed', 'drove',
+    'flopped', 'galloped', 'gathered', 'glided', 'hobbled', 'hopped',
+    'hurried', 'hustled', 'jogged', 'juggled', 'jumped', 'laughed',
+    'marched', 'meandered', 'munched', 'passed', 'plodded', 'pranced',
+    'ran', 'raced', 'rushed', 'sailed', 'sang', 'sauntered', 'scampered',
+    'scurried', 'skipped', 'slogged', 'slurped', 'spied', 'sprinted',
+    'spurted', 'squiggled', 'squirmed', 'stretched', 'strode', 'strut',
+    'swam', 'swung', 'traveled', 'trudged', 'tumbled', 'twisted', 'wade',
+    'wandered', 'whistled', 'wiggled', 'wobbled', 'yawned', 'zipped',
+    'zoomed',
+)
+
+QUIZ_ID_MAX_ATTEMPTS = int(os.environ.get('QUIZ_ID_MAX_ATTEMPTS', '5'))
+QUIZ_ID_SUFFIX_DIGITS = int(os.environ.get('QUIZ_ID_SUFFIX_DIGITS', '0'))
+# Suffix length used once a candidate has collided
+QUIZ_ID_RETRY_SUFFIX_DIGITS = 4
+QUIZ_ID_CONDITION = 'attribute_not_exists(QuizID)'
+
+_random = random.SystemRandom()
+
+
+def generate_quiz_id(suffix_digits=QUIZ_ID_SUFFIX_DIGITS, rng=_random):
+    """Return a random QuizID, ending in ``suffix_digits`` random digits if non-zero."""
+    quiz_id = f"{rng.choice(ADJECTIVES)}-{rng.choice(NOUNS)}-{rng.choice(VERBS)}"
+    if suffix_digits:
+        quiz_id = f"{quiz_id}-{rng.randrange(10 ** suffix_digits):0{suffix_digits}d}"
+    return quiz_id
+
+
+def candidate_quiz_ids(max_attempts=QUIZ_ID_MAX_ATTEMPTS, suffix_digits=QUIZ_ID_SUFFIX_DIGITS, rng=_random):
+    """Yield up to ``max_attempts`` QuizIDs to try in turn.
+
+    The first candidate uses ``suffix_digits``; later ones, only requested
+    after a collision, use at least QUIZ_ID_RETRY_SUFFIX_DIGITS.
+    """
+    for attempt in range(max_attempts):
+        digits = suffix_digits if attempt == 0 else max(suffix_digits, QUIZ_ID_RETRY_SUFFIX_DIGITS)
+        yield generate_quiz_id(digits, rng)
+
+
+def is_id_collision(error):
+    """Tell whether a failed conditional put hit an existing QuizID."""
+    response = getattr(error, 'response', None) or {}
+    return response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException'
+
+
+def id_space_size(suffix_digits=QUIZ_ID_SUFFIX_DIGITS):
+    """Number of distinct QuizIDs ``generate_quiz_id`` can return."""
+    return len(ADJECTIVES) * len(NOUNS) * len(VERBS) * 10 ** suffix_digits
@@ -0,0 +1,77 @@
+"""Validation and normalization of new quizzes.
+
+Shared by create_quiz and import_quizzes so a quiz is accepted, and stored,
+the same way whichever endpoint it arrives through.
+"""
+import json
+
+from quiz_common.catalog import catalog_attributes
+from quiz_common.public_view import PUBLIC_VIEW_ATTRIBUTE, encode_public_view
+
+QUESTION_FIELDS = ('QuestionText', 'Options', 'CorrectAnswer', 'Trivia')
+# Attributes only the backend may set; a client could use them to list
+# private quizzes, point at other quizzes' questions or replace the answer key
+SERVER_ATTRIBUTES = ('PublicCatalog', 'PublicView', 'QuestionCount', 'AnswerKey', 'QuestionsLocation')
+
+
+class IncompleteQuestionError(ValueError):
+    """A question lacks one of QUESTION_FIELDS."""
+
+    def __init__(self):
+        super().__init__('Each question must contain QuestionText, Options, CorrectAnswer, and Trivia')
+
+
+def normalize_quiz(quiz_data, now=None):
+    """Validate a quiz request body in place and fill in its defaults.
+
+    Raises KeyError, TypeError or ValueError for invalid input, and
+    IncompleteQuestionError for questions missing a required field.
+    """
+    if not isinstance(quiz_data, dict):
+        raise TypeError('Quiz must be a JSON object')
+    if 'Title' not in quiz_data:
+        raise KeyError('Title')
+    questions = quiz_data['Questions']
+    visibility = quiz_data.get('Visibility', 'Private')
+    if visibility not in ('Public', 'Private'):
+        raise ValueError("Visibility must be 'Public' or 'Private'")
+
+    enable_timer = quiz_data.get('EnableTimer', False)
+    if enable_timer:
+        timer_seconds = int(quiz_data.get('TimerSeconds', 0))
+        if timer_seconds <= 0:
+            raise ValueError("TimerSeconds must be a positive integer")
+        quiz_data['TimerSeconds'] = timer_seconds
+
+    for question in questions:
+        if not all(k in question for k in QUESTION_FIELDS):
+            raise IncompleteQuestionError()
+
+    quiz_data['Visibility'] = visibility
+    quiz_data['EnableTimer'] = enable_timer
+    for attribute in SERVER_ATTRIBUTES:
+        quiz_data.pop(attribute, None)
+    quiz_data.update(catalog_attributes(visibility, now))
+    quiz_data['QuestionCount'] = len(questions)
+    return quiz_data
+
+
+def assign_quiz_id(quiz_data, quiz_id):
+    """Give a normalized quiz its QuizID and the public view that depends on it.
+
+    The first call encodes the view and replaces inline ``Questions`` with the
+    ``AnswerKey``, as ``offload_questions`` does for large quizzes. Later
+    calls, after an ID collision, only swap the QuizID inside the view.
+    """
+    quiz_data['QuizID'] = quiz_id
+    view = quiz_data.get(PUBLIC_VIEW_ATTRIBUTE)
+    if view is not None:
+        # The questions are only in the view by now; the JSON round trip
+        # keeps its encoding, which matches json.dumps
+        quiz_data[PUBLIC_VIEW_ATTRIBUTE] = json.dumps(dict(json.loads(view), QuizID=quiz_id))
+        return quiz_data
+    # what getquiz serves, encoded once here instead of on every request
+    quiz_data[PUBLIC_VIEW_ATTRIBUTE] = encode_public_view(quiz_data)
+    if 'Questions' in quiz_data:
+        quiz_data['AnswerKey'] = [question['CorrectAnswer'] for question in quiz_data.pop('Questions')]
+    return quiz_data
@@ -0,0 +1,17 @@
+"""Backoff between retries of throttled or partially processed AWS calls.
+
+Batch calls (BatchGetItem, BatchWriteItem, TransactWriteItems) and lost
+conditional-write races are retried up to BATCH_MAX_ATTEMPTS times. Full
+jitter spreads the retries of concurrent invocations, so they do not all
+come back at the same moment.
+"""
+import random
+import time
+
+BATCH_MAX_ATTEMPTS = 5
+BATCH_BASE_DELAY_SECONDS = 0.05
+
+
+def backoff(attempt, base_delay_seconds=BATCH_BASE_DELAY_SECONDS):
+    """Sleep for a full-jitter exponential delay before retry number ``attempt``."""
+    time.sleep(random.uniform(0, base_delay_seconds * (2 ** attempt)))
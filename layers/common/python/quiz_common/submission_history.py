@@ -0,0 +1,20 @@
+"""A user's past submissions, newest first.
+
+Scoring stamps every UserSubmissions item with ``SubmittedAt``, the time the
+submission was accepted in epoch milliseconds, which together with
+``Username`` keys the Username-SubmittedAt-index. The index only projects the
+few attributes a results page lists, so the UserAnswers of every submission
+are not written a second time.
+"""
+import time
+
+USER_SUBMISSIONS_INDEX_NAME = 'Username-SubmittedAt-index'
+# Attributes projected into the index besides its keys and SubmissionID
+USER_SUBMISSIONS_INDEX_ATTRIBUTES = ('QuizID', 'Score', 'TotalQuestions')
+# Key attributes of the index, i.e. of its LastEvaluatedKey
+USER_SUBMISSIONS_INDEX_KEY = {'SubmissionID': 'S', 'Username': 'S', 'SubmittedAt': 'N'}
+
+
+def submitted_at(now=None):
+    """Return the SubmittedAt timestamp for a submission accepted ``now``."""
+    return int((time.time() if now is None else now) * 1000)
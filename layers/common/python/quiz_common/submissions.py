@@ -0,0 +1,274 @@
+"""Validation and enqueueing of quiz submissions.
+
+Shared by submit_quiz and submit_quizzes so a submission is accepted, and
+queued for the scoring Lambda, the same way whichever endpoint it arrives
+through.
+
+Submissions are checked in two steps. ``submission_message`` checks
+everything that does not depend on the quiz: required fields, canonical
+question indices, answer length and TimeTaken values. ``check_answers``
+then checks the answers against the quiz's ``QuizShape``, read with a
+projection of QUIZ_SHAPE_PROJECTION rather than the full item, so
+submissions that could never be scored are turned away before they cost an
+SQS message, a scoring invocation and a UserSubmissions write. Shapes are
+kept in ``quiz_shape_cache`` across warm invocations.
+"""
+import json
+import math
+import os
+import uuid
+from collections import namedtuple
+
+from quiz_common.cache import TTLCache
+from quiz_common.dynamodb import item_from_wire
+from quiz_common.retries import BATCH_MAX_ATTEMPTS, backoff
+from quiz_common.submission_history import submitted_at
+
+SUBMISSION_QUEUE_NAME = 'QuizSubmissionQueue'
+QUIZZES_TABLE_NAME = 'Quizzes'
+SUBMISSION_MAX_BYTES = int(os.environ.get('SUBMISSION_MAX_BYTES', '65536'))
+ANSWER_MAX_CHARS = int(os.environ.get('ANSWER_MAX_CHARS', '1000'))
+EMAIL_MAX_CHARS = 254
+
+# Attributes read to check a submission, instead of the whole quiz item
+QUIZ_SHAPE_PROJECTION = 'QuizID, QuestionCount'
+# question_count is None if the item has neither QuestionCount nor Questions
+QuizShape = namedtuple('QuizShape', ('question_count',))
+# BatchGetItem takes at most 100 keys
+BATCH_GET_MAX_KEYS = 100
+
+QUIZ_CACHE_TTL_SECONDS = float(os.environ.get('QUIZ_CACHE_TTL_SECONDS', '300'))
+QUIZ_CACHE_NEGATIVE_TTL_SECONDS = float(os.environ.get('QUIZ_CACHE_NEGATIVE_TTL_SECONDS', '5'))
+QUIZ_CACHE_MAX_ENTRIES = int(os.environ.get('QUIZ_CACHE_MAX_ENTRIES', '256'))
+
+# QuizShape of recently submitted quizzes, False for unknown QuizIDs,
+# shared by warm invocations
+quiz_shape_cache = TTLCache(QUIZ_CACHE_MAX_ENTRIES, QUIZ_CACHE_TTL_SECONDS)
+
+# Passed in by the CDK stack, otherwise looked up once per container
+_queue_url = os.environ.get('SUBMISSION_QUEUE_URL')
+
+
+def submission_queue_url(sqs):
+    """Return the URL of the submission queue, resolving it on first use only."""
+    global _queue_url
+    if _queue_url is None:
+        _queue_url = sqs.get_queue_url(QueueName=SUBMISSION_QUEUE_NAME)['QueueUrl']
+    return _queue_url
+
+
+def _unique_keys(pairs):
+    result = {}
+    for key, value in pairs:
+        if key in result:
+            raise ValueError(f"Duplicate key {key!r}")
+        result[key] = value
+    return result
+
+
+def loads_submissions(body):
+    """Parse a request body, rejecting objects that repeat a key.
+
+    json.loads would silently keep the last of two answers to a question.
+    """
+    return json.loads(body, object_pairs_hook=_unique_keys)
+
+
+class _KeyValuePairs(list):
+    """A JSON object as parsed, before its keys are checked."""
+
+
+def loads_submission_batch(body):
+    """Parse a JSON array of submissions without checking for repeated keys yet.
+
+    ``unique_keys`` checks each submission on its own, so one submission that
+    repeats a key does not reject the whole batch.
+    """
+    submissions = json.loads(body, object_pairs_hook=_KeyValuePairs)
+    if not isinstance(submissions, list) or isinstance(submissions, _KeyValuePairs):
+        raise TypeError('Body must be a JSON array of submissions')
+    return submissions
+
+
+def unique_keys(value):
+    """Turn a value from ``loads_submission_batch`` into plain dicts, rejecting objects that repeat a key."""
+    if isinstance(value, _KeyValuePairs):
+        return _unique_keys((key, unique_keys(item)) for key, item in value)
+    if isinstance(value, list):
+        return [unique_keys(item) for item in value]
+    return value
+
+
+def quiz_shape(item):
+    """Return the ``QuizShape`` of a Quizzes item read with QUIZ_SHAPE_PROJECTION."""
+    if 'QuestionCount' in item:
+        question_count = int(item['QuestionCount'])
+    elif 'Questions' in item:
+        question_count = len(item['Questions'])
+    else:
+        question_count = None
+    return QuizShape(question_count)
+
+
+def _wire_quiz_shape(dynamodb, quiz_id, item):
+    """Return the ``QuizShape`` of a wire-format item read with QUIZ_SHAPE_PROJECTION, False if there is none."""
+    if item is None:
+        return False
+    if 'QuestionCount' not in item:
+        # Quizzes created before QuestionCount was stored are counted once
+        response = dynamodb.get_item(
+            TableName=QUIZZES_TABLE_NAME, Key={'QuizID': {'S': quiz_id}}, ProjectionExpression='Questions'
+        )
+        item = dict(item, **response.get('Item', {}))
+    return quiz_shape(item_from_wire(item))
+
+
+def _cache_shape(quiz_id, shape):
+    # Unknown QuizIDs are only remembered briefly, in case the quiz is still
+    # on its way through the create retry path
+    quiz_shape_cache.put(quiz_id, shape, ttl_seconds=None if shape else QUIZ_CACHE_NEGATIVE_TTL_SECONDS)
+
+
+def load_quiz_shape(dynamodb, quiz_id):
+    """Return the ``QuizShape`` of a quiz, or False if it does not exist.
+
+    ``dynamodb`` is a low-level client. Raises if the quiz cannot be read.
+    """
+    shape = quiz_shape_cache.get(quiz_id)
+    if shape is None:
+        item = dynamodb.get_item(
+            TableName=QUIZZES_TABLE_NAME, Key={'QuizID': {'S': quiz_id}}, ProjectionExpression=QUIZ_SHAPE_PROJECTION
+        ).get('Item')
+        shape = _wire_quiz_shape(dynamodb, quiz_id, item)
+        _cache_shape(quiz_id, shape)
+        print(f"Quiz cache miss for {quiz_id}: {quiz_shape_cache.stats()}")
+    return shape
+
+
+def _batch_get_shape_items(dynamodb, quiz_ids):
+    """Return {QuizID: wire item} for those of ``quiz_ids`` (at most 100) that exist."""
+    items = {}
+    request_items = {
+        QUIZZES_TABLE_NAME: {
+            'Keys': [{'QuizID': {'S': quiz_id}} for quiz_id in quiz_ids],
+            'ProjectionExpression': QUIZ_SHAPE_PROJECTION,
+        }
+    }
+    attempt = 0
+    while request_items:
+        if attempt:
+            if attempt >= BATCH_MAX_ATTEMPTS:
+                raise RuntimeError(f"Unprocessed keys after {attempt} attempts")
+            backoff(attempt)
+        response = dynamodb.batch_get_item(RequestItems=request_items)
+        for item in response.get('Responses', {}).get(QUIZZES_TABLE_NAME, []):
+            items[item['QuizID']['S']] = item
+        request_items = response.get('UnprocessedKeys') or {}
+        attempt += 1
+    return items
+
+
+def load_quiz_shapes(dynamodb, quiz_ids):
+    """Map each of the distinct ``quiz_ids`` to its QuizShape, False, or the exception that prevented the check.
+
+    Like ``load_quiz_shape``, for many quizzes at once: the quizzes that are
+    not cached are read with BatchGetItem, up to 100 per call.
+    """
+    results = {}
+    missing = []
+    for quiz_id in quiz_ids:
+        shape = quiz_shape_cache.get(quiz_id)
+        if shape is None:
+            missing.append(quiz_id)
+        else:
+            results[quiz_id] = shape
+    if not missing:
+        return results
+
+    for start in range(0, len(missing), BATCH_GET_MAX_KEYS):
+        chunk = missing[start:start + BATCH_GET_MAX_KEYS]
+        try:
+            items = _batch_get_shape_items(dynamodb, chunk)
+            shapes = {quiz_id: _wire_quiz_shape(dynamodb, quiz_id, items.get(quiz_id)) for quiz_id in chunk}
+        except Exception as e:
+            print(f"Error checking quizzes: {e}")
+            results.update((quiz_id, e) for quiz_id in chunk)
+            continue
+        for quiz_id, shape in shapes.items():
+            _cache_shape(quiz_id, shape)
+            results[quiz_id] = shape
+    print(f"Checked {len(missing)} quizzes: {quiz_shape_cache.stats()}")
+    return results
+
+
+def _time_taken(question_idx, value):
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise TypeError(f"TimeTaken for question {question_idx} must be a number")
+    time_taken = float(value)
+    if not math.isfinite(time_taken) or time_taken < 0:
+        raise ValueError(f"TimeTaken for question {question_idx} must be non-negative")
+    return time_taken
+
+
+def submission_message(submission):
+    """Validate a submission and return the message to queue for scoring.
+
+    Answers are reduced to the ``Answer`` and ``TimeTaken`` that scoring
+    reads. Raises KeyError, TypeError or ValueError for invalid input.
+    """
+    if not isinstance(submission, dict):
+        raise TypeError('Submission must be a JSON object')
+    username = submission['Username']
+    quiz_id = submission['QuizID']
+    answers = submission['Answers']
+    email = submission.get('Email')
+
+    if not username or not quiz_id or not answers:
+        raise ValueError("Username, QuizID, and Answers are required.")
+    if not isinstance(username, str) or not isinstance(quiz_id, str):
+        raise TypeError('Username and QuizID must be strings')
+    if not isinstance(answers, dict):
+        raise TypeError('Answers must be a JSON object')
+    if email is not None and (not isinstance(email, str) or len(email) > EMAIL_MAX_CHARS):
+        raise ValueError(f"Email must be a string of at most {EMAIL_MAX_CHARS} characters")
+
+    message_answers = {}
+    for question_idx, answer_data in answers.items():
+        # "01" and "1" would be two answers to the same question
+        if not (question_idx.isascii() and question_idx.isdigit()) or question_idx != str(int(question_idx)):
+            raise ValueError(f"Invalid question index {question_idx!r}")
+        if not isinstance(answer_data, dict) or 'Answer' not in answer_data or 'TimeTaken' not in answer_data:
+            raise ValueError(f"Answer for question {question_idx} must include 'Answer' and 'TimeTaken'")
+        answer = answer_data['Answer']
+        if not isinstance(answer, str):
+            raise TypeError(f"Answer for question {question_idx} must be a string")
+        if len(answer) > ANSWER_MAX_CHARS:
+            raise ValueError(f"Answer for question {question_idx} is longer than {ANSWER_MAX_CHARS} characters")
+        _time_taken(question_idx, answer_data['TimeTaken'])
+        message_answers[question_idx] = {'Answer': answer, 'TimeTaken': answer_data['TimeTaken']}
+
+    message_body = {
+        'SubmissionID': str(uuid.uuid4()),
+        'Username': username,
+        'QuizID': quiz_id,
+        'Answers': message_answers,
+        'SubmittedAt': submitted_at(),
+    }
+    if email:
+        message_body['Email'] = email
+    return message_body
+
+
+def check_answers(answers, shape):
+    """Check the answers of a ``submission_message`` against the quiz they are for.
+
+    Raises ValueError for answers to questions the quiz does not have.
+    Answers given after the timer ran out are accepted; scoring gives them
+    no points.
+    """
+    if shape.question_count is not None:
+        for question_idx in answers:
+            if int(question_idx) >= shape.question_count:
+                raise ValueError(
+                    f"Question {question_idx} is out of range, the quiz has {shape.question_count} questions"
+                )
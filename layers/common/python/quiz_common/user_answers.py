@@ -0,0 +1,117 @@
+"""Compact binary encoding of the UserAnswers stored in UserSubmissions.
+
+Every submission is written to the table and again to the QuizID-Score-index
+GSI, which projects all attributes, so the size of ``UserAnswers`` is paid
+twice in WCUs. Instead of a map of ``{"0": {"Answer": .., "TimeTaken": ..}}``
+scoring stores a binary value, little-endian:
+
+- version byte (``FORMAT_VERSION``)
+- the distinct answer strings: a uint16 count, then a uint16 byte length and
+  the UTF-8 bytes of each
+- the answers: a uint16 count, then packed arrays of uint16 question indices,
+  uint16 indices into the strings and uint32 times in milliseconds
+
+Answers are indices into this per-item string table, not option indices
+into the quiz: those would need the quiz's options on every read, and the
+questions of large quizzes live in S3, so a submission expands without
+reading its quiz. TimeTaken is rounded to the nearest millisecond, so finer
+precision in a submitted time is lost. Submissions that do not fit the format
+are stored as the plain map, with numbers as Decimal, and both forms are read
+back the same way.
+"""
+import json
+import struct
+from decimal import ROUND_HALF_EVEN, Decimal
+
+FORMAT_VERSION = 1
+_UINT16_MAX = 0xFFFF
+_UINT32_MAX = 0xFFFFFFFF
+_HEADER = struct.Struct('<BH')
+_COUNT = struct.Struct('<H')
+
+
+def _milliseconds(time_taken):
+    if isinstance(time_taken, bool):
+        raise TypeError('TimeTaken must be a number')
+    milliseconds = int((Decimal(str(time_taken)) * 1000).to_integral_value(ROUND_HALF_EVEN))
+    if not 0 <= milliseconds <= _UINT32_MAX:
+        raise ValueError(f"TimeTaken {time_taken} does not fit the packed format")
+    return milliseconds
+
+
+def pack_user_answers(user_answers):
+    """Pack a UserAnswers map into bytes.
+
+    Raises TypeError or ValueError if the answers do not fit the format.
+    """
+    strings = {}
+    questions, string_indices, times = [], [], []
+    for question_idx, answer_data in user_answers.items():
+        question = int(question_idx)
+        if not 0 <= question <= _UINT16_MAX or str(question) != question_idx:
+            raise ValueError(f"Question index {question_idx!r} does not fit the packed format")
+        answer = answer_data['Answer']
+        if not isinstance(answer, str):
+            raise TypeError(f"Answer for question {question_idx} must be a string")
+        questions.append(question)
+        string_indices.append(strings.setdefault(answer, len(strings)))
+        times.append(_milliseconds(answer_data['TimeTaken']))
+    if len(strings) > _UINT16_MAX or len(questions) > _UINT16_MAX:
+        raise ValueError('Too many answers for the packed format')
+
+    parts = [_HEADER.pack(FORMAT_VERSION, len(strings))]
+    for answer in strings:
+        encoded = answer.encode('utf-8')
+        if len(encoded) > _UINT16_MAX:
+            raise ValueError('Answer is too long for the packed format')
+        parts.append(_COUNT.pack(len(encoded)))
+        parts.append(encoded)
+    count = len(questions)
+    parts.append(struct.pack(f'<H{count}H{count}H{count}I', count, *questions, *string_indices, *times))
+    return b''.join(parts)
+
+
+def unpack_user_answers(data):
+    """Expand bytes from ``pack_user_answers`` into the UserAnswers map, with Decimal times."""
+    data = bytes(data)
+    version, string_count = _HEADER.unpack_from(data)
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unknown UserAnswers format version {version}")
+    offset = _HEADER.size
+    strings = []
+    for _ in range(string_count):
+        length, = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+        strings.append(data[offset:offset + length].decode('utf-8'))
+        offset += length
+    count, = _COUNT.unpack_from(data, offset)
+    values = struct.unpack_from(f'<{count}H{count}H{count}I', data, offset + _COUNT.size)
+    questions, string_indices, times = values[:count], values[count:2 * count], values[2 * count:]
+    return {
+        str(question): {'Answer': strings[string_idx], 'TimeTaken': Decimal(milliseconds) / 1000}
+        for question, string_idx, milliseconds in zip(questions, string_indices, times)
+    }
+
+
+def stored_user_answers(user_answers):
+    """Return the value scoring stores as UserAnswers: packed bytes, or the map if they do not fit.
+
+    The map comes from a JSON message, so it is re-read with Decimal numbers,
+    which unlike floats the boto3 serializer accepts.
+    """
+    try:
+        return pack_user_answers(user_answers)
+    except (KeyError, TypeError, ValueError) as e:
+        print(f"Storing UserAnswers unpacked: {e}")
+        return json.loads(json.dumps(user_answers), parse_float=Decimal)
+
+
+def user_answers_to_wire(data):
+    """Expand packed UserAnswers into a wire-format map attribute value."""
+    return {'M': {
+        question_idx: {'M': {
+            'Answer': {'S': answer_data['Answer']},
+            'TimeTaken': {'N': str(answer_data['TimeTaken'])},
+        }}
+        for question_idx, answer_data in unpack_user_answers(data).items()
+    }}
@@ -0,0 +1,34 @@
+"""Response encoding benchmarks for large quizzes.
+
+Compares the shared single-pass encoder with the convert_decimal + json.dumps
+approach that get_quiz and get_submission used before.
+"""
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from quiz_common.dynamodb import item_from_wire
+from quiz_common.encoding import encode_item, encode_wire_item
+from tests.test_encoding_unit import legacy_encode_quiz, make_quiz, to_wire
+
+
+@pytest.mark.parametrize('num_questions', [100, 500])
+def test_benchmark_legacy_two_pass(benchmark, num_questions):
+    wire = to_wire(make_quiz(num_questions))
+    benchmark.group = f'encode-{num_questions}-questions'
+    # Includes the wire-to-Python conversion the legacy path needs on the low-level client
+    benchmark(lambda: legacy_encode_quiz(item_from_wire(wire)))
+
+
+@pytest.mark.parametrize('num_questions', [100, 500])
+def test_benchmark_encode_item(benchmark, num_questions):
+    quiz = make_quiz(num_questions)
+    benchmark.group = f'encode-{num_questions}-questions'
+    benchmark(encode_item, quiz, ('CorrectAnswer',))
+
+
+@pytest.mark.parametrize('num_questions', [100, 500])
+def test_benchmark_encode_wire_item(benchmark, num_questions):
+    wire = to_wire(make_quiz(num_questions))
+    benchmark.group = f'encode-{num_questions}-questions'
+    benchmark(encode_wire_item, wire, ('CorrectAnswer',))
@@ -0,0 +1,239 @@
+"""How fast the create-quiz retry path drains after a DynamoDB outage.
+
+A LocalStack chaos ``FaultRule`` takes DynamoDB down while thousands of
+``createquiz`` requests are fired concurrently, so every quiz ends up on the
+QuizzesWriteFailures topic and its queue. The retry event source mapping is
+disabled for the duration of the outage, so the backlog is the same for
+every run, then re-enabled with the settings under test once the fault is
+lifted. For each setting the run records:
+
+- the backlog on the queue when the fault is lifted,
+- the drain time, from lifting the fault until every queued quiz is stored,
+- time-to-durable per quiz, from its createquiz request until it is stored
+  (p50/p99/max, at ``POLL_INTERVAL_SECONDS`` resolution).
+
+Results are printed and written as JSON to ``OUTAGE_BENCHMARK_REPORT`` so
+runs can be compared between commits.
+
+Run with ``pytest -s tests/benchmarks/test_outage_recovery_benchmark.py``
+while LocalStack is running and the app is deployed with ``bin/deploy.sh``.
+``OUTAGE_BENCHMARK_QUIZZES`` and ``OUTAGE_BENCHMARK_CLIENTS`` size the burst.
+"""
+import json
+import os
+import statistics
+import time
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+LOCALSTACK_ENDPOINT = os.environ.get('LOCALSTACK_ENDPOINT', 'http://localhost.localstack.cloud:4566')
+API_NAME = 'QuizAPI'
+STAGE_NAME = 'prod'
+RETRY_FUNCTION_NAME = 'RetryQuizzesWritesFunction'
+WRITE_FAILURES_QUEUE_NAME = 'QuizzesWriteFailuresQueue'
+
+QUIZZES = int(os.environ.get('OUTAGE_BENCHMARK_QUIZZES', '2000'))
+CLIENTS = int(os.environ.get('OUTAGE_BENCHMARK_CLIENTS', '50'))
+REPORT_PATH = os.environ.get('OUTAGE_BENCHMARK_REPORT', 'outage-recovery-benchmark.json')
+POLL_INTERVAL_SECONDS = 0.5
+BACKLOG_SETTLE_SECONDS = 60
+DRAIN_TIMEOUT_SECONDS = 900
+
+# Settings of the retry event source mapping; SQS only takes batches over
+# 10 with a batching window, and a MaximumConcurrency of at least 2
+RETRY_SETTINGS = [
+    {'BatchSize': 10, 'MaximumBatchingWindowInSeconds': 0, 'MaximumConcurrency': 2},
+    {'BatchSize': 10, 'MaximumBatchingWindowInSeconds': 0, 'MaximumConcurrency': 10},
+    {'BatchSize': 100, 'MaximumBatchingWindowInSeconds': 1, 'MaximumConcurrency': 10},
+]
+
+
+def _localstack_available():
+    try:
+        with urllib.request.urlopen(f"{LOCALSTACK_ENDPOINT}/_localstack/health", timeout=1):
+            return True
+    except Exception:
+        return False
+
+
+pytestmark = pytest.mark.skipif(not _localstack_available(), reason='LocalStack is not running')
+
+_report = []
+
+
+@pytest.fixture(scope='module')
+def aws():
+    for key, value in (
+        ('AWS_ENDPOINT_URL', LOCALSTACK_ENDPOINT),
+        ('AWS_DEFAULT_REGION', 'us-east-1'),
+        ('AWS_ACCESS_KEY_ID', 'test'),
+        ('AWS_SECRET_ACCESS_KEY', 'test'),
+    ):
+        os.environ.setdefault(key, value)
+
+    from quiz_common import clients
+
+    return clients
+
+
+@pytest.fixture(scope='module')
+def api_endpoint(aws):
+    api_list = aws.client('apigateway').get_rest_apis().get('items', [])
+    api = next((item for item in api_list if item['name'] == API_NAME), None)
+    if not api:
+        pytest.skip(f"API {API_NAME} is not deployed")
+    return f"{LOCALSTACK_ENDPOINT}/_aws/execute-api/{api['id']}/{STAGE_NAME}"
+
+
+@pytest.fixture(scope='module')
+def retry_mapping(aws):
+    """Yield the UUID of the retry event source mapping, restoring its settings afterwards."""
+    lambda_client = aws.client('lambda')
+    mappings = lambda_client.list_event_source_mappings(FunctionName=RETRY_FUNCTION_NAME)['EventSourceMappings']
+    if not mappings:
+        pytest.skip(f"{RETRY_FUNCTION_NAME} has no event source mapping")
+    mapping = mappings[0]
+    yield mapping['UUID']
+
+    lambda_client.update_event_source_mapping(
+        UUID=mapping['UUID'],
+        Enabled=True,
+        BatchSize=mapping['BatchSize'],
+        MaximumBatchingWindowInSeconds=mapping.get('MaximumBatchingWindowInSeconds', 0),
+        ScalingConfig=mapping.get('ScalingConfig', {}),
+    )
+    with open(REPORT_PATH, 'w') as report:
+        json.dump({'quizzes': QUIZZES, 'clients': CLIENTS, 'runs': _report}, report, indent=2)
+    print(f"Wrote outage recovery report to {REPORT_PATH}")
+
+
+def _set_mapping(lambda_client, uuid_, enabled, settings=None):
+    kwargs = {'UUID': uuid_, 'Enabled': enabled}
+    if settings:
+        kwargs.update(
+            BatchSize=settings['BatchSize'],
+            MaximumBatchingWindowInSeconds=settings['MaximumBatchingWindowInSeconds'],
+            ScalingConfig={'MaximumConcurrency': settings['MaximumConcurrency']},
+        )
+    lambda_client.update_event_source_mapping(**kwargs)
+    # Wait for the update to be picked up before measuring anything
+    deadline = time.monotonic() + 30
+    wanted = 'Enabled' if enabled else 'Disabled'
+    while lambda_client.get_event_source_mapping(UUID=uuid_)['State'] != wanted:
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"Event source mapping did not become {wanted}")
+        time.sleep(POLL_INTERVAL_SECONDS)
+
+
+def _create_quiz(api_endpoint, title):
+    payload = json.dumps({
+        'Title': title,
+        'Visibility': 'Private',
+        'EnableTimer': False,
+        'Questions': [{
+            'QuestionText': 'What is the capital of Italy?',
+            'Options': ['A. Milan', 'B. Rome', 'C. Naples', 'D. Turin'],
+            'CorrectAnswer': 'B. Rome',
+            'Trivia': 'Rome has been a capital for over two millennia.',
+        }],
+    }).encode('utf-8')
+    request = urllib.request.Request(
+        f"{api_endpoint}/createquiz", data=payload, headers={'Content-Type': 'application/json'}, method='POST'
+    )
+    sent_at = time.monotonic()
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            status, body = response.status, response.read()
+    except urllib.error.HTTPError as e:
+        status, body = e.code, e.read()
+    try:
+        quiz_id = json.loads(body).get('QuizID')
+    except ValueError:
+        quiz_id = None
+    return sent_at, status, quiz_id
+
+
+def _queue_depth(sqs, queue_url):
+    attributes = sqs.get_queue_attributes(
+        QueueUrl=queue_url,
+        AttributeNames=['ApproximateNumberOfMessages', 'ApproximateNumberOfMessagesNotVisible'],
+    )['Attributes']
+    return int(attributes['ApproximateNumberOfMessages']) + int(attributes['ApproximateNumberOfMessagesNotVisible'])
+
+
+def _stored(dynamodb, quiz_ids):
+    """Return which of ``quiz_ids`` (at most 100) are in the Quizzes table."""
+    stored = set()
+    request_items = {'Quizzes': {'Keys': [{'QuizID': {'S': quiz_id}} for quiz_id in quiz_ids],
+                                 'ProjectionExpression': 'QuizID'}}
+    while request_items:
+        response = dynamodb.batch_get_item(RequestItems=request_items)
+        stored.update(item['QuizID']['S'] for item in response.get('Responses', {}).get('Quizzes', []))
+        request_items = response.get('UnprocessedKeys') or {}
+    return stored
+
+
+def _percentiles(samples):
+    cuts = statistics.quantiles(samples, n=100) if len(samples) > 1 else samples * 99
+    return {'p50_s': statistics.median(samples), 'p99_s': cuts[98], 'max_s': max(samples)}
+
+
+@pytest.mark.parametrize('settings', RETRY_SETTINGS, ids=lambda s: '-'.join(f"{v}" for v in s.values()))
+def test_outage_recovery(aws, api_endpoint, retry_mapping, settings):
+    from localstack.sdk.chaos.managers import fault_configuration
+    from localstack.sdk.models import FaultRule
+
+    lambda_client = aws.client('lambda')
+    sqs = aws.client('sqs')
+    dynamodb = aws.client('dynamodb')
+    queue_url = sqs.get_queue_url(QueueName=WRITE_FAILURES_QUEUE_NAME)['QueueUrl']
+    run_id = uuid.uuid4().hex[:8]
+
+    _set_mapping(lambda_client, retry_mapping, enabled=False)
+    with fault_configuration(fault_rules=[FaultRule(region='us-east-1', service='dynamodb')]):
+        time.sleep(2)
+        with ThreadPoolExecutor(max_workers=CLIENTS) as executor:
+            results = list(executor.map(
+                lambda idx: _create_quiz(api_endpoint, f"Outage Recovery {run_id} {idx}"), range(QUIZZES)
+            ))
+        queued = {quiz_id: sent_at for sent_at, status, quiz_id in results if status == 500 and quiz_id}
+        # Wait for SNS to deliver every queued quiz to the queue
+        deadline = time.monotonic() + BACKLOG_SETTLE_SECONDS
+        backlog = _queue_depth(sqs, queue_url)
+        while backlog < len(queued) and time.monotonic() < deadline:
+            time.sleep(POLL_INTERVAL_SECONDS)
+            backlog = _queue_depth(sqs, queue_url)
+
+    lifted_at = time.monotonic()
+    _set_mapping(lambda_client, retry_mapping, enabled=True, settings=settings)
+
+    durable_at = {}
+    pending = list(queued)
+    deadline = lifted_at + DRAIN_TIMEOUT_SECONDS
+    while pending and time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL_SECONDS)
+        for start in range(0, len(pending), 100):
+            now = time.monotonic()
+            for quiz_id in _stored(dynamodb, pending[start:start + 100]):
+                durable_at[quiz_id] = now
+        pending = [quiz_id for quiz_id in pending if quiz_id not in durable_at]
+
+    time_to_durable = [durable_at[quiz_id] - queued[quiz_id] for quiz_id in durable_at]
+    run = {
+        'settings': settings,
+        'requests': len(results),
+        'queued': len(queued),
+        'rejected': sum(1 for _, status, quiz_id in results if not (status == 500 and quiz_id)),
+        'backlog': backlog,
+        'drained': len(durable_at),
+        'lost': len(pending),
+        'drain_time_s': max(durable_at.values()) - lifted_at if durable_at else None,
+        'time_to_durable': _percentiles(time_to_durable) if time_to_durable else None,
+    }
+    _report.append(run)
+    print(json.dumps(run))
+    assert queued, 'No quiz was queued for retry during the outage'
+    assert not pending, f"{len(pending)} queued quizzes were not stored after {DRAIN_TIMEOUT_SECONDS}s"
@@ -0,0 +1,56 @@
+"""QuizID allocation throughput and collision rate benchmarks.
+
+Run with ``pytest tests/benchmarks -k quiz_id --benchmark-columns=min,mean,ops``.
+Each round allocates one ID against a table that already holds
+``existing`` quizzes, going through conditional-put retries exactly like
+create_quiz. The measured first-attempt collision rate and the number of
+allocations that needed more than one attempt are stored in the benchmark's
+``extra_info`` (visible with ``--benchmark-json``).
+"""
+import random
+
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from quiz_common.quiz_ids import candidate_quiz_ids, generate_quiz_id, id_space_size
+
+ALLOCATIONS = 10_000
+
+
+def _existing_ids(count):
+    rng = random.Random(count)
+    existing = set()
+    while len(existing) < min(count, id_space_size(0)):
+        existing.add(generate_quiz_id(0, rng))
+    return existing
+
+
+@pytest.fixture(scope='module', params=[10_000, 100_000, 1_000_000], ids=lambda n: f'{n}-existing')
+def existing(request):
+    return _existing_ids(request.param)
+
+
+def _allocate(existing, suffix_digits, rng):
+    """Allocate one ID the way create_quiz does; return the attempts it took."""
+    for attempt, quiz_id in enumerate(candidate_quiz_ids(suffix_digits=suffix_digits, rng=rng), 1):
+        if quiz_id not in existing:
+            return attempt
+    raise AssertionError('QuizID allocation exhausted its attempts')
+
+
+@pytest.mark.parametrize('suffix_digits', [0, 3])
+def test_benchmark_quiz_id_allocation(benchmark, existing, suffix_digits):
+    rng = random.Random(suffix_digits)
+    benchmark.group = f'quiz-id-allocation-{len(existing)}-existing'
+    benchmark(_allocate, existing, suffix_digits, rng)
+
+    attempts = [_allocate(existing, suffix_digits, rng) for _ in range(ALLOCATIONS)]
+    retried = sum(1 for count in attempts if count > 1)
+    benchmark.extra_info['first_attempt_collision_rate'] = retried / ALLOCATIONS
+    benchmark.extra_info['max_attempts'] = max(attempts)
+    # Without a suffix the first attempt collides at roughly the table's fill
+    # ratio; retries carry a suffix, so a second collision is very unlikely
+    expected = len(existing) / id_space_size(suffix_digits)
+    assert retried / ALLOCATIONS == pytest.approx(expected, abs=0.02)
+    assert max(attempts) <= 2
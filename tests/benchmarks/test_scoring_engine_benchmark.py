@@ -0,0 +1,46 @@
+"""Scoring throughput benchmarks.
+
+Run with ``pytest tests/benchmarks --benchmark-columns=min,mean,ops``; the
+``ops`` column is submissions scored per second.
+"""
+import random
+
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from scoring_engine import compile_answer_key
+from tests.test_scoring_unit import _legacy_score
+
+
+def _quiz_and_submission(num_questions, timer_seconds=30):
+    rng = random.Random(num_questions)
+    quiz = {
+        'EnableTimer': True,
+        'TimerSeconds': timer_seconds,
+        'Questions': [
+            {'CorrectAnswer': f"{rng.choice('ABCD')}. Option"} for _ in range(num_questions)
+        ],
+    }
+    answers = {
+        str(idx): {
+            'Answer': f"{rng.choice('ABCD')}. Option",
+            'TimeTaken': rng.randint(0, timer_seconds),
+        } for idx in range(num_questions)
+    }
+    return quiz, answers
+
+
+@pytest.mark.parametrize('num_questions', [10, 100, 1000])
+def test_benchmark_compiled_engine(benchmark, num_questions):
+    quiz, answers = _quiz_and_submission(num_questions)
+    answer_key = compile_answer_key(quiz)
+    benchmark.group = f'score-{num_questions}-questions'
+    benchmark(answer_key.score, answers)
+
+
+@pytest.mark.parametrize('num_questions', [10, 100, 1000])
+def test_benchmark_legacy_decimal_loop(benchmark, num_questions):
+    quiz, answers = _quiz_and_submission(num_questions)
+    benchmark.group = f'score-{num_questions}-questions'
+    benchmark(_legacy_score, quiz, answers)
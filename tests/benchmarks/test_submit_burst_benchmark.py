@@ -0,0 +1,115 @@
+"""submit_quiz latency during a burst of 500 submissions per second.
+
+The handler runs in-process against fakes that sleep for every AWS round
+trip (``SIMULATED_ROUND_TRIP_MS``, 1 ms by default). A second of a burst,
+500 submissions spread over a handful of popular quizzes plus a few unknown
+QuizIDs, is replayed twice: once the way submit_quiz used to work, looking up
+the queue URL and the quiz on every request, and once with the per-container
+queue URL and quiz existence cache. Round trips per submission and p50/p99
+latency are printed as JSON.
+
+Run with ``pytest -s tests/benchmarks/test_submit_burst_benchmark.py``.
+"""
+import json
+import os
+import random
+import statistics
+import time
+
+BURST_SUBMISSIONS = 500
+POPULAR_QUIZZES = 20
+UNKNOWN_QUIZ_RATIO = 0.02
+SIMULATED_ROUND_TRIP_MS = float(os.environ.get('SIMULATED_ROUND_TRIP_MS', '1'))
+
+
+class _RoundTrips:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self):
+        self.count += 1
+        time.sleep(SIMULATED_ROUND_TRIP_MS / 1000)
+
+
+class _FakeDynamoDB:
+    def __init__(self, quiz_ids, round_trip):
+        self.quiz_ids = quiz_ids
+        self.round_trip = round_trip
+
+    def get_item(self, TableName, Key, ProjectionExpression=None):
+        self.round_trip()
+        quiz_id = Key['QuizID']['S']
+        return {'Item': {'QuizID': {'S': quiz_id}, 'QuestionCount': {'N': '10'}}} if quiz_id in self.quiz_ids else {}
+
+
+class _FakeSQS:
+    def __init__(self, round_trip):
+        self.round_trip = round_trip
+
+    def get_queue_url(self, QueueName):
+        self.round_trip()
+        return {'QueueUrl': f'https://sqs.local/{QueueName}'}
+
+    def send_message(self, QueueUrl, MessageBody):
+        self.round_trip()
+
+
+class _FakeClients:
+    def __init__(self, dynamodb, sqs):
+        self.services = {'dynamodb': dynamodb, 'sqs': sqs}
+
+    def client(self, service_name):
+        return self.services[service_name]
+
+
+def _burst_events():
+    rng = random.Random(500)
+    events = []
+    for idx in range(BURST_SUBMISSIONS):
+        if rng.random() < UNKNOWN_QUIZ_RATIO:
+            quiz_id = f'unknown-{rng.randrange(5)}'
+        else:
+            quiz_id = f'quiz-{rng.randrange(POPULAR_QUIZZES)}'
+        events.append({'body': json.dumps({
+            'Username': f'user{idx}',
+            'QuizID': quiz_id,
+            'Answers': {'0': {'Answer': 'A', 'TimeTaken': 3}},
+        })})
+    return events
+
+
+def _replay(monkeypatch, cached):
+    from lambdas.submit_quiz import handler as sqh
+    from quiz_common import submissions
+
+    round_trips = _RoundTrips()
+    dynamodb = _FakeDynamoDB({f'quiz-{idx}' for idx in range(POPULAR_QUIZZES)}, round_trips)
+    monkeypatch.setattr(sqh, 'clients', _FakeClients(dynamodb, _FakeSQS(round_trips)), raising=False)
+    monkeypatch.setattr(submissions, '_queue_url', None)
+    submissions.quiz_shape_cache.clear()
+
+    samples = []
+    for event in _burst_events():
+        if not cached:
+            submissions.quiz_shape_cache.clear()
+            submissions._queue_url = None
+        start = time.perf_counter()
+        response = sqh.lambda_handler(event, None)
+        samples.append(time.perf_counter() - start)
+        assert response['statusCode'] in (200, 400), response
+    cuts = statistics.quantiles(samples, n=100)
+    return {
+        'round_trips_per_submission': round_trips.count / BURST_SUBMISSIONS,
+        'p50_ms': statistics.median(samples) * 1000,
+        'p99_ms': cuts[98] * 1000,
+    }
+
+
+def test_submit_burst_latency(monkeypatch):
+    uncached = _replay(monkeypatch, cached=False)
+    cached = _replay(monkeypatch, cached=True)
+    print(json.dumps({'uncached': uncached, 'cached': cached}))
+
+    assert cached['round_trips_per_submission'] < 1.1
+    assert uncached['round_trips_per_submission'] > 2.9
+    assert cached['p50_ms'] < uncached['p50_ms']
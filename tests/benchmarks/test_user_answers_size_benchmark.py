@@ -0,0 +1,69 @@
+"""Size of a scored UserSubmissions item with UserAnswers as a map and packed.
+
+Items are sized with the DynamoDB sizing rules (``quiz_common.dynamodb.item_size``)
+for quizzes of different lengths. Write units count the table and the
+QuizID-Score-index GSI, which projects all attributes. Results are printed as
+JSON; packing and expanding speed is measured when pytest-benchmark is available.
+
+Run with ``pytest -s tests/benchmarks/test_user_answers_size_benchmark.py``.
+"""
+import json
+import math
+import random
+from decimal import Decimal
+
+import pytest
+
+from quiz_common.dynamodb import item_size
+from quiz_common.user_answers import pack_user_answers, unpack_user_answers
+
+QUESTION_COUNTS = (10, 50, 200, 1000)
+# Option texts in the style of the seeded quizzes
+OPTIONS = ('Paris', 'Shakespeare', 'Jupiter', 'Oxygen', '1945', 'Madrid', 'Pacific Ocean', 'Leonardo da Vinci')
+
+
+def make_submission(num_questions):
+    rng = random.Random(num_questions)
+    user_answers = {
+        str(idx): {
+            'Answer': f"{rng.choice('ABCD')}. {rng.choice(OPTIONS)}",
+            'TimeTaken': Decimal(rng.randrange(500, 30000)) / 1000,
+        }
+        for idx in range(num_questions)
+    }
+    return {
+        'SubmissionID': '2c5cb81f-7b21-4ef0-a4a5-69f8fc359dd0',
+        'Username': 'user1',
+        'QuizID': 'brave-otters-danced',
+        'UserAnswers': user_answers,
+        'Score': Decimal('72.5'),
+        'TotalQuestions': Decimal(num_questions),
+    }
+
+
+def _write_units(size):
+    return 2 * max(1, math.ceil(size / 1024))
+
+
+@pytest.mark.parametrize('num_questions', QUESTION_COUNTS)
+def test_packed_user_answers_item_size(num_questions):
+    item = make_submission(num_questions)
+    packed = dict(item, UserAnswers=pack_user_answers(item['UserAnswers']))
+    before, after = item_size(item), item_size(packed)
+    print(json.dumps({
+        'questions': num_questions,
+        'map_bytes': before,
+        'packed_bytes': after,
+        'map_wcu': _write_units(before),
+        'packed_wcu': _write_units(after),
+    }))
+    assert after < before
+
+
+@pytest.mark.parametrize('num_questions', (50, 1000))
+def test_benchmark_unpack_user_answers(num_questions, request):
+    pytest.importorskip('pytest_benchmark')
+    benchmark = request.getfixturevalue('benchmark')
+    packed = pack_user_answers(make_submission(num_questions)['UserAnswers'])
+    benchmark.group = f'user-answers-{num_questions}-questions'
+    benchmark(unpack_user_answers, packed)
@@ -0,0 +1,114 @@
+"""Warm-invocation latency of get_quiz and submit_quiz against LocalStack.
+
+The handlers are invoked in-process against a deployed stack. The "per-invocation"
+mode drops the shared client pool before every call, which is what the handlers
+did before they moved onto quiz_common.clients; the "pooled" mode keeps it.
+The in-process quiz caches are cleared before every call in both modes, so
+each call reaches DynamoDB and only the client pool differs.
+
+Run with ``pytest -s tests/benchmarks/test_warm_invocation_latency.py`` while
+LocalStack is running and the app is deployed.
+"""
+import json
+import os
+import statistics
+import time
+import urllib.request
+import uuid
+
+import pytest
+
+LOCALSTACK_ENDPOINT = os.environ.get('LOCALSTACK_ENDPOINT', 'http://localhost.localstack.cloud:4566')
+INVOCATIONS = int(os.environ.get('BENCHMARK_INVOCATIONS', '200'))
+
+
+def _localstack_available():
+    try:
+        with urllib.request.urlopen(f"{LOCALSTACK_ENDPOINT}/_localstack/health", timeout=1):
+            return True
+    except Exception:
+        return False
+
+
+pytestmark = pytest.mark.skipif(not _localstack_available(), reason='LocalStack is not running')
+
+
+@pytest.fixture(scope='module')
+def quiz_id():
+    for key, value in (
+        ('AWS_ENDPOINT_URL', LOCALSTACK_ENDPOINT),
+        ('AWS_DEFAULT_REGION', 'us-east-1'),
+        ('AWS_ACCESS_KEY_ID', 'test'),
+        ('AWS_SECRET_ACCESS_KEY', 'test'),
+    ):
+        os.environ.setdefault(key, value)
+
+    from quiz_common import clients
+    from quiz_common.quizzes import assign_quiz_id, normalize_quiz
+
+    quiz = normalize_quiz({
+        'Title': 'Latency Benchmark Quiz',
+        'Visibility': 'Private',
+        'Questions': [
+            {
+                'QuestionText': f'Question {idx}',
+                'Options': ['A', 'B', 'C', 'D'],
+                'CorrectAnswer': 'A',
+                'Trivia': 'Benchmark data.',
+            } for idx in range(10)
+        ],
+    })
+    quiz_id = f"benchmark-{uuid.uuid4()}"
+    clients.resource('dynamodb').Table('Quizzes').put_item(Item=assign_quiz_id(quiz, quiz_id))
+    return quiz_id
+
+
+def _percentiles(samples):
+    cuts = statistics.quantiles(samples, n=100)
+    return {'p50_ms': statistics.median(samples) * 1000, 'p99_ms': cuts[98] * 1000}
+
+
+def _clear_caches(handler):
+    from quiz_common import submissions
+
+    submissions.quiz_shape_cache.clear()
+    for name in ('quiz_cache', 'question_chunk_cache'):
+        cache = getattr(handler, name, None)
+        if cache is not None:
+            cache.clear()
+
+
+def _measure(handler, event, pooled):
+    from quiz_common import clients
+
+    handler.lambda_handler(event, None)
+    samples = []
+    for _ in range(INVOCATIONS):
+        _clear_caches(handler)
+        if not pooled:
+            clients.reset()
+        start = time.perf_counter()
+        response = handler.lambda_handler(event, None)
+        samples.append(time.perf_counter() - start)
+        assert response['statusCode'] == 200, response
+    return _percentiles(samples)
+
+
+@pytest.mark.parametrize('handler_name', ['get_quiz', 'submit_quiz'])
+def test_warm_invocation_latency(quiz_id, handler_name):
+    import importlib
+
+    handler = importlib.import_module(f'lambdas.{handler_name}.handler')
+    if handler_name == 'get_quiz':
+        event = {'queryStringParameters': {'quiz_id': quiz_id}}
+    else:
+        event = {'body': json.dumps({
+            'Username': 'benchmark',
+            'QuizID': quiz_id,
+            'Answers': {'0': {'Answer': 'A', 'TimeTaken': 1}},
+        })}
+
+    before = _measure(handler, event, pooled=False)
+    after = _measure(handler, event, pooled=True)
+    print(json.dumps({'handler': handler_name, 'per_invocation': before, 'pooled': after}))
+    assert after['p50_ms'] <= before['p50_ms']
@@ -0,0 +1,14 @@
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+# The Lambda runtime puts the function directory and the python/ directory of
+# every attached layer on sys.path, so handlers import their sibling modules
+# and the shared quiz_common package as top-level modules. Mirror that here.
+_paths = [ROOT_DIR / 'layers' / 'common' / 'python']
+_paths += sorted(path for path in (ROOT_DIR / 'lambdas').iterdir() if path.is_dir())
+
+for path in _paths:
+    if str(path) not in sys.path:
+        sys.path.append(str(path))
@@ -0,0 +1,42 @@
+from quiz_common.cache import TTLCache
+
+MISSING = object()
+
+
+def test_cache_evicts_expired_and_least_recent_entries():
+    now = [0.0]
+    cache = TTLCache(max_entries=2, ttl_seconds=10, clock=lambda: now[0])
+
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+
+    now[0] = 11
+    assert cache.get('a') is None
+    assert len(cache) == 1
+
+
+def test_cache_keeps_negative_entries_for_their_own_ttl():
+    now = [0.0]
+    cache = TTLCache(max_entries=10, ttl_seconds=60, clock=lambda: now[0])
+
+    cache.put('missing', None, ttl_seconds=5)
+    assert cache.get('missing', MISSING) is None
+    now[0] = 6
+    assert cache.get('missing', MISSING) is MISSING
+
+
+def test_cache_counts_hits_and_misses():
+    cache = TTLCache(max_entries=10, ttl_seconds=60)
+
+    cache.get('a')
+    cache.put('a', 1)
+    cache.get('a')
+    cache.get('a')
+
+    assert cache.stats() == {'entries': 1, 'hits': 2, 'misses': 1}
+    cache.clear()
+    assert cache.stats() == {'entries': 0, 'hits': 0, 'misses': 0}
@@ -0,0 +1,76 @@
+from quiz_common.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+def _breaker(now):
+    return CircuitBreaker(failure_threshold=3, reset_timeout_seconds=10, latency_threshold_seconds=1,
+                          clock=lambda: now[0])
+
+
+def test_breaker_opens_after_consecutive_failures():
+    now = [0.0]
+    breaker = _breaker(now)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success(0.1)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+
+
+def test_breaker_counts_slow_calls_as_failures():
+    now = [0.0]
+    breaker = _breaker(now)
+
+    for _ in range(3):
+        breaker.record_success(2.5)
+
+    assert breaker.state == OPEN
+
+
+def test_breaker_lets_a_single_probe_through_when_half_open():
+    now = [0.0]
+    breaker = _breaker(now)
+    for _ in range(3):
+        breaker.record_failure()
+
+    now[0] = 10
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    now[0] = 19
+    assert not breaker.allow_request()
+
+    now[0] = 20
+    assert breaker.allow_request()
+    breaker.record_success(0.1)
+    assert breaker.state == CLOSED
+    assert breaker.allow_request() and breaker.allow_request()
+    assert breaker.stats() == {'state': CLOSED, 'consecutive_failures': 0}
+
+
+def test_breaker_replaces_a_probe_that_never_reports():
+    now = [0.0]
+    breaker = _breaker(now)
+    for _ in range(3):
+        breaker.record_failure()
+
+    now[0] = 10
+    assert breaker.allow_request()
+    # the probe's invocation dies without recording an outcome
+    now[0] = 19
+    assert not breaker.allow_request()
+    assert breaker.state == HALF_OPEN
+
+    now[0] = 20
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    breaker.record_success(0.1)
+    assert breaker.state == CLOSED
@@ -0,0 +1,212 @@
+import json
+import random
+from decimal import Decimal
+
+import pytest
+from botocore.exceptions import ClientError
+
+from quiz_common import quiz_ids
+
+QUIZ_REQUEST = {
+    'Title': 'Capitals',
+    'Visibility': 'Private',
+    'Questions': [
+        {
+            'QuestionText': 'Capital of France?',
+            'Options': ['A. Paris', 'B. Rome'],
+            'CorrectAnswer': 'A. Paris',
+            'Trivia': 'Paris has been the capital since 987.',
+        },
+    ],
+}
+
+
+class FakeQuizzesTable:
+    """Quizzes table honouring attribute_not_exists(QuizID) conditions."""
+
+    def __init__(self, existing=(), error=None):
+        self.items = {quiz_id: {'QuizID': quiz_id} for quiz_id in existing}
+        self.error = error
+        self.attempts = []
+
+    def put_item(self, Item, ConditionExpression=None):
+        self.attempts.append(Item['QuizID'])
+        if self.error:
+            raise self.error
+        if ConditionExpression == quiz_ids.QUIZ_ID_CONDITION and Item['QuizID'] in self.items:
+            raise ClientError({'Error': {'Code': 'ConditionalCheckFailedException'}}, 'PutItem')
+        self.items[Item['QuizID']] = dict(Item)
+
+
+class FakeSNS:
+    def __init__(self):
+        self.messages = []
+
+    def publish(self, TopicArn, Message):
+        self.messages.append(json.loads(Message))
+
+
+@pytest.fixture
+def create(monkeypatch):
+    from lambdas.create_quiz import handler as cqh
+
+    monkeypatch.setattr(cqh, 'write_breaker', cqh.CircuitBreaker(3, 10, latency_threshold_seconds=1))
+
+    def run(table, candidates):
+        sns = FakeSNS()
+
+        class FakeClients:
+            def resource(self, service_name):
+                class FakeResource:
+                    def Table(self, name):
+                        return table
+                return FakeResource()
+
+            def client(self, service_name):
+                assert service_name == 'sns'
+                return sns
+
+        monkeypatch.setattr(cqh, 'clients', FakeClients(), raising=False)
+        monkeypatch.setattr(cqh, 'candidate_quiz_ids', lambda: iter(candidates))
+        return cqh.lambda_handler({'body': json.dumps(QUIZ_REQUEST)}, None), sns
+
+    return run
+
+
+def test_create_quiz_never_overwrites_an_existing_quiz(create):
+    table = FakeQuizzesTable(existing={'brave-otters-danced'})
+
+    response, _ = create(table, ['brave-otters-danced', 'brave-otters-danced-0042'])
+
+    assert response['statusCode'] == 200
+    assert json.loads(response['body']) == {'QuizID': 'brave-otters-danced-0042'}
+    assert table.items['brave-otters-danced'] == {'QuizID': 'brave-otters-danced'}
+    stored = table.items['brave-otters-danced-0042']
+    assert json.loads(stored['PublicView'])['QuizID'] == 'brave-otters-danced-0042'
+
+
+def test_create_quiz_gives_up_after_bounded_collisions(create):
+    table = FakeQuizzesTable(existing={'a', 'b'})
+
+    response, sns = create(table, ['a', 'b'])
+
+    assert response['statusCode'] == 503
+    assert table.attempts == ['a', 'b']
+    assert sns.messages == []
+
+
+def test_create_quiz_queues_other_write_failures_for_retry(create):
+    error = ClientError({'Error': {'Code': 'ProvisionedThroughputExceededException'}}, 'PutItem')
+    table = FakeQuizzesTable(error=error)
+
+    response, sns = create(table, ['brave-otters-danced', 'unused'])
+
+    assert response['statusCode'] == 500
+    assert table.attempts == ['brave-otters-danced']
+    assert sns.messages[0]['Item']['QuizID'] == 'brave-otters-danced'
+
+
+def test_candidate_quiz_ids_add_a_suffix_after_the_first_attempt():
+    rng = random.Random(7)
+
+    first, second, third = quiz_ids.candidate_quiz_ids(max_attempts=3, suffix_digits=0, rng=rng)
+
+    assert len(first.split('-')) == 3
+    for candidate in (second, third):
+        words = candidate.split('-')
+        assert len(words) == 4 and len(words[3]) == quiz_ids.QUIZ_ID_RETRY_SUFFIX_DIGITS
+    assert words[0] in quiz_ids.ADJECTIVES and words[1] in quiz_ids.NOUNS and words[2] in quiz_ids.VERBS
+    assert len(quiz_ids.generate_quiz_id(suffix_digits=2, rng=rng).split('-')[3]) == 2
+
+
+def test_create_quiz_rejects_invalid_items_without_tripping_the_breaker(create):
+    from lambdas.create_quiz import handler as cqh
+
+    error = ClientError({'Error': {'Code': 'ValidationException'},
+                         'ResponseMetadata': {'HTTPStatusCode': 400}}, 'PutItem')
+    table = FakeQuizzesTable(error=error)
+    for idx in range(5):
+        response, sns = create(table, [f'quiz-{idx}'])
+        assert response['statusCode'] == 400
+        assert sns.messages == []
+
+    assert cqh.write_breaker.stats() == {'state': 'closed', 'consecutive_failures': 0}
+
+
+def test_create_quiz_stores_fractional_numbers_as_decimal(create, monkeypatch):
+    from lambdas.create_quiz import handler as cqh
+
+    table = FakeQuizzesTable()
+    question = dict(QUIZ_REQUEST['Questions'][0], Options=[1.5, 2.5], CorrectAnswer=1.5)
+    sns = FakeSNS()
+    monkeypatch.setattr(cqh, 'candidate_quiz_ids', lambda: iter(['quiz-0']))
+
+    class FakeClients:
+        def resource(self, service_name):
+            class FakeResource:
+                def Table(self, name):
+                    return table
+            return FakeResource()
+
+        def client(self, service_name):
+            return sns
+
+    monkeypatch.setattr(cqh, 'clients', FakeClients(), raising=False)
+    response = cqh.lambda_handler({'body': json.dumps(dict(QUIZ_REQUEST, Questions=[question]))}, None)
+
+    assert response['statusCode'] == 200
+    stored = table.items['quiz-0']
+    assert stored['AnswerKey'] == [Decimal('1.5')]
+    assert json.loads(stored['PublicView'])['Questions'][0]['Options'] == [1.5, 2.5]
+
+
+def test_transient_errors_are_throttling_server_and_transport_failures():
+    from botocore.exceptions import EndpointConnectionError, ReadTimeoutError
+
+    from quiz_common.circuit_breaker import is_transient_error
+
+    assert is_transient_error(ClientError({'Error': {'Code': 'ThrottlingException'}}, 'PutItem'))
+    assert is_transient_error(ClientError({'Error': {'Code': 'Unknown'},
+                                           'ResponseMetadata': {'HTTPStatusCode': 503}}, 'PutItem'))
+    assert is_transient_error(EndpointConnectionError(endpoint_url='http://localhost'))
+    assert is_transient_error(ReadTimeoutError(endpoint_url='http://localhost'))
+    assert not is_transient_error(ClientError({'Error': {'Code': 'ValidationException'}}, 'PutItem'))
+    assert not is_transient_error(TypeError('Float types are not supported. Use Decimal types instead.'))
+
+
+def test_create_quiz_skips_dynamodb_while_the_breaker_is_open(create):
+    from lambdas.create_quiz import handler as cqh
+
+    error = ClientError({'Error': {'Code': 'InternalServerError'}}, 'PutItem')
+    table = FakeQuizzesTable(error=error)
+    for idx in range(3):
+        response, _ = create(table, [f'quiz-{idx}'])
+        assert response['statusCode'] == 500
+    assert cqh.write_breaker.stats()['state'] == 'open'
+
+    response, sns = create(table, ['never-tried'])
+
+    assert response['statusCode'] == 500
+    assert 'queued for retry' in json.loads(response['body'])['message']
+    assert table.attempts == ['quiz-0', 'quiz-1', 'quiz-2']
+    quiz_id = sns.messages[0]['Item']['QuizID']
+    assert json.loads(response['body'])['QuizID'] == quiz_id
+    assert len(quiz_id.split('-')[3]) == quiz_ids.QUIZ_ID_RETRY_SUFFIX_DIGITS
+    assert json.loads(sns.messages[0]['Item']['PublicView'])['QuizID'] == quiz_id
+
+
+def test_create_quiz_probes_dynamodb_again_after_the_reset_timeout(create, monkeypatch):
+    from lambdas.create_quiz import handler as cqh
+
+    now = [0.0]
+    monkeypatch.setattr(cqh, 'write_breaker', cqh.CircuitBreaker(1, 10, clock=lambda: now[0]))
+    error = ClientError({'Error': {'Code': 'InternalServerError'}}, 'PutItem')
+    create(FakeQuizzesTable(error=error), ['quiz-0'])
+
+    now[0] = 10
+    table = FakeQuizzesTable()
+    response, _ = create(table, ['quiz-1'])
+
+    assert response['statusCode'] == 200
+    assert table.attempts == ['quiz-1']
+    assert cqh.write_breaker.stats()['state'] == 'closed'
@@ -0,0 +1,79 @@
+import json
+from decimal import Decimal
+
+import pytest
+from boto3.dynamodb.types import TypeSerializer
+
+from quiz_common.encoding import encode_item, encode_wire_item
+
+
+def _convert_decimal(obj):
+    """The per-handler conversion the shared encoder replaced."""
+    if isinstance(obj, list):
+        return [_convert_decimal(item) for item in obj]
+    elif isinstance(obj, dict):
+        return {k: _convert_decimal(v) for k, v in obj.items()}
+    elif isinstance(obj, Decimal):
+        if obj % 1 == 0:
+            return int(obj)
+        else:
+            return float(obj)
+    else:
+        return obj
+
+
+def legacy_encode_quiz(quiz):
+    for question in quiz['Questions']:
+        question.pop('CorrectAnswer', None)
+    return json.dumps(_convert_decimal(quiz))
+
+
+def to_wire(item):
+    serializer = TypeSerializer()
+    return {key: serializer.serialize(value) for key, value in item.items()}
+
+
+def make_quiz(num_questions):
+    return {
+        'QuizID': 'brave-otters-danced',
+        'Title': 'Café "quiz" – large',
+        'Visibility': 'Public',
+        'EnableTimer': True,
+        'TimerSeconds': Decimal('30'),
+        'Score': Decimal('66.6667'),
+        'Nothing': None,
+        'Questions': [
+            {
+                'QuestionText': f'Question {idx}: what is {idx} + {idx}?',
+                'Options': [f'A. {idx}', f'B. {idx * 2}', 'C. \\n', 'D. über'],
+                'CorrectAnswer': f'B. {idx * 2}',
+                'Trivia': 'Line\nbreak and "quotes".',
+                'Weight': Decimal('1.5') if idx % 2 else Decimal('2'),
+            } for idx in range(num_questions)
+        ],
+    }
+
+
+@pytest.mark.parametrize('num_questions', [0, 1, 25])
+def test_encode_item_matches_legacy_two_pass_encoding(num_questions):
+    expected = legacy_encode_quiz(make_quiz(num_questions))
+    assert encode_item(make_quiz(num_questions), exclude=('CorrectAnswer',)) == expected
+
+
+@pytest.mark.parametrize('num_questions', [0, 1, 25])
+def test_encode_wire_item_matches_legacy_two_pass_encoding(num_questions):
+    expected = legacy_encode_quiz(make_quiz(num_questions))
+    assert encode_wire_item(to_wire(make_quiz(num_questions)), exclude=('CorrectAnswer',)) == expected
+
+
+def test_encode_wire_item_numbers():
+    item = {'a': {'N': '42'}, 'b': {'N': '-7'}, 'c': {'N': '42.50'}, 'd': {'N': '1E+2'}, 'e': {'N': '0.1'}}
+    assert json.loads(encode_wire_item(item)) == {'a': 42, 'b': -7, 'c': 42.5, 'd': 100, 'e': 0.1}
+    assert encode_wire_item(item) == '{"a": 42, "b": -7, "c": 42.5, "d": 100, "e": 0.1}'
+
+
+def test_encode_rejects_unsupported_types():
+    with pytest.raises(TypeError):
+        encode_item({'blob': b'bytes'})
+    with pytest.raises(TypeError):
+        encode_wire_item({'blob': {'B': b'bytes'}})
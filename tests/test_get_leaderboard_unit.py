@@ -1,38 +1,38 @@
 import json
-from decimal import Decimal
 
 
 def test_get_leaderboard_returns_200_and_items(monkeypatch):
     # Import the handler module
     from lambdas.get_leaderboard import handler as glh
 
-    # Fake DynamoDB table and resource to avoid external dependencies
-    class FakeTable:
+    # Fake low-level DynamoDB client to avoid external dependencies
+    class FakeDynamoClient:
+        def get_item(self, **kwargs):
+            # No materialized leaderboard yet, so the handler queries the GSI
+            assert kwargs['TableName'] == 'Leaderboards'
+            return {}
+
         def query(self, **kwargs):
+            assert kwargs['TableName'] == 'UserSubmissions'
+            assert kwargs['ExpressionAttributeValues'] == {':quiz_id': {'S': 'quiz-abc'}}
             # Simulate items as written by the scoring lambda
             return {
                 'Items': [
                     {
-                        'SubmissionID': 'sub-123',
-                        'Username': 'user1',
-                        'QuizID': 'quiz-abc',
-                        'Score': Decimal('42.5'),
+                        'SubmissionID': {'S': 'sub-123'},
+                        'Username': {'S': 'user1'},
+                        'Score': {'N': '42.5'},
                     }
                 ]
             }
 
-    class FakeDynamoResource:
-        def Table(self, name):
-            assert name == 'UserSubmissions'
-            return FakeTable()
-
-    class FakeBoto3:
-        def resource(self, service_name):
+    class FakeClients:
+        def client(self, service_name):
             assert service_name == 'dynamodb'
-            return FakeDynamoResource()
+            return FakeDynamoClient()
 
-    # Patch boto3 within the handler module
-    monkeypatch.setattr(glh, 'boto3', FakeBoto3(), raising=False)
+    # Patch the shared client pool within the handler module
+    monkeypatch.setattr(glh, 'clients', FakeClients(), raising=False)
 
     event = {
         'queryStringParameters': {
@@ -53,3 +53,149 @@ def test_get_leaderboard_returns_200_and_items(monkeypatch):
             'SubmissionID': 'sub-123',
         }
     ]
+
+
+def test_get_leaderboard_serves_materialized_top_entries(monkeypatch):
+    from lambdas.get_leaderboard import handler as glh
+
+    entries = [
+        {'M': {'Username': {'S': f'user{i}'}, 'Score': {'N': str(100 - i)}, 'SubmissionID': {'S': f'sub-{i}'}}}
+        for i in range(5)
+    ]
+
+    class FakeDynamoClient:
+        def get_item(self, **kwargs):
+            assert kwargs['Key'] == {'QuizID': {'S': 'quiz-abc'}}
+            return {'Item': {'TopEntries': {'L': entries}}}
+
+        def query(self, **kwargs):
+            raise AssertionError('GSI should not be queried for top <= LEADERBOARD_SIZE')
+
+    class FakeClients:
+        def client(self, service_name):
+            return FakeDynamoClient()
+
+    monkeypatch.setattr(glh, 'clients', FakeClients(), raising=False)
+
+    response = glh.lambda_handler({'queryStringParameters': {'quiz_id': 'quiz-abc', 'top': '3'}}, None)
+
+    assert response['statusCode'] == 200
+    assert json.loads(response['body']) == [
+        {'Username': 'user0', 'Score': 100.0, 'SubmissionID': 'sub-0'},
+        {'Username': 'user1', 'Score': 99.0, 'SubmissionID': 'sub-1'},
+        {'Username': 'user2', 'Score': 98.0, 'SubmissionID': 'sub-2'},
+    ]
+
+
+def _row(i):
+    return {'QuizID': {'S': 'quiz-abc'}, 'Score': {'N': str(100 - i)}, 'SubmissionID': {'S': f'sub-{i}'}, 'Username': {'S': f'user{i}'}}
+
+
+class FakeScoreIndex:
+    """Low-level client serving the QuizID-Score-index from an in-memory list of rows."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    def _ordered(self, descending):
+        rows = sorted(self.rows, key=lambda r: (float(r['Score']['N']), r['SubmissionID']['S']))
+        return rows[::-1] if descending else rows
+
+    def get_item(self, **kwargs):
+        assert kwargs['TableName'] == 'UserSubmissions'
+        submission_id = kwargs['Key']['SubmissionID']['S']
+        for row in self.rows:
+            if row['SubmissionID']['S'] == submission_id:
+                return {'Item': row}
+        return {}
+
+    def query(self, **kwargs):
+        assert kwargs['IndexName'] == 'QuizID-Score-index'
+        self.queries.append(kwargs)
+        if kwargs.get('Select') == 'COUNT':
+            score = float(kwargs['ExpressionAttributeValues'][':score']['N'])
+            return {'Count': sum(1 for r in self.rows if float(r['Score']['N']) > score)}
+        rows = self._ordered(not kwargs['ScanIndexForward'])
+        start = kwargs.get('ExclusiveStartKey')
+        if start:
+            ids = [r['SubmissionID']['S'] for r in rows]
+            rows = rows[ids.index(start['SubmissionID']['S']) + 1:]
+        page = rows[:kwargs['Limit']]
+        response = {'Items': [{k: r[k] for k in ('Username', 'Score', 'SubmissionID')} for r in page]}
+        if len(rows) > kwargs['Limit']:
+            last = page[-1]
+            response['LastEvaluatedKey'] = {k: last[k] for k in ('QuizID', 'Score', 'SubmissionID')}
+        return response
+
+
+def _patch_client(monkeypatch, glh, client):
+    class FakeClients:
+        def client(self, service_name):
+            return client
+
+    monkeypatch.setattr(glh, 'clients', FakeClients(), raising=False)
+
+
+def test_get_leaderboard_pages_with_cursor(monkeypatch):
+    from lambdas.get_leaderboard import handler as glh
+
+    _patch_client(monkeypatch, glh, FakeScoreIndex([_row(i) for i in range(5)]))
+
+    seen = []
+    cursor = ''
+    while cursor is not None:
+        params = {'quiz_id': 'quiz-abc', 'top': '2', 'cursor': cursor}
+        response = glh.lambda_handler({'queryStringParameters': params}, None)
+        assert response['statusCode'] == 200
+        body = json.loads(response['body'])
+        seen.extend(entry['SubmissionID'] for entry in body['Leaderboard'])
+        cursor = body['NextCursor']
+
+    assert seen == [f'sub-{i}' for i in range(5)]
+
+
+def test_get_leaderboard_rejects_foreign_or_malformed_cursor(monkeypatch):
+    from lambdas.get_leaderboard import handler as glh
+    from quiz_common.pagination import encode_cursor
+
+    _patch_client(monkeypatch, glh, FakeScoreIndex([_row(i) for i in range(3)]))
+    foreign = encode_cursor({'QuizID': {'S': 'other'}, 'Score': {'N': '1'}, 'SubmissionID': {'S': 'sub-x'}})
+
+    for cursor in (foreign, 'not-a-cursor', encode_cursor({'QuizID': {'S': 'quiz-abc'}})):
+        params = {'quiz_id': 'quiz-abc', 'cursor': cursor}
+        response = glh.lambda_handler({'queryStringParameters': params}, None)
+        assert response['statusCode'] == 400
+
+
+def test_get_leaderboard_returns_submission_rank_and_neighbours(monkeypatch):
+    from lambdas.get_leaderboard import handler as glh
+
+    client = FakeScoreIndex([_row(i) for i in range(10)])
+    _patch_client(monkeypatch, glh, client)
+
+    params = {'quiz_id': 'quiz-abc', 'submission_id': 'sub-4', 'neighbours': '2'}
+    response = glh.lambda_handler({'queryStringParameters': params}, None)
+
+    assert response['statusCode'] == 200
+    body = json.loads(response['body'])
+    assert body['Rank'] == 5
+    assert body['Submission'] == {'Username': 'user4', 'Score': 96.0, 'SubmissionID': 'sub-4'}
+    assert [entry['SubmissionID'] for entry in body['Above']] == ['sub-2', 'sub-3']
+    assert [entry['SubmissionID'] for entry in body['Below']] == ['sub-5', 'sub-6']
+    # The rank comes from a count query, not from reading the rows above
+    count_queries = [q for q in client.queries if q.get('Select') == 'COUNT']
+    assert len(count_queries) == 1
+    assert '#score > :score' in count_queries[0]['KeyConditionExpression']
+
+
+def test_get_leaderboard_rank_of_unknown_submission_is_404(monkeypatch):
+    from lambdas.get_leaderboard import handler as glh
+
+    _patch_client(monkeypatch, glh, FakeScoreIndex([_row(0)]))
+
+    params = {'quiz_id': 'quiz-abc', 'submission_id': 'sub-missing'}
+    response = glh.lambda_handler({'queryStringParameters': params}, None)
+    assert response['statusCode'] == 404
+    response = glh.lambda_handler({'queryStringParameters': {'quiz_id': 'other', 'submission_id': 'sub-0'}}, None)
+    assert response['statusCode'] == 404
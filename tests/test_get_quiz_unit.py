@@ -0,0 +1,298 @@
+import io
+import json
+
+import pytest
+from boto3.dynamodb.types import TypeSerializer
+
+
+@pytest.fixture(autouse=True)
+def empty_quiz_cache():
+    from lambdas.get_quiz import handler as gqh
+
+    gqh.quiz_cache.clear()
+    gqh.question_chunk_cache.clear()
+
+
+def _to_wire(item):
+    serializer = TypeSerializer()
+    return {key: serializer.serialize(value) for key, value in item.items()}
+
+
+QUIZ_REQUEST = {
+    'Title': 'Capitals',
+    'Visibility': 'Public',
+    'EnableTimer': True,
+    'TimerSeconds': 20,
+    'Questions': [
+        {
+            'QuestionText': 'Capital of France?',
+            'Options': ['A. Paris', 'B. Rome'],
+            'CorrectAnswer': 'A. Paris',
+            'Trivia': 'Paris has been the capital since 987.',
+        },
+    ],
+}
+
+
+class FakeQuizzesTable:
+    def __init__(self):
+        self.items = {}
+
+    def put_item(self, Item, ConditionExpression=None):
+        self.items[Item['QuizID']] = Item
+
+
+class FakeQuizzesClient:
+    """Low-level client answering GetItem from wire-format items."""
+
+    def __init__(self, items):
+        self.items = items
+        self.calls = []
+
+    def get_item(self, TableName, Key, ProjectionExpression=None, ExpressionAttributeNames=None):
+        assert TableName == 'Quizzes'
+        self.calls.append(ProjectionExpression)
+        item = self.items.get(Key['QuizID']['S'])
+        if item is None:
+            return {}
+        if ProjectionExpression:
+            names = [ExpressionAttributeNames[name.strip()] for name in ProjectionExpression.split(',')]
+            item = {name: value for name, value in item.items() if name in names}
+        return {'Item': item}
+
+
+def _create_quiz(monkeypatch):
+    from lambdas.create_quiz import handler as cqh
+
+    table = FakeQuizzesTable()
+
+    class FakeResource:
+        def Table(self, name):
+            assert name == 'Quizzes'
+            return table
+
+    class FakeClients:
+        def resource(self, service_name):
+            return FakeResource()
+
+    monkeypatch.setattr(cqh, 'clients', FakeClients(), raising=False)
+    response = cqh.lambda_handler({'body': json.dumps(QUIZ_REQUEST)}, None)
+    assert response['statusCode'] == 200
+    return table.items[json.loads(response['body'])['QuizID']]
+
+
+def _get_quiz(monkeypatch, items, quiz_id, s3=None, **params):
+    from lambdas.get_quiz import handler as gqh
+
+    client = FakeQuizzesClient(items)
+
+    class FakeClients:
+        def client(self, service_name):
+            if service_name == 's3':
+                return s3
+            assert service_name == 'dynamodb'
+            return client
+
+    monkeypatch.setattr(gqh, 'clients', FakeClients(), raising=False)
+    event = {'queryStringParameters': dict(params, quiz_id=quiz_id)}
+    return gqh.lambda_handler(event, None), client
+
+
+def test_get_quiz_serves_the_view_stored_by_create_quiz(monkeypatch):
+    item = _create_quiz(monkeypatch)
+
+    response, client = _get_quiz(monkeypatch, {item['QuizID']: _to_wire(item)}, item['QuizID'])
+
+    assert response['statusCode'] == 200
+    assert response['body'] == item['PublicView']
+    assert client.calls == ['#quiz_id, #view, #location']
+    quiz = json.loads(response['body'])
+    assert quiz['Title'] == 'Capitals'
+    assert quiz['TimerSeconds'] == 20
+    assert 'CorrectAnswer' not in quiz['Questions'][0]
+    assert not {'PublicCatalog', 'PublicView', 'AnswerKey'} & set(quiz)
+    assert quiz['QuestionCount'] == 1
+    # the view holds the only copy of the questions, scoring reads the answer key
+    assert 'Questions' not in item
+    assert item['AnswerKey'] == ['A. Paris']
+
+
+def test_get_quiz_encodes_quizzes_without_a_stored_view(monkeypatch):
+    item = _create_quiz(monkeypatch)
+    legacy_item = dict(
+        {key: value for key, value in item.items() if key not in ('PublicView', 'AnswerKey')},
+        Questions=QUIZ_REQUEST['Questions'],
+    )
+
+    response, client = _get_quiz(monkeypatch, {item['QuizID']: _to_wire(legacy_item)}, item['QuizID'])
+
+    assert response['statusCode'] == 200
+    assert json.loads(response['body']) == json.loads(item['PublicView'])
+    assert client.calls == ['#quiz_id, #view, #location', None]
+
+
+def test_get_quiz_returns_404_for_unknown_quiz(monkeypatch):
+    response, client = _get_quiz(monkeypatch, {}, 'missing-quiz-id')
+
+    assert response['statusCode'] == 404
+    assert client.calls == ['#quiz_id, #view, #location']
+
+
+def test_get_quiz_serves_warm_requests_from_the_cache(monkeypatch):
+    item = _create_quiz(monkeypatch)
+    items = {item['QuizID']: _to_wire(item)}
+
+    _, client = _get_quiz(monkeypatch, items, item['QuizID'])
+    response, client = _get_quiz(monkeypatch, items, item['QuizID'])
+
+    assert response['statusCode'] == 200
+    assert response['body'] == item['PublicView']
+    assert client.calls == []
+
+
+def test_get_quiz_remembers_unknown_quizzes_briefly(monkeypatch):
+    from lambdas.get_quiz import handler as gqh
+
+    now = [0.0]
+    monkeypatch.setattr(gqh, 'quiz_cache', gqh.TTLCache(10, 300, clock=lambda: now[0]))
+
+    _get_quiz(monkeypatch, {}, 'late-quiz')
+    response, client = _get_quiz(monkeypatch, {}, 'late-quiz')
+    assert response['statusCode'] == 404
+    assert client.calls == []
+
+    now[0] = gqh.QUIZ_CACHE_NEGATIVE_TTL_SECONDS + 1
+    item = {'QuizID': 'late-quiz', 'Title': 'Late', 'PublicView': '{"QuizID": "late-quiz"}'}
+    response, _ = _get_quiz(monkeypatch, {'late-quiz': _to_wire(item)}, 'late-quiz')
+    assert response['statusCode'] == 200
+    assert gqh.quiz_cache.stats() == {'entries': 1, 'hits': 1, 'misses': 2}
+
+
+class FakeS3:
+    def __init__(self):
+        self.objects = {}
+        self.gets = []
+
+    def put_object(self, Bucket, Key, Body, ContentType=None):
+        self.objects[(Bucket, Key)] = Body
+
+    def get_object(self, Bucket, Key):
+        self.gets.append(Key)
+        return {'Body': io.BytesIO(self.objects[(Bucket, Key)])}
+
+
+def _large_quiz(count):
+    return dict(QUIZ_REQUEST, Questions=[
+        {
+            'QuestionText': f'Question {idx}?',
+            'Options': ['A. Yes', 'B. No'],
+            'CorrectAnswer': 'A. Yes',
+            'Trivia': 'x' * 100,
+        }
+        for idx in range(count)
+    ])
+
+
+def _create_large_quiz(monkeypatch, s3, count=25):
+    from lambdas.create_quiz import handler as cqh
+    from quiz_common import question_store
+
+    monkeypatch.setattr(question_store, 'QUIZ_INLINE_MAX_BYTES', 1000)
+    monkeypatch.setattr(question_store, 'QUESTIONS_PER_CHUNK', 10)
+    table = FakeQuizzesTable()
+
+    class FakeResource:
+        def Table(self, name):
+            return table
+
+    class FakeClients:
+        def resource(self, service_name):
+            return FakeResource()
+
+        def client(self, service_name):
+            assert service_name == 's3'
+            return s3
+
+    monkeypatch.setattr(cqh, 'clients', FakeClients(), raising=False)
+    response = cqh.lambda_handler({'body': json.dumps(_large_quiz(count))}, None)
+    assert response['statusCode'] == 200
+    return table.items[json.loads(response['body'])['QuizID']]
+
+
+def test_create_quiz_offloads_large_question_sets_to_s3(monkeypatch):
+    s3 = FakeS3()
+    item = _create_large_quiz(monkeypatch, s3)
+
+    assert 'Questions' not in item
+    assert item['AnswerKey'] == ['A. Yes'] * 25
+    assert item['QuestionCount'] == 25
+    assert item['QuestionsLocation']['Chunks'] == 3
+    assert len(s3.objects) == 3
+    assert all(b'CorrectAnswer' not in body for body in s3.objects.values())
+    view = json.loads(item['PublicView'])
+    assert 'AnswerKey' not in view and 'QuestionsLocation' not in view
+
+
+def test_get_quiz_pages_through_offloaded_questions(monkeypatch):
+    s3 = FakeS3()
+    item = _create_large_quiz(monkeypatch, s3)
+    items = {item['QuizID']: _to_wire(item)}
+
+    response, _ = _get_quiz(monkeypatch, items, item['QuizID'], s3=s3, offset='8', limit='5')
+
+    assert response['statusCode'] == 200
+    quiz = json.loads(response['body'])
+    assert [q['QuestionText'] for q in quiz['Questions']] == [f'Question {idx}?' for idx in range(8, 13)]
+    assert (quiz['QuestionCount'], quiz['Offset'], quiz['NextOffset']) == (25, 8, 13)
+    assert 'CorrectAnswer' not in quiz['Questions'][0]
+    # only the two chunks overlapping questions 8-12 are read
+    assert len(s3.gets) == 2
+
+    response, client = _get_quiz(monkeypatch, items, item['QuizID'], s3=s3, offset='20', limit='10')
+    quiz = json.loads(response['body'])
+    assert len(quiz['Questions']) == 5
+    assert quiz['NextOffset'] is None
+    assert client.calls == []
+
+
+def test_get_quiz_returns_all_offloaded_questions_without_paging(monkeypatch):
+    s3 = FakeS3()
+    item = _create_large_quiz(monkeypatch, s3)
+
+    response, _ = _get_quiz(monkeypatch, {item['QuizID']: _to_wire(item)}, item['QuizID'], s3=s3)
+
+    quiz = json.loads(response['body'])
+    assert len(quiz['Questions']) == 25
+    assert 'NextOffset' not in quiz
+
+
+def test_get_quiz_pages_inline_questions(monkeypatch):
+    item = _create_quiz(monkeypatch)
+
+    response, _ = _get_quiz(monkeypatch, {item['QuizID']: _to_wire(item)}, item['QuizID'], limit='1')
+
+    quiz = json.loads(response['body'])
+    assert len(quiz['Questions']) == 1
+    assert (quiz['QuestionCount'], quiz['Offset'], quiz['NextOffset']) == (1, 0, None)
+
+
+@pytest.mark.parametrize('params', [{'offset': '-1'}, {'limit': '0'}, {'limit': '1000'}, {'offset': 'x'}])
+def test_get_quiz_rejects_invalid_pages(monkeypatch, params):
+    response, client = _get_quiz(monkeypatch, {}, 'some-quiz', **params)
+
+    assert response['statusCode'] == 400
+    assert client.calls == []
+
+
+def test_normalize_quiz_drops_client_supplied_server_attributes():
+    from quiz_common.quizzes import normalize_quiz
+
+    quiz = normalize_quiz(dict(
+        QUIZ_REQUEST,
+        AnswerKey=['B. Rome'],
+        QuestionsLocation={'Bucket': 'quiz-questions', 'Prefix': 'questions/other-quiz'},
+        QuestionCount=99,
+    ))
+
+    assert 'AnswerKey' not in quiz and 'QuestionsLocation' not in quiz
+    assert quiz['QuestionCount'] == 1
@@ -0,0 +1,121 @@
+import json
+
+import pytest
+
+
+def _submission_row(i, username='user1'):
+    return {
+        'SubmissionID': {'S': f'sub-{username}-{i}'},
+        'Username': {'S': username},
+        'QuizID': {'S': f'quiz-{i % 2}'},
+        'Score': {'N': '50.5'},
+        'TotalQuestions': {'N': '4'},
+        'SubmittedAt': {'N': str(1000 + i)},
+    }
+
+
+class FakeUserSubmissionsIndex:
+    """Low-level client serving Username-SubmittedAt-index from in-memory rows."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    def query(self, **kwargs):
+        self.queries.append(kwargs)
+        assert kwargs['TableName'] == 'UserSubmissions'
+        assert kwargs['IndexName'] == 'Username-SubmittedAt-index'
+        username = kwargs['ExpressionAttributeValues'][':username']['S']
+        rows = [r for r in self.rows if r['Username']['S'] == username]
+        rows.sort(key=lambda r: int(r['SubmittedAt']['N']), reverse=not kwargs['ScanIndexForward'])
+        start = kwargs.get('ExclusiveStartKey')
+        if start:
+            ids = [r['SubmissionID']['S'] for r in rows]
+            rows = rows[ids.index(start['SubmissionID']['S']) + 1:]
+        page = rows[:kwargs['Limit']]
+        response = {'Items': [{k: v for k, v in r.items() if k != 'Username'} for r in page]}
+        if len(rows) > kwargs['Limit']:
+            response['LastEvaluatedKey'] = {k: page[-1][k] for k in ('SubmissionID', 'Username', 'SubmittedAt')}
+        return response
+
+
+@pytest.fixture
+def handler(monkeypatch):
+    """Return a function that serves ``client`` to the handler and returns the handler module."""
+    from lambdas.get_user_submissions import handler as gush
+
+    def serve(client):
+        class FakeClients:
+            def client(self, service_name):
+                assert service_name == 'dynamodb'
+                return client
+
+        monkeypatch.setattr(gush, 'clients', FakeClients(), raising=False)
+        return gush
+
+    return serve
+
+
+def test_get_user_submissions_pages_newest_first(handler):
+    rows = [_submission_row(i) for i in range(5)] + [_submission_row(0, username='user2')]
+    gush = handler(FakeUserSubmissionsIndex(rows))
+
+    submission_ids = []
+    params = {'username': 'user1', 'limit': '2'}
+    while True:
+        response = gush.lambda_handler({'queryStringParameters': params}, None)
+        assert response['statusCode'] == 200
+        body = json.loads(response['body'])
+        submission_ids.extend(submission['SubmissionID'] for submission in body['Submissions'])
+        if body['NextCursor'] is None:
+            break
+        params = {'username': 'user1', 'limit': '2', 'cursor': body['NextCursor']}
+
+    assert submission_ids == [f'sub-user1-{i}' for i in (4, 3, 2, 1, 0)]
+
+
+def test_get_user_submissions_returns_numbers_as_json_numbers(handler):
+    gush = handler(FakeUserSubmissionsIndex([_submission_row(0)]))
+
+    response = gush.lambda_handler({'queryStringParameters': {'username': 'user1'}}, None)
+
+    assert json.loads(response['body']) == {
+        'Submissions': [{
+            'SubmissionID': 'sub-user1-0',
+            'QuizID': 'quiz-0',
+            'Score': 50.5,
+            'TotalQuestions': 4,
+            'SubmittedAt': 1000,
+        }],
+        'NextCursor': None,
+    }
+
+
+@pytest.mark.parametrize('params', [
+    None,
+    {'username': ''},
+    {'username': 'user1', 'limit': '0'},
+    {'username': 'user1', 'cursor': 'not-a-cursor'},
+])
+def test_get_user_submissions_rejects_invalid_parameters(handler, params):
+    client = FakeUserSubmissionsIndex([])
+    gush = handler(client)
+
+    response = gush.lambda_handler({'queryStringParameters': params}, None)
+
+    assert response['statusCode'] == 400
+    assert client.queries == []
+
+
+def test_get_user_submissions_rejects_cursors_of_other_users(handler):
+    from quiz_common.pagination import encode_cursor
+
+    client = FakeUserSubmissionsIndex([])
+    gush = handler(client)
+    cursor = encode_cursor({k: v for k, v in _submission_row(0, username='user2').items()
+                            if k in ('SubmissionID', 'Username', 'SubmittedAt')})
+
+    response = gush.lambda_handler({'queryStringParameters': {'username': 'user1', 'cursor': cursor}}, None)
+
+    assert response['statusCode'] == 400
+    assert client.queries == []
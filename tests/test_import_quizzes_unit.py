@@ -0,0 +1,203 @@
+import json
+
+import pytest
+from boto3.dynamodb.types import TypeDeserializer
+from botocore.exceptions import ClientError
+
+_deserializer = TypeDeserializer()
+
+
+def _quiz(title, **extra):
+    quiz = {
+        'Title': title,
+        'Visibility': 'Public',
+        'Questions': [
+            {'QuestionText': 'Q?', 'Options': ['A', 'B'], 'CorrectAnswer': 'A', 'Trivia': 'T', 'Weight': 1.5},
+        ],
+    }
+    quiz.update(extra)
+    return json.dumps(quiz)
+
+
+def _cancelled(codes):
+    return ClientError({
+        'Error': {'Code': 'TransactionCanceledException'},
+        'CancellationReasons': [{'Code': code} for code in codes],
+    }, 'TransactWriteItems')
+
+
+class FakeDynamoClient:
+    """Conditional TransactWriteItems against an in-memory Quizzes table."""
+
+    def __init__(self, existing=(), conflicts_once=False, failing=False, invalid_titles=()):
+        self.items = {quiz_id: {'QuizID': quiz_id} for quiz_id in existing}
+        self.conflicts_once = conflicts_once
+        self.failing = failing
+        self.invalid_titles = set(invalid_titles)
+        self.transaction_sizes = []
+
+    def transact_write_items(self, TransactItems):
+        assert len(TransactItems) <= 100
+        self.transaction_sizes.append(len(TransactItems))
+        if self.failing:
+            raise ClientError({'Error': {'Code': 'InternalServerError'}}, 'TransactWriteItems')
+        puts = [request['Put'] for request in TransactItems]
+        assert all(put['TableName'] == 'Quizzes' for put in puts)
+        assert all(put['ConditionExpression'] == 'attribute_not_exists(QuizID)' for put in puts)
+        items = [{name: _deserializer.deserialize(value) for name, value in put['Item'].items()} for put in puts]
+        if any(item['Title'] in self.invalid_titles for item in items):
+            raise ClientError({'Error': {'Code': 'ValidationException'}}, 'TransactWriteItems')
+        codes = ['ConditionalCheckFailed' if item['QuizID'] in self.items else 'None' for item in items]
+        if self.conflicts_once:
+            self.conflicts_once = False
+            codes = ['TransactionConflict'] + codes[1:]
+        if any(code != 'None' for code in codes):
+            raise _cancelled(codes)
+        for item in items:
+            self.items[item['QuizID']] = item
+
+
+class FakeS3:
+    def __init__(self):
+        self.objects = {}
+
+    def put_object(self, Bucket, Key, Body, ContentType):
+        self.objects[Key] = Body
+
+    def delete_objects(self, Bucket, Delete):
+        for obj in Delete['Objects']:
+            del self.objects[obj['Key']]
+
+
+@pytest.fixture
+def importer(monkeypatch):
+    from lambdas.import_quizzes import handler as iqh
+
+    monkeypatch.setattr(iqh, 'backoff', lambda attempt: None)
+
+    def run(body, dynamodb, s3=None):
+        class FakeClients:
+            def client(self, service_name):
+                return {'dynamodb': dynamodb, 's3': s3}[service_name]
+
+        monkeypatch.setattr(iqh, 'clients', FakeClients(), raising=False)
+        response = iqh.lambda_handler({'body': body}, None)
+        lines = response['body'].splitlines() if response['statusCode'] == 200 else []
+        return response, [json.loads(line) for line in lines]
+
+    return iqh, run
+
+
+def test_import_quizzes_writes_transactions_of_100_and_reports_every_line(importer):
+    iqh, run = importer
+    dynamodb = FakeDynamoClient(conflicts_once=True)
+    body = '\n'.join(_quiz(f'Quiz {i}') for i in range(250))
+
+    response, results = run(body, dynamodb)
+
+    assert response['statusCode'] == 200
+    assert response['headers']['Content-Type'] == 'application/x-ndjson'
+    assert [result['Line'] for result in results] == list(range(1, 251))
+    quiz_ids = [result['QuizID'] for result in results]
+    assert len(set(quiz_ids)) == 250
+    assert all(len(quiz_id.split('-')) == 4 for quiz_id in quiz_ids)
+    # the first transaction is cancelled by a conflict and sent again
+    assert dynamodb.transaction_sizes == [100, 100, 100, 50]
+    stored = dynamodb.items[quiz_ids[0]]
+    assert stored['Title'] == 'Quiz 0'
+    assert stored['PublicCatalog'] == 'Public'
+    assert json.loads(stored['PublicView'])['QuizID'] == quiz_ids[0]
+    assert 'CorrectAnswer' not in stored['PublicView']
+    assert 'Questions' not in stored and stored['AnswerKey'] == ['A']
+
+
+def test_import_quizzes_reports_invalid_lines_and_imports_the_rest(importer):
+    iqh, run = importer
+    dynamodb = FakeDynamoClient()
+    body = '\n'.join([
+        _quiz('Good'),
+        '{not json',
+        '',
+        json.dumps({'Questions': []}),
+        _quiz('Bad visibility', Visibility='Secret'),
+        _quiz('Bad question', Questions=[{'QuestionText': 'Q?'}]),
+    ])
+
+    response, results = run(body, dynamodb)
+
+    assert response['statusCode'] == 200
+    assert [result['Line'] for result in results] == [1, 2, 4, 5, 6]
+    assert 'QuizID' in results[0]
+    assert results[2]['Error'] == "Missing field 'Title'"
+    assert results[3]['Error'] == "Visibility must be 'Public' or 'Private'"
+    assert results[4]['Error'].startswith('Each question must contain')
+    assert len(dynamodb.items) == 1
+
+
+def test_import_quizzes_never_overwrites_a_taken_id(importer, monkeypatch):
+    iqh, run = importer
+    candidates = iter(['taken-id-0001', 'free-id-0001', 'free-id-0002'])
+    monkeypatch.setattr(iqh, 'generate_quiz_id', lambda digits: next(candidates))
+    dynamodb = FakeDynamoClient(existing={'taken-id-0001'})
+
+    response, results = run('\n'.join([_quiz('A'), _quiz('B')]), dynamodb)
+
+    assert [result['QuizID'] for result in results] == ['free-id-0002', 'free-id-0001']
+    assert dynamodb.items['taken-id-0001'] == {'QuizID': 'taken-id-0001'}
+    assert dynamodb.transaction_sizes == [2, 2]
+
+
+def test_import_quizzes_deletes_offloaded_questions_of_a_failed_chunk(importer, monkeypatch):
+    iqh, run = importer
+    monkeypatch.setattr(iqh, 'is_oversized', lambda quiz: quiz['Title'] == 'Large')
+    dynamodb = FakeDynamoClient(failing=True)
+    s3 = FakeS3()
+
+    response, results = run('\n'.join([_quiz('Large'), _quiz('Small')]), dynamodb, s3)
+
+    assert response['statusCode'] == 200
+    assert all(result['Error'].startswith('Could not store quiz') for result in results)
+    assert len(dynamodb.transaction_sizes) == 1
+    assert s3.objects == {}
+
+
+def test_import_quizzes_rejects_oversized_requests(importer, monkeypatch):
+    iqh, run = importer
+    monkeypatch.setattr(iqh, 'IMPORT_MAX_QUIZZES', 2)
+    dynamodb = FakeDynamoClient()
+
+    response, _ = run('\n'.join(_quiz(f'Quiz {i}') for i in range(3)), dynamodb)
+
+    assert response['statusCode'] == 413
+    assert dynamodb.items == {}
+
+
+def test_import_quizzes_imports_the_valid_quizzes_of_a_rejected_chunk(importer, monkeypatch):
+    iqh, run = importer
+    monkeypatch.setattr(iqh, 'is_oversized', lambda quiz: quiz['Title'] in ('Invalid', 'Large'))
+    dynamodb = FakeDynamoClient(invalid_titles={'Invalid'})
+    s3 = FakeS3()
+
+    response, results = run('\n'.join([_quiz('Good'), _quiz('Invalid'), _quiz('Large')]), dynamodb, s3)
+
+    assert response['statusCode'] == 200
+    assert 'QuizID' in results[0] and 'QuizID' in results[2]
+    assert results[1]['Error'].startswith('Could not store quiz')
+    assert dynamodb.transaction_sizes == [3, 1, 1, 1]
+    assert sorted(item['Title'] for item in dynamodb.items.values()) == ['Good', 'Large']
+    # only the questions of the stored large quiz are left
+    assert s3.objects and all(key.startswith(dynamodb.items[results[2]['QuizID']]['QuestionsLocation']['Prefix'])
+                              for key in s3.objects)
+
+
+def test_import_quizzes_reports_quizzes_too_large_to_store(importer, monkeypatch):
+    iqh, run = importer
+    monkeypatch.setattr(iqh, 'ITEM_MAX_BYTES', 2000)
+    dynamodb = FakeDynamoClient()
+
+    response, results = run('\n'.join([_quiz('Small'), _quiz('Large', Description='x' * 2000)]), dynamodb)
+
+    assert response['statusCode'] == 200
+    assert 'QuizID' in results[0]
+    assert results[1]['Error'].startswith('Quiz is too large to store')
+    assert dynamodb.transaction_sizes == [1]
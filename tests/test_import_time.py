@@ -0,0 +1,59 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+LAYER_DIR = ROOT_DIR / 'layers' / 'common' / 'python'
+
+# Cumulative import time budget of each handler module in milliseconds, as
+# reported by `python -X importtime`. Scale them on slow machines with
+# IMPORT_TIME_BUDGET_SCALE.
+IMPORT_TIME_BUDGETS_MS = {
+    'get_quiz': 400,
+    'get_submission': 400,
+    'get_leaderboard': 400,
+    'list_quizzes': 400,
+    'get_user_submissions': 400,
+    'create_quiz': 600,
+    'submit_quiz': 600,
+    'scoring': 600,
+    'retry_quizzes_writes': 600,
+    'publish_catalog': 600,
+    'import_quizzes': 600,
+    'submit_quizzes': 600,
+}
+READ_HANDLERS = ('get_quiz', 'get_submission', 'get_leaderboard', 'list_quizzes', 'get_user_submissions')
+RUNS = 3
+
+
+def _import_handler(function_name):
+    """Import a handler in a fresh interpreter laid out like the Lambda runtime."""
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([str(ROOT_DIR / 'lambdas' / function_name), str(LAYER_DIR)])
+    env['PYTHONDONTWRITEBYTECODE'] = '1'
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import sys, handler; print(" ".join(sys.modules))'],
+        capture_output=True, text=True, env=env, cwd=ROOT_DIR / 'lambdas' / function_name, check=True,
+    )
+    for line in result.stderr.splitlines():
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2].strip() == 'handler':
+            cumulative_us = int(parts[1])
+            return cumulative_us / 1000, set(result.stdout.split())
+    raise AssertionError(f"No import time reported for {function_name}:\n{result.stderr}")
+
+
+@pytest.mark.parametrize('function_name', sorted(IMPORT_TIME_BUDGETS_MS))
+def test_handler_import_time_within_budget(function_name):
+    budget_ms = IMPORT_TIME_BUDGETS_MS[function_name] * float(os.environ.get('IMPORT_TIME_BUDGET_SCALE', '1'))
+    import_ms = min(_import_handler(function_name)[0] for _ in range(RUNS))
+    assert import_ms <= budget_ms, f"{function_name} imports in {import_ms:.1f} ms, budget is {budget_ms:.0f} ms"
+
+
+@pytest.mark.parametrize('function_name', READ_HANDLERS)
+def test_read_handlers_do_not_import_boto3(function_name):
+    _, modules = _import_handler(function_name)
+    assert not {name for name in modules if name == 'boto3' or name.startswith('boto3.')}
@@ -0,0 +1,99 @@
+from decimal import Decimal
+
+import pytest
+from botocore.exceptions import ClientError
+
+from quiz_common import leaderboard
+from quiz_common.leaderboard import LeaderboardUpdateError, merge_top_entries, update_leaderboard
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    delays = []
+    monkeypatch.setattr(leaderboard, 'backoff', delays.append)
+    return delays
+
+
+def _entry(submission_id, score):
+    return {'Username': f'user-{submission_id}', 'Score': Decimal(score), 'SubmissionID': submission_id}
+
+
+class FakeLeaderboardsTable:
+    """Leaderboards table that lets another writer sneak in before the first put."""
+
+    def __init__(self, item=None, concurrent_entry=None):
+        self.item = item
+        self.concurrent_entry = concurrent_entry
+        self.puts = 0
+
+    def get_item(self, Key, ConsistentRead=False):
+        assert ConsistentRead
+        return {'Item': self.item} if self.item else {}
+
+    def put_item(self, Item, ConditionExpression, ExpressionAttributeNames=None, ExpressionAttributeValues=None):
+        self.puts += 1
+        if self.concurrent_entry:
+            entry, self.concurrent_entry = self.concurrent_entry, None
+            version = self.item['Version'] if self.item else 0
+            entries = self.item['TopEntries'] if self.item else []
+            self.item = {'QuizID': Item['QuizID'], 'TopEntries': entries + [entry], 'Version': version + 1}
+        expected = ExpressionAttributeValues[':version'] if ExpressionAttributeValues else None
+        current = self.item['Version'] if self.item else None
+        if expected != current:
+            raise ClientError({'Error': {'Code': 'ConditionalCheckFailedException'}}, 'PutItem')
+        self.item = Item
+
+
+def test_merge_top_entries_sorts_dedupes_and_truncates():
+    entries = [_entry('a', '90'), _entry('b', '80')]
+    merged = merge_top_entries(entries, [_entry('c', '95'), _entry('b', '80'), _entry('d', '10')], size=3)
+    assert [entry['SubmissionID'] for entry in merged] == ['c', 'a', 'b']
+
+
+def test_update_leaderboard_seeds_new_item_from_index():
+    table = FakeLeaderboardsTable()
+    seeded = []
+
+    def seed(quiz_id, size):
+        seeded.append((quiz_id, size))
+        return [_entry('old', '70')]
+
+    assert update_leaderboard(table, 'quiz', [_entry('new', '75')], seed=seed, size=5)
+    assert seeded == [('quiz', 5)]
+    assert [entry['SubmissionID'] for entry in table.item['TopEntries']] == ['new', 'old']
+    assert table.item['Version'] == 1
+
+
+def test_update_leaderboard_retries_lost_race_without_dropping_entries():
+    table = FakeLeaderboardsTable(
+        item={'QuizID': 'quiz', 'TopEntries': [_entry('a', '50')], 'Version': 3},
+        concurrent_entry=_entry('b', '60'),
+    )
+
+    assert update_leaderboard(table, 'quiz', [_entry('c', '55')], size=5)
+    assert table.puts == 2
+    assert table.item['Version'] == 5
+    assert [entry['SubmissionID'] for entry in table.item['TopEntries']] == ['b', 'c', 'a']
+
+
+def test_update_leaderboard_skips_write_when_nothing_enters_top():
+    table = FakeLeaderboardsTable(item={'QuizID': 'quiz', 'TopEntries': [_entry('a', '50')], 'Version': 1})
+    assert not update_leaderboard(table, 'quiz', [_entry('z', '10')], size=1)
+    assert table.puts == 0
+
+
+def test_update_leaderboard_backs_off_and_reports_only_unmerged_entries(no_backoff):
+    class AlwaysLosingTable(FakeLeaderboardsTable):
+        def put_item(self, Item, **kwargs):
+            self.puts += 1
+            raise ClientError({'Error': {'Code': 'ConditionalCheckFailedException'}}, 'PutItem')
+
+    table = AlwaysLosingTable(item={'QuizID': 'quiz', 'TopEntries': [_entry('a', '50')], 'Version': 1})
+
+    with pytest.raises(LeaderboardUpdateError) as raised:
+        update_leaderboard(table, 'quiz', [_entry('a', '50'), _entry('b', '60'), _entry('z', '10')], size=2)
+
+    # 'a' is already on the board and 'z' does not make the top 2
+    assert raised.value.unmerged == {'b'}
+    assert table.puts == leaderboard.LEADERBOARD_MAX_ATTEMPTS
+    assert no_backoff == list(range(1, leaderboard.LEADERBOARD_MAX_ATTEMPTS))
@@ -0,0 +1,98 @@
+import json
+
+
+def _catalog_row(i):
+    return {
+        'QuizID': {'S': f'quiz-{i}'},
+        'Title': {'S': f'Quiz {i}'},
+        'Visibility': {'S': 'Public'},
+        'PublicCatalog': {'S': 'Public'},
+        'CreatedAt': {'N': str(1000 + i)},
+    }
+
+
+class FakeCatalogIndex:
+    """Low-level client serving PublicCatalog-CreatedAt-index from in-memory rows."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    def scan(self, **kwargs):
+        raise AssertionError('listquizzes must not scan the Quizzes table')
+
+    def query(self, **kwargs):
+        self.queries.append(kwargs)
+        assert kwargs['IndexName'] == 'PublicCatalog-CreatedAt-index'
+        assert kwargs['ExpressionAttributeValues'] == {':public': {'S': 'Public'}}
+        rows = sorted(self.rows, key=lambda r: int(r['CreatedAt']['N']), reverse=not kwargs['ScanIndexForward'])
+        start = kwargs.get('ExclusiveStartKey')
+        if start:
+            ids = [r['QuizID']['S'] for r in rows]
+            rows = rows[ids.index(start['QuizID']['S']) + 1:]
+        page = rows[:kwargs['Limit']]
+        response = {'Items': [{k: r[k] for k in ('QuizID', 'Title', 'Visibility')} for r in page]}
+        if len(rows) > kwargs['Limit']:
+            response['LastEvaluatedKey'] = {k: page[-1][k] for k in ('QuizID', 'PublicCatalog', 'CreatedAt')}
+        return response
+
+
+def _patch_client(monkeypatch, handler, client):
+    class FakeClients:
+        def client(self, service_name):
+            assert service_name == 'dynamodb'
+            return client
+
+    monkeypatch.setattr(handler, 'clients', FakeClients(), raising=False)
+
+
+def test_list_quizzes_pages_newest_first(monkeypatch):
+    from lambdas.list_quizzes import handler as lqh
+
+    _patch_client(monkeypatch, lqh, FakeCatalogIndex([_catalog_row(i) for i in range(5)]))
+
+    titles = []
+    params = {'limit': '2'}
+    while True:
+        response = lqh.lambda_handler({'queryStringParameters': params}, None)
+        assert response['statusCode'] == 200
+        body = json.loads(response['body'])
+        titles.extend(quiz['Title'] for quiz in body['Quizzes'])
+        if body['NextCursor'] is None:
+            break
+        params = {'limit': '2', 'cursor': body['NextCursor']}
+
+    assert titles == ['Quiz 4', 'Quiz 3', 'Quiz 2', 'Quiz 1', 'Quiz 0']
+
+
+def test_list_quizzes_without_parameters_keeps_response_shape(monkeypatch):
+    from lambdas.list_quizzes import handler as lqh
+
+    client = FakeCatalogIndex([_catalog_row(0)])
+    _patch_client(monkeypatch, lqh, client)
+
+    response = lqh.lambda_handler({'queryStringParameters': None}, None)
+
+    assert response['statusCode'] == 200
+    assert json.loads(response['body']) == {
+        'Quizzes': [{'QuizID': 'quiz-0', 'Title': 'Quiz 0', 'Visibility': 'Public'}],
+        'NextCursor': None,
+    }
+    assert client.queries[0]['Limit'] == lqh.DEFAULT_LIMIT
+
+
+def test_list_quizzes_rejects_bad_limit_and_cursor(monkeypatch):
+    from lambdas.list_quizzes import handler as lqh
+
+    _patch_client(monkeypatch, lqh, FakeCatalogIndex([]))
+
+    for params in ({'limit': '0'}, {'limit': 'many'}, {'limit': '1000'}, {'cursor': 'garbage'}):
+        response = lqh.lambda_handler({'queryStringParameters': params}, None)
+        assert response['statusCode'] == 400
+
+
+def test_only_public_quizzes_join_the_catalog():
+    from quiz_common.catalog import catalog_attributes
+
+    assert catalog_attributes('Public', now=1.5) == {'CreatedAt': 1500, 'PublicCatalog': 'Public'}
+    assert catalog_attributes('Private', now=1.5) == {'CreatedAt': 1500}
@@ -12,6 +12,12 @@ LOCALSTACK_ENDPOINT = "http://localhost.localstack.cloud:4566"
 API_NAME = "QuizAPI"
 STAGE_NAME = "prod"
 
+# Match the create_quiz circuit breaker defaults
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_RESET_TIMEOUT_SECONDS = 10
+# Requests answered by an open breaker never touch DynamoDB
+OPEN_BREAKER_MAX_LATENCY_SECONDS = 1.0
+
 class TestLocalStackClient:
     client = localstack.sdk.chaos.ChaosClient()
 
@@ -84,3 +90,69 @@ def test_dynamodb_outage(api_endpoint):
     quiz_titles = [quiz['Title'] for quiz in quizzes_list]
     assert "Outage Test Quiz" in quiz_titles
     print("Quiz successfully created after outage resolved.")
+
+
+def _create_quiz(api_endpoint, title):
+    payload = {
+        "Title": title,
+        "Visibility": "Public",
+        "EnableTimer": False,
+        "Questions": [
+            {
+                "QuestionText": "What is the capital of Italy?",
+                "Options": ["A. Milan", "B. Rome", "C. Naples", "D. Turin"],
+                "CorrectAnswer": "B. Rome",
+                "Trivia": "Rome has been a capital for over two millennia."
+            }
+        ]
+    }
+    started = time.monotonic()
+    response = requests.post(
+        f"{api_endpoint}/createquiz",
+        headers={"Content-Type": "application/json"},
+        data=json.dumps(payload)
+    )
+    return response, time.monotonic() - started
+
+
+def test_dynamodb_outage_fails_over_fast_once_the_breaker_is_open(api_endpoint):
+    outage_rule = FaultRule(region="us-east-1", service="dynamodb")
+    titles = []
+
+    with fault_configuration(fault_rules=[outage_rule]):
+        time.sleep(2)
+
+        # These go through DynamoDB's retries and trip the breaker
+        tripping_latencies = []
+        for idx in range(BREAKER_FAILURE_THRESHOLD):
+            title = f"Breaker Trip Quiz {idx}"
+            response, latency = _create_quiz(api_endpoint, title)
+            assert response.status_code == 500
+            titles.append(title)
+            tripping_latencies.append(latency)
+
+        # With the breaker open, quizzes go straight to the SNS retry path
+        open_latencies = []
+        for idx in range(5):
+            title = f"Breaker Open Quiz {idx}"
+            response, latency = _create_quiz(api_endpoint, title)
+            assert response.status_code == 500
+            assert "queued for retry" in response.json().get("message", "")
+            titles.append(title)
+            open_latencies.append(latency)
+
+        print(f"Latency while tripping: {tripping_latencies}, while open: {open_latencies}")
+        assert max(open_latencies) < OPEN_BREAKER_MAX_LATENCY_SECONDS
+        assert max(open_latencies) < min(tripping_latencies)
+
+    # The half-open probe closes the breaker again once DynamoDB is back
+    time.sleep(BREAKER_RESET_TIMEOUT_SECONDS)
+    response, _ = _create_quiz(api_endpoint, "Breaker Recovered Quiz")
+    assert response.status_code == 200
+    titles.append("Breaker Recovered Quiz")
+
+    time.sleep(15)
+    response = requests.get(f"{api_endpoint}/listquizzes")
+    assert response.status_code == 200
+    listed = {quiz['Title'] for quiz in response.json().get('Quizzes', [])}
+    assert set(titles) <= listed
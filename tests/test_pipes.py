@@ -11,6 +11,9 @@ from localstack.sdk.chaos.managers import fault_configuration
 LOCALSTACK_ENDPOINT = "http://localhost.localstack.cloud:4566"
 QUEUE_NAME = "QuizSubmissionQueue"
 SENDER_EMAIL = "admin@localstack.com"
+# Redrive policy of QuizSubmissionQueue in bin/deploy.sh
+MAX_RECEIVE_COUNT = 5
+VISIBILITY_TIMEOUT_SECONDS = 10
 
 class TestLocalStackClient:
     client = localstack.sdk.chaos.ChaosClient()
@@ -40,7 +43,8 @@ class TestLocalStackClient:
             print(f"Message sent to SQS queue {QUEUE_NAME}: {message_body}")
 
             print("Waiting for system to process message during Lambda outage...")
-            time.sleep(15)
+            # The message only reaches the DLQ after its last receive
+            time.sleep(MAX_RECEIVE_COUNT * VISIBILITY_TIMEOUT_SECONDS + 15)
 
         print("Outage resolved, checking SES for notifications...")
 
@@ -0,0 +1,114 @@
+import gzip
+import io
+import json
+
+from botocore.exceptions import ClientError
+
+
+def _record(event_name, quiz_id, new_image=None, old_image=None):
+    record = {'eventName': event_name, 'dynamodb': {'Keys': {'QuizID': {'S': quiz_id}}}}
+    if new_image is not None:
+        record['dynamodb']['NewImage'] = new_image
+    if old_image is not None:
+        record['dynamodb']['OldImage'] = old_image
+    return record
+
+
+def _image(quiz_id, created_at, public=True, questions=2):
+    image = {
+        'QuizID': {'S': quiz_id},
+        'Title': {'S': f'Title {quiz_id}'},
+        'Visibility': {'S': 'Public' if public else 'Private'},
+        'CreatedAt': {'N': str(created_at)},
+        'Questions': {'L': [{'M': {}} for _ in range(questions)]},
+    }
+    if public:
+        image['PublicCatalog'] = {'S': 'Public'}
+    return image
+
+
+class FakeS3:
+    def __init__(self, conflicts=0):
+        self.objects = {}
+        self.conflicts = conflicts
+        self.puts = []
+
+    def get_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise ClientError({'Error': {'Code': 'NoSuchKey'}}, 'GetObject')
+        body, etag, encoding = self.objects[Key]
+        return {'Body': io.BytesIO(body), 'ETag': etag, 'ContentEncoding': encoding}
+
+    def put_object(self, Bucket, Key, Body, ContentEncoding, IfMatch=None, IfNoneMatch=None, **kwargs):
+        self.puts.append(dict(kwargs, Key=Key, IfMatch=IfMatch, IfNoneMatch=IfNoneMatch))
+        current = self.objects.get(Key)
+        if self.conflicts:
+            # Another writer got in between our read and write
+            self.conflicts -= 1
+            self.objects[Key] = (gzip.compress(b'{"Quizzes": []}'), '"other"', 'gzip')
+            raise ClientError({'Error': {'Code': 'PreconditionFailed'}}, 'PutObject')
+        if (IfNoneMatch == '*' and current) or (IfMatch and (not current or current[1] != IfMatch)):
+            raise ClientError({'Error': {'Code': 'PreconditionFailed'}}, 'PutObject')
+        self.objects[Key] = (Body, f'"etag-{len(self.puts)}"', ContentEncoding)
+
+    def snapshot(self, handler):
+        body, _, _ = self.objects[handler.CATALOG_OBJECT_KEY]
+        return json.loads(gzip.decompress(body))
+
+
+def _patch_s3(monkeypatch, handler, s3):
+    class FakeClients:
+        def client(self, service_name):
+            assert service_name == 's3'
+            return s3
+
+    monkeypatch.setattr(handler, 'clients', FakeClients(), raising=False)
+
+
+def test_publish_catalog_adds_updates_and_removes_public_quizzes(monkeypatch):
+    from lambdas.publish_catalog import handler as pch
+
+    s3 = FakeS3()
+    _patch_s3(monkeypatch, pch, s3)
+
+    pch.lambda_handler({'Records': [
+        _record('INSERT', 'old', _image('old', 1)),
+        _record('INSERT', 'new', _image('new', 2, questions=5)),
+        _record('INSERT', 'gone', _image('gone', 3)),
+    ]}, None)
+    pch.lambda_handler({'Records': [
+        _record('REMOVE', 'gone', old_image=_image('gone', 3)),
+        _record('MODIFY', 'old', _image('old', 1, public=False), _image('old', 1)),
+    ]}, None)
+
+    assert s3.snapshot(pch) == {'Quizzes': [
+        {'QuizID': 'new', 'Title': 'Title new', 'QuestionCount': 5, 'CreatedAt': 2},
+    ]}
+    assert s3.puts[0]['IfNoneMatch'] == '*'
+    assert s3.puts[1]['IfMatch'] == '"etag-1"'
+    assert s3.puts[1]['CacheControl'] == pch.CATALOG_CACHE_CONTROL
+    assert s3.puts[1]['ContentType'] == 'application/json'
+
+
+def test_publish_catalog_ignores_private_quizzes(monkeypatch):
+    from lambdas.publish_catalog import handler as pch
+
+    s3 = FakeS3()
+    _patch_s3(monkeypatch, pch, s3)
+
+    pch.lambda_handler({'Records': [_record('INSERT', 'secret', _image('secret', 1, public=False))]}, None)
+
+    assert s3.puts == []
+
+
+def test_publish_catalog_retries_after_concurrent_update(monkeypatch):
+    from lambdas.publish_catalog import handler as pch
+
+    s3 = FakeS3(conflicts=1)
+    _patch_s3(monkeypatch, pch, s3)
+
+    pch.lambda_handler({'Records': [_record('INSERT', 'quiz', _image('quiz', 1))]}, None)
+
+    assert len(s3.puts) == 2
+    assert s3.puts[1]['IfMatch'] == '"other"'
+    assert [quiz['QuizID'] for quiz in s3.snapshot(pch)['Quizzes']] == ['quiz']
@@ -0,0 +1,144 @@
+import json
+from decimal import Decimal
+
+import pytest
+from botocore.exceptions import ClientError
+
+
+class FakeQuizzesTable:
+    """Quizzes table answering conditional puts and consistent reads."""
+
+    def __init__(self, stored=None, failing_keys=()):
+        self.stored = dict(stored or {})
+        self.failing_keys = set(failing_keys)
+        self.puts = []
+        self.reads = []
+
+    def put_item(self, Item, ConditionExpression, ExpressionAttributeNames):
+        assert ConditionExpression == 'attribute_not_exists(#key)'
+        assert ExpressionAttributeNames == {'#key': 'QuizID'}
+        self.puts.append(Item['QuizID'])
+        if Item['QuizID'] in self.failing_keys:
+            raise ClientError({'Error': {'Code': 'InternalServerError'}}, 'PutItem')
+        if Item['QuizID'] in self.stored:
+            raise ClientError({'Error': {'Code': 'ConditionalCheckFailedException'}}, 'PutItem')
+        self.stored[Item['QuizID']] = Item
+
+    def get_item(self, Key, ConsistentRead):
+        assert ConsistentRead
+        self.reads.append(Key['QuizID'])
+        item = self.stored.get(Key['QuizID'])
+        return {'Item': item} if item else {}
+
+
+class FakeDynamoDB:
+    def __init__(self, table):
+        self.table = table
+
+    def Table(self, name):
+        assert name == 'Quizzes'
+        return self.table
+
+
+class FakeClients:
+    def __init__(self, table):
+        self.dynamodb = FakeDynamoDB(table)
+
+    def resource(self, service_name):
+        assert service_name == 'dynamodb'
+        return self.dynamodb
+
+
+def _item(quiz_id, title='Replayed'):
+    return {'QuizID': quiz_id, 'Title': title, 'TimerSeconds': 1.5}
+
+
+def _record(message_id, quiz_id, title='Replayed', table_name='Quizzes'):
+    message = {'TableName': table_name, 'Item': _item(quiz_id, title)}
+    return {'messageId': message_id, 'body': json.dumps({'Message': json.dumps(message)})}
+
+
+@pytest.fixture
+def replay(monkeypatch):
+    from lambdas.retry_quizzes_writes import handler as rqh
+
+    def run(table, records):
+        monkeypatch.setattr(rqh, 'clients', FakeClients(table), raising=False)
+        return rqh.lambda_handler({'Records': records}, None)
+
+    return run
+
+
+def test_replay_writes_each_quiz_with_a_conditional_put(replay):
+    table = FakeQuizzesTable()
+
+    response = replay(table, [_record(f'm{idx}', f'quiz-{idx}') for idx in range(30)])
+
+    assert response == {'batchItemFailures': []}
+    assert len(table.stored) == 30
+    assert table.stored['quiz-0']['TimerSeconds'] == Decimal('1.5')
+    # No read unless a put hits an existing key
+    assert table.reads == []
+
+
+def test_replay_of_an_already_stored_write_succeeds(replay):
+    stored = {**_item('quiz-0'), 'TimerSeconds': Decimal('1.5')}
+    table = FakeQuizzesTable(stored={'quiz-0': stored})
+
+    response = replay(table, [_record('m0', 'quiz-0'), _record('m1', 'quiz-1'), _record('m2', 'quiz-1')])
+
+    assert response == {'batchItemFailures': []}
+    assert table.puts == ['quiz-0', 'quiz-1']
+
+
+def test_replay_never_overwrites_another_quiz_and_reports_the_conflict(replay, capsys):
+    table = FakeQuizzesTable(stored={'quiz-0': {'QuizID': 'quiz-0', 'Title': 'Newer'}})
+
+    response = replay(table, [_record('m0', 'quiz-0'), _record('m1', 'quiz-1')])
+
+    assert response == {'batchItemFailures': [{'itemIdentifier': 'm0'}]}
+    assert table.stored['quiz-0']['Title'] == 'Newer'
+    assert 'quiz-0 is taken by another item' in capsys.readouterr().out
+
+
+def test_replay_reports_only_the_failed_records(replay):
+    table = FakeQuizzesTable(failing_keys={'quiz-throttled'})
+
+    response = replay(table, [
+        _record('m0', 'quiz-0'),
+        _record('m1', 'quiz-throttled'),
+        _record('m2', 'quiz-1'),
+        _record('m3', 'quiz-throttled'),
+    ])
+
+    assert response == {'batchItemFailures': [{'itemIdentifier': 'm1'}, {'itemIdentifier': 'm3'}]}
+    assert set(table.stored) == {'quiz-0', 'quiz-1'}
+
+
+def test_replay_discards_messages_that_can_never_succeed(replay):
+    table = FakeQuizzesTable()
+
+    response = replay(table, [
+        {'messageId': 'm0', 'body': 'not json'},
+        _record('m1', 'quiz-1', table_name='Unknown'),
+        _record('m2', 'quiz-2'),
+    ])
+
+    assert response == {'batchItemFailures': []}
+    assert set(table.stored) == {'quiz-2'}
+
+
+def test_replay_stores_quizzes_queued_with_inline_questions_in_the_current_shape(replay):
+    table = FakeQuizzesTable()
+    question = {'QuestionText': 'Q?', 'Options': ['A', 'B'], 'CorrectAnswer': 'A', 'Trivia': 'T'}
+    message = {'TableName': 'Quizzes', 'Item': dict(_item('quiz-0'), Questions=[question], PublicView='{}')}
+
+    response = replay(table, [{'messageId': 'm0', 'body': json.dumps({'Message': json.dumps(message)})}])
+
+    assert response == {'batchItemFailures': []}
+    stored = table.stored['quiz-0']
+    assert 'Questions' not in stored
+    assert stored['AnswerKey'] == ['A']
+    view = json.loads(stored['PublicView'])
+    assert view['QuizID'] == 'quiz-0'
+    assert view['Questions'] == [{'QuestionText': 'Q?', 'Options': ['A', 'B'], 'Trivia': 'T'}]
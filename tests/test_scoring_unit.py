@@ -0,0 +1,362 @@
+import json
+from decimal import Decimal
+
+import pytest
+
+
+QUIZ = {
+    'QuizID': 'quiz-abc',
+    'EnableTimer': False,
+    'Questions': [
+        {'QuestionText': 'Q1', 'CorrectAnswer': 'A'},
+        {'QuestionText': 'Q2', 'CorrectAnswer': 'B'},
+    ],
+}
+
+
+class FakeSubmissionsTable:
+    def __init__(self, resource):
+        self.resource = resource
+
+    def query(self, **kwargs):
+        quiz_id = kwargs['ExpressionAttributeValues'][':quiz_id']
+        items = [item for item in self.resource.items if item['QuizID'] == quiz_id]
+        items.sort(key=lambda item: item['Score'], reverse=True)
+        return {'Items': items[:kwargs['Limit']]}
+
+
+class FakeLeaderboardsTable:
+    def __init__(self):
+        self.items = {}
+
+    def get_item(self, Key, ConsistentRead=False):
+        item = self.items.get(Key['QuizID'])
+        return {'Item': item} if item else {}
+
+    def put_item(self, Item, **kwargs):
+        self.items[Item['QuizID']] = Item
+
+
+class FakeDynamoResource:
+    def __init__(self, quizzes, unprocessed_rounds=0, failing_ids=(), unprocessed_write_rounds=0):
+        self.quizzes = quizzes
+        self.unprocessed_rounds = unprocessed_rounds
+        self.unprocessed_write_rounds = unprocessed_write_rounds
+        self.failing_ids = set(failing_ids)
+        self.batch_get_calls = []
+        self.batch_write_calls = []
+        self.items = []
+        self.leaderboards = FakeLeaderboardsTable()
+
+    def Table(self, name):
+        if name == 'Leaderboards':
+            return self.leaderboards
+        assert name == 'UserSubmissions'
+        return FakeSubmissionsTable(self)
+
+    def batch_get_item(self, RequestItems):
+        self.batch_get_calls.append(RequestItems)
+        keys = RequestItems['Quizzes']['Keys']
+        if self.unprocessed_rounds:
+            # Hand back every key unprocessed to exercise the retry loop
+            self.unprocessed_rounds -= 1
+            return {'Responses': {'Quizzes': []}, 'UnprocessedKeys': RequestItems}
+        found = [self.quizzes[k['QuizID']] for k in keys if k['QuizID'] in self.quizzes]
+        return {'Responses': {'Quizzes': found}, 'UnprocessedKeys': {}}
+
+    def batch_write_item(self, RequestItems):
+        requests = RequestItems['UserSubmissions']
+        assert len(requests) <= 25
+        self.batch_write_calls.append(requests)
+        if self.unprocessed_write_rounds:
+            self.unprocessed_write_rounds -= 1
+            return {'UnprocessedItems': RequestItems}
+        unprocessed = []
+        for request in requests:
+            item = request['PutRequest']['Item']
+            if item['SubmissionID'] in self.failing_ids:
+                unprocessed.append(request)
+            else:
+                self.items.append(item)
+        return {'UnprocessedItems': {'UserSubmissions': unprocessed} if unprocessed else {}}
+
+
+class FakeStepFunctions:
+    def __init__(self, failing_arns=()):
+        self.failing_arns = set(failing_arns)
+        self.executions = []
+
+    def start_execution(self, stateMachineArn, input):
+        if stateMachineArn in self.failing_arns:
+            raise Exception('ExecutionLimitExceeded')
+        self.executions.append((stateMachineArn.rsplit(':', 1)[-1], json.loads(input)))
+
+
+class FakeClients:
+    def __init__(self, resource, stepfunctions=None):
+        self._resource = resource
+        self._stepfunctions = stepfunctions or FakeStepFunctions()
+
+    def resource(self, service_name):
+        assert service_name == 'dynamodb'
+        return self._resource
+
+    def client(self, service_name):
+        assert service_name == 'stepfunctions'
+        return self._stepfunctions
+
+
+@pytest.fixture
+def scoring(monkeypatch):
+    from lambdas.scoring import handler as sh
+
+    sh.answer_key_cache.clear()
+    monkeypatch.setattr(sh, 'backoff', lambda attempt: None)
+    return sh
+
+
+def _event(*quiz_ids, email=None):
+    records = []
+    for i, quiz_id in enumerate(quiz_ids):
+        body = {
+            'SubmissionID': f'sub-{i}',
+            'Username': f'user{i}',
+            'QuizID': quiz_id,
+            'Answers': {
+                '0': {'Answer': 'A', 'TimeTaken': 1},
+                '1': {'Answer': 'C', 'TimeTaken': 1},
+            },
+        }
+        if email:
+            body['Email'] = email
+        records.append({'messageId': f'msg-{i}', 'body': json.dumps(body)})
+    return {'Records': records}
+
+
+def test_scoring_fetches_distinct_quizzes_once_per_batch(monkeypatch, scoring):
+    resource = FakeDynamoResource({'quiz-abc': QUIZ})
+    monkeypatch.setattr(scoring, 'clients', FakeClients(resource), raising=False)
+
+    scoring.lambda_handler(_event('quiz-abc', 'quiz-abc', 'quiz-abc', 'missing'), None)
+
+    assert len(resource.batch_get_calls) == 1
+    requested = {k['QuizID'] for k in resource.batch_get_calls[0]['Quizzes']['Keys']}
+    assert requested == {'quiz-abc', 'missing'}
+    assert [item['SubmissionID'] for item in resource.items] == ['sub-0', 'sub-1', 'sub-2']
+    assert all(item['Score'] == Decimal('100.0') for item in resource.items)
+
+
+def test_scoring_reuses_cached_answer_keys_across_invocations(monkeypatch, scoring):
+    resource = FakeDynamoResource({'quiz-abc': QUIZ})
+    monkeypatch.setattr(scoring, 'clients', FakeClients(resource), raising=False)
+
+    scoring.lambda_handler(_event('quiz-abc'), None)
+    scoring.lambda_handler(_event('quiz-abc', 'quiz-abc'), None)
+
+    assert len(resource.batch_get_calls) == 1
+    assert len(resource.items) == 3
+
+
+def test_scoring_retries_unprocessed_keys(monkeypatch, scoring):
+    resource = FakeDynamoResource({'quiz-abc': QUIZ}, unprocessed_rounds=2)
+    monkeypatch.setattr(scoring, 'clients', FakeClients(resource), raising=False)
+
+    scoring.lambda_handler(_event('quiz-abc'), None)
+
+    assert len(resource.batch_get_calls) == 3
+    assert len(resource.items) == 1
+
+
+def test_scoring_reports_only_failed_records(monkeypatch, scoring):
+    resource = FakeDynamoResource({'quiz-abc': QUIZ}, failing_ids={'sub-1'})
+    monkeypatch.setattr(scoring, 'clients', FakeClients(resource), raising=False)
+
+    event = _event('quiz-abc', 'quiz-abc', 'missing')
+    event['Records'].append({'messageId': 'msg-bad', 'body': 'not json'})
+    response = scoring.lambda_handler(event, None)
+
+    # Unknown quizzes and malformed bodies are dropped, unwritten submissions are retried
+    assert response == {'batchItemFailures': [{'itemIdentifier': 'msg-1'}]}
+    assert [item['SubmissionID'] for item in resource.items] == ['sub-0']
+    assert len(resource.batch_write_calls) == scoring.BATCH_MAX_ATTEMPTS
+
+
+def test_scoring_flushes_submissions_in_chunks_and_retries_unprocessed(monkeypatch, scoring):
+    resource = FakeDynamoResource({'quiz-abc': QUIZ}, unprocessed_write_rounds=1)
+    monkeypatch.setattr(scoring, 'clients', FakeClients(resource), raising=False)
+
+    response = scoring.lambda_handler(_event(*['quiz-abc'] * 30), None)
+
+    assert response == {'batchItemFailures': []}
+    assert [len(requests) for requests in resource.batch_write_calls] == [25, 25, 5]
+    assert len(resource.items) == 30
+
+
+def test_scoring_reports_whole_batch_when_quizzes_cannot_be_loaded(monkeypatch, scoring):
+    resource = FakeDynamoResource({'quiz-abc': QUIZ}, unprocessed_rounds=10)
+    monkeypatch.setattr(scoring, 'clients', FakeClients(resource), raising=False)
+
+    response = scoring.lambda_handler(_event('quiz-abc', 'quiz-abc'), None)
+
+    assert response == {'batchItemFailures': [{'itemIdentifier': 'msg-0'}, {'itemIdentifier': 'msg-1'}]}
+    assert resource.items == []
+    assert resource.batch_write_calls == []
+
+
+def test_scoring_sends_result_emails_in_one_batch_execution(monkeypatch, scoring):
+    resource = FakeDynamoResource({'quiz-abc': QUIZ}, failing_ids={'sub-2'})
+    stepfunctions = FakeStepFunctions()
+    monkeypatch.setattr(scoring, 'clients', FakeClients(resource, stepfunctions), raising=False)
+
+    response = scoring.lambda_handler(_event('quiz-abc', 'quiz-abc', 'quiz-abc', email='user@example.com'), None)
+
+    assert response == {'batchItemFailures': [{'itemIdentifier': 'msg-2'}]}
+    assert len(stepfunctions.executions) == 1
+    name, execution_input = stepfunctions.executions[0]
+    assert name == 'SendEmailBatchStateMachine'
+    assert [n['SubmissionID'] for n in execution_input['Notifications']] == ['sub-0', 'sub-1']
+    assert execution_input['Notifications'][0] == {
+        'SubmissionID': 'sub-0',
+        'Username': 'user0',
+        'Email': 'user@example.com',
+        'Score': 100.0,
+        'TotalQuestions': 2,
+    }
+
+
+def test_scoring_falls_back_to_per_submission_emails(monkeypatch, scoring):
+    resource = FakeDynamoResource({'quiz-abc': QUIZ})
+    stepfunctions = FakeStepFunctions(failing_arns={scoring.SEND_EMAIL_BATCH_STATE_MACHINE_ARN})
+    monkeypatch.setattr(scoring, 'clients', FakeClients(resource, stepfunctions), raising=False)
+
+    response = scoring.lambda_handler(_event('quiz-abc', 'quiz-abc', email='user@example.com'), None)
+
+    assert response == {'batchItemFailures': []}
+    assert [name for name, _ in stepfunctions.executions] == ['SendEmailStateMachine'] * 2
+    assert [execution_input['SubmissionID'] for _, execution_input in stepfunctions.executions] == ['sub-0', 'sub-1']
+
+
+def test_scoring_maintains_materialized_leaderboard(monkeypatch, scoring):
+    resource = FakeDynamoResource({'quiz-abc': QUIZ}, failing_ids={'sub-1'})
+    monkeypatch.setattr(scoring, 'clients', FakeClients(resource), raising=False)
+
+    scoring.lambda_handler(_event('quiz-abc', 'quiz-abc', 'quiz-abc'), None)
+
+    leaderboard = resource.leaderboards.items['quiz-abc']
+    assert leaderboard['Version'] == 1
+    assert [entry['SubmissionID'] for entry in leaderboard['TopEntries']] == ['sub-0', 'sub-2']
+
+
+def test_scoring_retries_only_the_records_missing_from_a_contended_leaderboard(monkeypatch, scoring):
+    from botocore.exceptions import ClientError
+
+    from quiz_common import leaderboard
+
+    monkeypatch.setattr(leaderboard, 'backoff', lambda attempt: None)
+    resource = FakeDynamoResource({'quiz-abc': QUIZ})
+    monkeypatch.setattr(scoring, 'clients', FakeClients(resource), raising=False)
+    scoring.lambda_handler(_event('quiz-abc'), None)
+
+    def lose_race(Item, **kwargs):
+        raise ClientError({'Error': {'Code': 'ConditionalCheckFailedException'}}, 'PutItem')
+
+    monkeypatch.setattr(resource.leaderboards, 'put_item', lose_race)
+    # sub-0 is redelivered alongside sub-1, its entry is already merged
+    response = scoring.lambda_handler(_event('quiz-abc', 'quiz-abc'), None)
+
+    assert response == {'batchItemFailures': [{'itemIdentifier': 'msg-1'}]}
+
+
+def _legacy_score(quiz, user_answers):
+    """The per-question Decimal loop the scoring engine replaced."""
+    from decimal import localcontext
+
+    with localcontext() as ctx:
+        ctx.prec = 6
+        correct_answers = [q['CorrectAnswer'] for q in quiz['Questions']]
+        enable_timer = quiz.get('EnableTimer', False)
+        timer_seconds = quiz.get('TimerSeconds', None)
+        score = Decimal('0.0')
+        for idx, correct in enumerate(correct_answers):
+            question_idx = str(idx)
+            if question_idx in user_answers:
+                user_answer_data = user_answers[question_idx]
+                time_taken = Decimal(str(user_answer_data['TimeTaken']))
+                if str(user_answer_data['Answer']) == str(correct):
+                    if enable_timer and timer_seconds is not None:
+                        timer_seconds_decimal = Decimal(str(timer_seconds))
+                        if time_taken > timer_seconds_decimal:
+                            question_score = Decimal('0.0')
+                        else:
+                            question_score = Decimal('100.0') * (Decimal('1.0') - (time_taken / timer_seconds_decimal))
+                            if question_score < Decimal('0.0'):
+                                question_score = Decimal('0.0')
+                    else:
+                        question_score = Decimal('100.0')
+                    score += question_score
+        return score
+
+
+@pytest.mark.parametrize('timer_seconds', [None, 7, 10, 30, 4000])
+def test_scoring_engine_matches_legacy_rounding(timer_seconds):
+    import random
+    from scoring_engine import compile_answer_key
+
+    rng = random.Random(timer_seconds or 0)
+    questions = [{'CorrectAnswer': rng.choice('ABCD')} for _ in range(1500)]
+    quiz = {'Questions': questions, 'EnableTimer': timer_seconds is not None, 'TimerSeconds': timer_seconds}
+    answer_key = compile_answer_key(quiz)
+
+    for _ in range(20):
+        answers = {}
+        for idx in range(rng.randrange(1, len(questions))):
+            limit = timer_seconds or 30
+            time_taken = rng.choice([
+                rng.randint(0, limit + 2),
+                round(rng.uniform(0, limit + 1), rng.randint(1, 4)),
+                round(rng.uniform(0, 0.01), 6),
+            ])
+            answers[str(idx)] = {'Answer': rng.choice('ABCD'), 'TimeTaken': time_taken}
+        assert answer_key.score(answers) == _legacy_score(quiz, answers)
+
+
+def test_scoring_engine_uses_the_compact_answer_key_of_offloaded_quizzes():
+    from scoring_engine import compile_answer_key
+
+    inline = {'Questions': [{'CorrectAnswer': 'A'}, {'CorrectAnswer': 'C'}], 'EnableTimer': True, 'TimerSeconds': 10}
+    offloaded = {'AnswerKey': ['A', 'C'], 'QuestionCount': 2, 'EnableTimer': True, 'TimerSeconds': 10}
+    answers = {'0': {'Answer': 'A', 'TimeTaken': 2}, '1': {'Answer': 'C', 'TimeTaken': 5}}
+
+    assert compile_answer_key(offloaded).score(answers) == compile_answer_key(inline).score(answers)
+    assert compile_answer_key(offloaded).total_questions == 2
+
+
+def test_scoring_stores_user_answers_packed(monkeypatch, scoring):
+    from quiz_common.user_answers import unpack_user_answers
+
+    resource = FakeDynamoResource({'quiz-abc': QUIZ})
+    monkeypatch.setattr(scoring, 'clients', FakeClients(resource), raising=False)
+
+    scoring.lambda_handler(_event('quiz-abc'), None)
+
+    stored = resource.items[0]['UserAnswers']
+    assert isinstance(stored, bytes)
+    assert unpack_user_answers(stored) == {
+        '0': {'Answer': 'A', 'TimeTaken': Decimal('1')},
+        '1': {'Answer': 'C', 'TimeTaken': Decimal('1')},
+    }
+
+
+def test_scoring_keeps_the_submission_time_of_the_message(monkeypatch, scoring):
+    resource = FakeDynamoResource({'quiz-abc': QUIZ})
+    monkeypatch.setattr(scoring, 'clients', FakeClients(resource), raising=False)
+    event = _event('quiz-abc', 'quiz-abc')
+    body = json.loads(event['Records'][0]['body'])
+    body['SubmittedAt'] = 1700000000000
+    event['Records'][0]['body'] = json.dumps(body)
+
+    scoring.lambda_handler(event, None)
+
+    assert resource.items[0]['SubmittedAt'] == 1700000000000
+    # Messages queued before submissions were stamped get the scoring time
+    assert resource.items[1]['SubmittedAt'] > 1700000000000
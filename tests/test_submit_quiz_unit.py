@@ -0,0 +1,187 @@
+import json
+from decimal import Decimal
+
+import pytest
+from boto3.dynamodb.types import TypeSerializer
+
+_serializer = TypeSerializer()
+
+QUIZZES = {
+    'quiz-abc': {
+        'QuizID': 'quiz-abc',
+        'QuestionCount': Decimal(3),
+        'EnableTimer': True,
+        'TimerSeconds': Decimal(10),
+        'Questions': [{'CorrectAnswer': 'A'}] * 3,
+    },
+    'quiz-legacy': {
+        'QuizID': 'quiz-legacy',
+        'EnableTimer': False,
+        'Questions': [{'CorrectAnswer': 'A'}] * 2,
+    },
+}
+
+
+class FakeQuizzesTable:
+    """Low-level client answering GetItem from the QUIZZES items."""
+
+    def __init__(self, quizzes):
+        self.quizzes = quizzes
+        self.reads = 0
+        self.projections = []
+
+    def get_item(self, TableName, Key, ProjectionExpression=None):
+        assert TableName == 'Quizzes'
+        self.reads += 1
+        self.projections.append(ProjectionExpression)
+        item = self.quizzes.get(Key['QuizID']['S'])
+        if item is None:
+            return {}
+        names = [name.strip() for name in ProjectionExpression.split(',')]
+        return {'Item': {name: _serializer.serialize(value) for name, value in item.items() if name in names}}
+
+
+class FakeSQS:
+    def __init__(self):
+        self.messages = []
+        self.lookups = 0
+
+    def get_queue_url(self, QueueName):
+        self.lookups += 1
+        return {'QueueUrl': f'https://sqs.local/{QueueName}'}
+
+    def send_message(self, QueueUrl, MessageBody):
+        self.messages.append(json.loads(MessageBody))
+
+
+class FakeClients:
+    def __init__(self, table, sqs):
+        self.table = table
+        self.sqs = sqs
+
+    def client(self, service_name):
+        return {'dynamodb': self.table, 'sqs': self.sqs}[service_name]
+
+
+@pytest.fixture
+def submit(monkeypatch):
+    from lambdas.submit_quiz import handler as sqh
+    from quiz_common import submissions
+
+    submissions.quiz_shape_cache.clear()
+    monkeypatch.setattr(submissions, '_queue_url', None)
+    table = FakeQuizzesTable(QUIZZES)
+    sqs = FakeSQS()
+    monkeypatch.setattr(sqh, 'clients', FakeClients(table, sqs), raising=False)
+    return sqh, table, sqs
+
+
+def _event(quiz_id, answers=None):
+    return {'body': json.dumps({
+        'Username': 'user1',
+        'QuizID': quiz_id,
+        'Answers': answers or {'0': {'Answer': 'A', 'TimeTaken': 3}},
+    })}
+
+
+def test_submit_quiz_checks_each_quiz_once_while_cached(submit):
+    from quiz_common import submissions
+
+    sqh, table, sqs = submit
+
+    for _ in range(3):
+        assert sqh.lambda_handler(_event('quiz-abc'), None)['statusCode'] == 200
+
+    assert table.reads == 1
+    assert len(sqs.messages) == 3
+    assert sqs.lookups == 1
+    assert submissions.quiz_shape_cache.stats() == {'entries': 1, 'hits': 2, 'misses': 1}
+
+
+def test_submit_quiz_caches_unknown_quizzes(submit):
+    sqh, table, sqs = submit
+
+    for _ in range(2):
+        response = sqh.lambda_handler(_event('quiz-missing'), None)
+        assert response['statusCode'] == 400
+
+    assert table.reads == 1
+    assert sqs.messages == []
+
+
+def test_submit_quiz_uses_the_configured_queue_url(submit, monkeypatch):
+    from quiz_common import submissions
+
+    sqh, table, sqs = submit
+    monkeypatch.setattr(submissions, '_queue_url', 'https://sqs.local/configured')
+
+    assert sqh.lambda_handler(_event('quiz-abc'), None)['statusCode'] == 200
+    assert sqs.lookups == 0
+
+
+def test_submit_quiz_reads_only_the_quiz_shape(submit):
+    sqh, table, sqs = submit
+
+    response = sqh.lambda_handler(_event('quiz-abc', {'2': {'Answer': 'B', 'TimeTaken': 10, 'Extra': 'x' * 100}}), None)
+
+    assert response['statusCode'] == 200
+    assert table.projections == ['QuizID, QuestionCount']
+    assert sqs.messages[0]['Answers'] == {'2': {'Answer': 'B', 'TimeTaken': 10}}
+
+
+def test_submit_quiz_accepts_answers_given_after_the_timer(submit):
+    sqh, table, sqs = submit
+
+    response = sqh.lambda_handler(_event('quiz-abc', {'0': {'Answer': 'A', 'TimeTaken': 11}}), None)
+
+    # scoring gives late answers no points, the submission itself still counts
+    assert response['statusCode'] == 200
+    assert sqs.messages[0]['Answers'] == {'0': {'Answer': 'A', 'TimeTaken': 11}}
+
+
+@pytest.mark.parametrize('answers, error', [
+    ({'3': {'Answer': 'A', 'TimeTaken': 1}}, 'Question 3 is out of range, the quiz has 3 questions'),
+    ({'01': {'Answer': 'A', 'TimeTaken': 1}}, "Invalid question index '01'"),
+    ({'-1': {'Answer': 'A', 'TimeTaken': 1}}, "Invalid question index '-1'"),
+    ({'0': {'Answer': 'A' * 1001, 'TimeTaken': 1}}, 'Answer for question 0 is longer than 1000 characters'),
+    ({'0': {'Answer': ['A'], 'TimeTaken': 1}}, 'Answer for question 0 must be a string'),
+    ({'0': {'Answer': 'A', 'TimeTaken': float('nan')}}, 'TimeTaken for question 0 must be non-negative'),
+    ({'0': 'A'}, "Answer for question 0 must include 'Answer' and 'TimeTaken'"),
+])
+def test_submit_quiz_rejects_answers_the_quiz_cannot_score(submit, answers, error):
+    sqh, table, sqs = submit
+
+    response = sqh.lambda_handler(_event('quiz-abc', answers), None)
+
+    assert response['statusCode'] == 400
+    assert json.loads(response['body'])['error'] == error
+    assert sqs.messages == []
+
+
+def test_submit_quiz_rejects_duplicate_answers(submit):
+    sqh, table, sqs = submit
+    body = '{"Username": "user1", "QuizID": "quiz-abc", "Answers": {"0": {"Answer": "A", "TimeTaken": 1}, ' \
+           '"0": {"Answer": "B", "TimeTaken": 2}}}'
+
+    response = sqh.lambda_handler({'body': body}, None)
+
+    assert response['statusCode'] == 400
+    assert json.loads(response['body'])['error'] == "Duplicate key '0'"
+    assert table.reads == 0
+
+
+def test_submit_quiz_rejects_oversized_payloads(submit):
+    sqh, table, sqs = submit
+
+    response = sqh.lambda_handler({'body': ' ' * (sqh.SUBMISSION_MAX_BYTES + 1)}, None)
+
+    assert response['statusCode'] == 413
+    assert table.reads == 0
+
+
+def test_submit_quiz_counts_the_questions_of_legacy_quizzes_once(submit):
+    sqh, table, sqs = submit
+
+    assert sqh.lambda_handler(_event('quiz-legacy', {'1': {'Answer': 'A', 'TimeTaken': 99}}), None)['statusCode'] == 200
+    assert sqh.lambda_handler(_event('quiz-legacy', {'2': {'Answer': 'A', 'TimeTaken': 1}}), None)['statusCode'] == 400
+    assert table.projections == ['QuizID, QuestionCount', 'Questions']
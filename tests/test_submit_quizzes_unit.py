@@ -0,0 +1,164 @@
+import json
+
+import pytest
+
+
+class FakeDynamoDB:
+    """Low-level client answering BatchGetItem for a set of five-question quizzes."""
+
+    def __init__(self, quiz_ids, unprocessed_once=False):
+        self.quiz_ids = quiz_ids
+        self.unprocessed_once = unprocessed_once
+        self.requested = []
+
+    def batch_get_item(self, RequestItems):
+        request = RequestItems['Quizzes']
+        assert request['ProjectionExpression'] == 'QuizID, QuestionCount'
+        keys = [key['QuizID']['S'] for key in request['Keys']]
+        assert len(keys) <= 100
+        self.requested.append(keys)
+        unprocessed = {}
+        if self.unprocessed_once and len(keys) > 1:
+            self.unprocessed_once = False
+            unprocessed = {'Quizzes': dict(request, Keys=request['Keys'][1:])}
+            keys = keys[:1]
+        found = [{'QuizID': {'S': quiz_id}, 'QuestionCount': {'N': '5'}} for quiz_id in keys if quiz_id in self.quiz_ids]
+        return {'Responses': {'Quizzes': found}, 'UnprocessedKeys': unprocessed}
+
+
+class FakeSQS:
+    def __init__(self, fail_ids=()):
+        self.fail_ids = set(fail_ids)
+        self.batches = []
+
+    def get_queue_url(self, QueueName):
+        return {'QueueUrl': f'https://sqs.local/{QueueName}'}
+
+    def send_message_batch(self, QueueUrl, Entries):
+        assert len(Entries) <= 10
+        self.batches.append([json.loads(entry['MessageBody']) for entry in Entries])
+        failed = [
+            {'Id': entry['Id'], 'Code': 'InternalError', 'Message': 'try again', 'SenderFault': False}
+            for entry in Entries if entry['Id'] in self.fail_ids
+        ]
+        successful = [{'Id': entry['Id']} for entry in Entries if entry['Id'] not in self.fail_ids]
+        return {'Successful': successful, 'Failed': failed}
+
+
+class FakeClients:
+    def __init__(self, dynamodb, sqs):
+        self.services = {'dynamodb': dynamodb, 'sqs': sqs}
+
+    def client(self, service_name):
+        return self.services[service_name]
+
+
+@pytest.fixture
+def handler(monkeypatch):
+    from lambdas.submit_quizzes import handler as sqh
+    from quiz_common import submissions
+
+    submissions.quiz_shape_cache.clear()
+    monkeypatch.setattr(submissions, '_queue_url', None)
+    monkeypatch.setattr(submissions, 'backoff', lambda attempt: None)
+    return sqh
+
+
+def _submission(quiz_id, username='user1'):
+    return {'Username': username, 'QuizID': quiz_id, 'Answers': {'0': {'Answer': 'A', 'TimeTaken': 3}}}
+
+
+def _submit(sqh, monkeypatch, submissions, dynamodb, sqs):
+    monkeypatch.setattr(sqh, 'clients', FakeClients(dynamodb, sqs), raising=False)
+    response = sqh.lambda_handler({'body': json.dumps(submissions)}, None)
+    return response, json.loads(response['body'])
+
+
+def test_submit_quizzes_enqueues_in_batches_of_ten(handler, monkeypatch):
+    dynamodb = FakeDynamoDB({'quiz-a', 'quiz-b'})
+    sqs = FakeSQS()
+    submissions = [_submission('quiz-a' if idx % 2 else 'quiz-b', f'user{idx}') for idx in range(23)]
+
+    response, body = _submit(handler, monkeypatch, submissions, dynamodb, sqs)
+
+    assert response['statusCode'] == 200
+    assert [len(batch) for batch in sqs.batches] == [10, 10, 3]
+    assert dynamodb.requested == [['quiz-b', 'quiz-a']]
+    results = body['Results']
+    assert [result['Index'] for result in results] == list(range(23))
+    queued = {message['SubmissionID']: message for batch in sqs.batches for message in batch}
+    for idx, result in enumerate(results):
+        assert queued[result['SubmissionID']]['Username'] == f'user{idx}'
+
+
+def test_submit_quizzes_reports_partial_failures(handler, monkeypatch):
+    dynamodb = FakeDynamoDB({'quiz-a'}, unprocessed_once=True)
+    sqs = FakeSQS(fail_ids={'4'})
+    submissions = [
+        _submission('quiz-a'),
+        _submission('quiz-missing'),
+        {'QuizID': 'quiz-a', 'Answers': {}},
+        _submission('quiz-a'),
+        _submission('quiz-a'),
+        'not a submission',
+        dict(_submission('quiz-a'), Answers={'5': {'Answer': 'A', 'TimeTaken': 1}}),
+    ]
+
+    response, body = _submit(handler, monkeypatch, submissions, dynamodb, sqs)
+
+    assert response['statusCode'] == 200
+    results = body['Results']
+    assert 'SubmissionID' in results[0] and 'SubmissionID' in results[3]
+    assert results[1]['Error'] == 'QuizID "quiz-missing" does not exist.'
+    assert results[2]['Error'] == "Missing field 'Username'"
+    assert results[4]['Error'] == 'Error sending message to SQS: try again'
+    assert results[5]['Error'] == 'Submission must be a JSON object'
+    assert results[6]['Error'] == 'Question 5 is out of range, the quiz has 5 questions'
+    assert len(dynamodb.requested) == 2
+
+
+def test_submit_quizzes_caches_quiz_existence(handler, monkeypatch):
+    dynamodb = FakeDynamoDB({'quiz-a'})
+
+    for _ in range(2):
+        _submit(handler, monkeypatch, [_submission('quiz-a'), _submission('quiz-missing')], dynamodb, FakeSQS())
+
+    assert dynamodb.requested == [['quiz-a', 'quiz-missing']]
+
+
+def test_submit_quizzes_splits_batches_by_size(handler, monkeypatch):
+    sqs = FakeSQS()
+    monkeypatch.setattr(handler, 'SEND_BATCH_MAX_BYTES', 1300)
+    submissions = [dict(_submission('quiz-a'), Username='u' * 400) for _ in range(5)]
+
+    _, body = _submit(handler, monkeypatch, submissions, FakeDynamoDB({'quiz-a'}), sqs)
+
+    assert [len(batch) for batch in sqs.batches] == [2, 2, 1]
+    assert all('SubmissionID' in result for result in body['Results'])
+
+
+@pytest.mark.parametrize('body, status', [('{"Username": "u"}', 400), ('not json', 400), (json.dumps([{}] * 501), 413)])
+def test_submit_quizzes_rejects_invalid_requests(handler, monkeypatch, body, status):
+    sqs = FakeSQS()
+    monkeypatch.setattr(handler, 'clients', FakeClients(FakeDynamoDB(set()), sqs), raising=False)
+
+    response = handler.lambda_handler({'body': body}, None)
+
+    assert response['statusCode'] == status
+    assert sqs.batches == []
+
+
+def test_submit_quizzes_rejects_repeated_keys_per_submission(handler, monkeypatch):
+    sqs = FakeSQS()
+    monkeypatch.setattr(handler, 'clients', FakeClients(FakeDynamoDB({'quiz-a'}), sqs), raising=False)
+    repeated = ('{"Username": "user2", "QuizID": "quiz-a", '
+                '"Answers": {"0": {"Answer": "A", "TimeTaken": 1}, "0": {"Answer": "B", "TimeTaken": 1}}}')
+    body = f'[{json.dumps(_submission("quiz-a"))}, {repeated}]'
+
+    response = handler.lambda_handler({'body': body}, None)
+
+    assert response['statusCode'] == 200
+    results = json.loads(response['body'])['Results']
+    assert 'SubmissionID' in results[0]
+    assert results[1] == {'Index': 1, 'Error': "Duplicate key '0'"}
+    assert [len(batch) for batch in sqs.batches] == [1]
@@ -0,0 +1,127 @@
+import json
+from decimal import Decimal
+
+import pytest
+from boto3.dynamodb.types import Binary, TypeSerializer
+
+from quiz_common.dynamodb import item_size
+from quiz_common.user_answers import (
+    pack_user_answers,
+    stored_user_answers,
+    unpack_user_answers,
+    user_answers_to_wire,
+)
+
+USER_ANSWERS = {
+    '0': {'Answer': 'D. Paris', 'TimeTaken': Decimal('8')},
+    '2': {'Answer': 'B. Café', 'TimeTaken': Decimal('7.5')},
+    '1': {'Answer': 'D. Paris', 'TimeTaken': Decimal('0.125')},
+}
+
+
+def test_packed_user_answers_round_trip():
+    packed = pack_user_answers(USER_ANSWERS)
+
+    assert unpack_user_answers(packed) == USER_ANSWERS
+    assert list(unpack_user_answers(Binary(packed))) == ['0', '2', '1']
+    # Repeated answers are stored once
+    assert packed.count('D. Paris'.encode('utf-8')) == 1
+
+
+def test_packed_user_answers_accept_message_numbers():
+    packed = pack_user_answers({'0': {'Answer': 'A', 'TimeTaken': 7.25}, '1': {'Answer': 'B', 'TimeTaken': '3'}})
+
+    assert unpack_user_answers(packed) == {
+        '0': {'Answer': 'A', 'TimeTaken': Decimal('7.25')},
+        '1': {'Answer': 'B', 'TimeTaken': Decimal('3')},
+    }
+
+
+@pytest.mark.parametrize('user_answers', [
+    {'70000': {'Answer': 'A', 'TimeTaken': 1.5}},
+    {'01': {'Answer': 'A', 'TimeTaken': 1}},
+    {'0': {'Answer': 3, 'TimeTaken': 1}},
+    {'0': {'Answer': 'A', 'TimeTaken': -1.25}},
+    {'0': {'Answer': 'A'}},
+])
+def test_answers_that_do_not_fit_are_stored_unpacked(user_answers):
+    stored = stored_user_answers(user_answers)
+
+    assert stored == json.loads(json.dumps(user_answers), parse_float=Decimal)
+    # Floats would make the resource layer reject the whole write batch
+    TypeSerializer().serialize(stored)
+
+
+def test_unknown_format_versions_are_rejected():
+    with pytest.raises(ValueError):
+        unpack_user_answers(b'\x02' + pack_user_answers(USER_ANSWERS)[1:])
+
+
+def test_packed_user_answers_are_smaller():
+    user_answers = {
+        str(idx): {'Answer': f'{"ABCD"[idx % 4]}. Option {idx % 4}', 'TimeTaken': Decimal(idx % 30) / 4}
+        for idx in range(100)
+    }
+
+    assert item_size({'UserAnswers': pack_user_answers(user_answers)}) < item_size({'UserAnswers': user_answers}) / 4
+
+
+def test_item_size_follows_the_dynamodb_rules():
+    assert item_size({'Name': 'abc'}) == 7
+    assert item_size({'N': Decimal('123.45')}) == 1 + 4
+    assert item_size({'B': b'\x00' * 10, 'T': True}) == 1 + 10 + 1 + 1
+    assert item_size({'M': {'a': 'b'}}) == 1 + 3 + 1 + 1 + 1
+    assert item_size({'L': ['a', 'b']}) == 1 + 3 + 2 + 2
+
+
+class FakeDynamoDBClient:
+    def __init__(self, item):
+        self.item = item
+
+    def get_item(self, TableName, Key):
+        assert TableName == 'UserSubmissions'
+        return {'Item': self.item} if Key['SubmissionID']['S'] == self.item['SubmissionID']['S'] else {}
+
+
+class FakeClients:
+    def __init__(self, dynamodb):
+        self.dynamodb = dynamodb
+
+    def client(self, service_name):
+        assert service_name == 'dynamodb'
+        return self.dynamodb
+
+
+@pytest.mark.parametrize('packed', [True, False])
+def test_get_submission_expands_packed_user_answers(monkeypatch, packed):
+    from lambdas.get_submission import handler as gsh
+
+    if packed:
+        stored = {'B': pack_user_answers(USER_ANSWERS)}
+    else:
+        stored = {'M': {
+            question_idx: {'M': {'Answer': {'S': data['Answer']}, 'TimeTaken': {'N': str(data['TimeTaken'])}}}
+            for question_idx, data in USER_ANSWERS.items()
+        }}
+    item = {
+        'SubmissionID': {'S': 'sub-1'},
+        'Username': {'S': 'user1'},
+        'Score': {'N': '50'},
+        'UserAnswers': stored,
+    }
+    monkeypatch.setattr(gsh, 'clients', FakeClients(FakeDynamoDBClient(item)), raising=False)
+
+    response = gsh.lambda_handler({'queryStringParameters': {'submission_id': 'sub-1'}}, None)
+
+    assert response['statusCode'] == 200
+    assert json.loads(response['body'])['UserAnswers'] == {
+        '0': {'Answer': 'D. Paris', 'TimeTaken': 8},
+        '2': {'Answer': 'B. Café', 'TimeTaken': 7.5},
+        '1': {'Answer': 'D. Paris', 'TimeTaken': 0.125},
+    }
+
+
+def test_user_answers_to_wire_uses_plain_numbers():
+    wire = user_answers_to_wire(pack_user_answers({'0': {'Answer': 'A', 'TimeTaken': 10}}))
+
+    assert wire == {'M': {'0': {'M': {'Answer': {'S': 'A'}, 'TimeTaken': {'N': '10'}}}}}